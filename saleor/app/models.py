@@ -6,6 +6,7 @@ from oauthlib.common import generate_token
 
 from ..core.models import Job, ModelWithMetadata
 from ..core.permissions import AppPermission
+from ..webhook.utils import invalidate_webhook_subscriptions
 from .types import AppType
 
 
@@ -37,6 +38,15 @@ class App(ModelWithMetadata):
         ordering = ("name", "pk")
         permissions = ((AppPermission.MANAGE_APPS.codename, "Manage apps",),)
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        invalidate_webhook_subscriptions()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        invalidate_webhook_subscriptions()
+        return result
+
     def get_permissions(self) -> Set[str]:
         """Return the permissions of the app."""
         if not self.is_active:
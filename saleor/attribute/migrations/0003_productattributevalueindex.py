@@ -0,0 +1,133 @@
+# Generated by Django 3.1 on 2020-11-16 10:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BATCH_SIZE = 10000
+
+
+def populate_product_attribute_value_index(apps, schema_editor):
+    AssignedProductAttribute = apps.get_model("attribute", "AssignedProductAttribute")
+    AssignedVariantAttribute = apps.get_model("attribute", "AssignedVariantAttribute")
+    ProductAttributeValueIndex = apps.get_model(
+        "attribute", "ProductAttributeValueIndex"
+    )
+
+    product_values = AssignedProductAttribute.values.through.objects.values_list(
+        "assignedproductattribute_id",
+        "assignedproductattribute__product_id",
+        "attributevalue_id",
+        "attributevalue__attribute_id",
+    )
+    ProductAttributeValueIndex.objects.bulk_create(
+        (
+            ProductAttributeValueIndex(
+                product_assignment_id=assignment_id,
+                product_id=product_id,
+                value_id=value_id,
+                attribute_id=attribute_id,
+            )
+            for assignment_id, product_id, value_id, attribute_id in (
+                product_values.iterator()
+            )
+        ),
+        batch_size=BATCH_SIZE,
+    )
+
+    variant_values = AssignedVariantAttribute.values.through.objects.values_list(
+        "assignedvariantattribute_id",
+        "assignedvariantattribute__variant__product_id",
+        "attributevalue_id",
+        "attributevalue__attribute_id",
+    )
+    ProductAttributeValueIndex.objects.bulk_create(
+        (
+            ProductAttributeValueIndex(
+                variant_assignment_id=assignment_id,
+                product_id=product_id,
+                value_id=value_id,
+                attribute_id=attribute_id,
+            )
+            for assignment_id, product_id, value_id, attribute_id in (
+                variant_values.iterator()
+            )
+        ),
+        batch_size=BATCH_SIZE,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0137_drop_attribute_models"),
+        ("attribute", "0002_auto_20201030_1141"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProductAttributeValueIndex",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "attribute",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="attribute.attribute",
+                    ),
+                ),
+                (
+                    "product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="product.product",
+                    ),
+                ),
+                (
+                    "product_assignment",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="attribute.assignedproductattribute",
+                    ),
+                ),
+                (
+                    "value",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="attribute.attributevalue",
+                    ),
+                ),
+                (
+                    "variant_assignment",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="attribute.assignedvariantattribute",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="productattributevalueindex",
+            index=models.Index(
+                fields=["value", "product", "attribute"],
+                name="attribute_p_value_i_74bbc4_idx",
+            ),
+        ),
+        migrations.RunPython(
+            populate_product_attribute_value_index, migrations.RunPython.noop
+        ),
+    ]
@@ -268,6 +268,19 @@ class Attribute(ModelWithMetadata):
     def __str__(self) -> str:
         return self.name
 
+    def save(self, *args, **kwargs):
+        from .utils import invalidate_attribute_slug_map
+
+        super().save(*args, **kwargs)
+        invalidate_attribute_slug_map()
+
+    def delete(self, *args, **kwargs):
+        from .utils import invalidate_attribute_slug_map
+
+        result = super().delete(*args, **kwargs)
+        invalidate_attribute_slug_map()
+        return result
+
     def has_values(self) -> bool:
         return self.values.exists()
 
@@ -312,6 +325,19 @@ class AttributeValue(SortableModel):
     def __str__(self) -> str:
         return self.name
 
+    def save(self, *args, **kwargs):
+        from .utils import invalidate_attribute_slug_map
+
+        super().save(*args, **kwargs)
+        invalidate_attribute_slug_map()
+
+    def delete(self, *args, **kwargs):
+        from .utils import invalidate_attribute_slug_map
+
+        result = super().delete(*args, **kwargs)
+        invalidate_attribute_slug_map()
+        return result
+
     @property
     def input_type(self):
         return self.attribute.input_type
@@ -341,3 +367,28 @@ class AttributeValueTranslation(models.Model):
 
     def __str__(self) -> str:
         return self.name
+
+
+class ProductAttributeValueIndex(models.Model):
+    """Denormalized index of attribute values assigned to products.
+
+    Contains a row for each value assigned to a product or to any of its variants,
+    which allows filtering products by attributes with a single lookup. Rows are
+    kept in sync by `associate_attribute_values_to_instance` and removed together
+    with the assignment they were created from.
+    """
+
+    product = models.ForeignKey(Product, related_name="+", on_delete=models.CASCADE)
+    attribute = models.ForeignKey(Attribute, related_name="+", on_delete=models.CASCADE)
+    value = models.ForeignKey(
+        AttributeValue, related_name="+", on_delete=models.CASCADE
+    )
+    product_assignment = models.ForeignKey(
+        AssignedProductAttribute, related_name="+", null=True, on_delete=models.CASCADE,
+    )
+    variant_assignment = models.ForeignKey(
+        AssignedVariantAttribute, related_name="+", null=True, on_delete=models.CASCADE,
+    )
+
+    class Meta:
+        indexes = [models.Index(fields=["value", "product", "attribute"])]
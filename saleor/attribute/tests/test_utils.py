@@ -1,7 +1,7 @@
 import pytest
 
-from ..models import ProductType
-from ..utils import associate_attribute_values_to_instance
+from ..models import AttributeValue, ProductAttributeValueIndex, ProductType
+from ..utils import associate_attribute_values_to_instance, get_attribute_slug_map
 
 
 def test_associate_attribute_to_non_product_instance(color_attribute):
@@ -45,3 +45,63 @@ def test_associate_attribute_to_product_instance_without_values(product):
     # Ensure the values were cleared and no new assignment entry was created
     assert new_assignment.pk == old_assignment.pk
     assert new_assignment.values.count() == 0
+
+
+def test_associate_attribute_values_updates_product_value_index(
+    product, color_attribute
+):
+    # given
+    red, blue = color_attribute.values.all()
+    associate_attribute_values_to_instance(product, color_attribute, red)
+
+    # when
+    assignment = associate_attribute_values_to_instance(product, color_attribute, blue)
+
+    # then
+    index = ProductAttributeValueIndex.objects.filter(product_assignment=assignment)
+    assert list(index.values_list("product_id", "attribute_id", "value_id")) == [
+        (product.pk, color_attribute.pk, blue.pk)
+    ]
+
+
+def test_product_value_index_removed_with_variant(product):
+    # given
+    variant = product.variants.first()
+    assignment = variant.attributes.first()
+    assert ProductAttributeValueIndex.objects.filter(
+        variant_assignment=assignment, product=product
+    ).exists()
+
+    # when
+    variant.delete()
+
+    # then
+    assert not ProductAttributeValueIndex.objects.filter(
+        variant_assignment=assignment
+    ).exists()
+
+
+def test_get_attribute_slug_map(color_attribute, assert_num_queries):
+    # given
+    red, blue = color_attribute.values.all()
+    get_attribute_slug_map()
+
+    # when
+    with assert_num_queries(0):
+        slug_map = get_attribute_slug_map()
+
+    # then
+    assert slug_map["color"] == (color_attribute.pk, {"red": red.pk, "blue": blue.pk})
+
+
+def test_get_attribute_slug_map_invalidated_on_value_change(color_attribute):
+    # given
+    get_attribute_slug_map()
+
+    # when
+    value = AttributeValue.objects.create(
+        attribute=color_attribute, name="Green", slug="green"
+    )
+
+    # then
+    assert get_attribute_slug_map()["color"][1]["green"] == value.pk
@@ -1,5 +1,6 @@
-from typing import TYPE_CHECKING, Set, Union
+from typing import TYPE_CHECKING, Dict, Iterable, Set, Tuple, Union
 
+from ..core.cache import ProcessCache
 from ..page.models import Page
 from ..product.models import Product, ProductVariant
 from .models import (
@@ -8,6 +9,7 @@ from .models import (
     AssignedVariantAttribute,
     Attribute,
     AttributeValue,
+    ProductAttributeValueIndex,
 )
 
 AttributeAssignmentType = Union[
@@ -18,6 +20,34 @@ AttributeAssignmentType = Union[
 if TYPE_CHECKING:
     from .models import AttributeProduct, AttributeVariant, AttributePage
 
+AttributeSlugMap = Dict[str, Tuple[int, Dict[str, int]]]
+
+attribute_slug_map_cache = ProcessCache("attribute_slug_map_version")
+
+
+def get_attribute_slug_map() -> AttributeSlugMap:
+    """Return a map of attribute slugs to attribute pks and their values' pks.
+
+    The map is cached in the worker process until any attribute or value changes.
+    """
+
+    def fetch():
+        slug_map: AttributeSlugMap = {
+            slug: (pk, {})
+            for pk, slug in Attribute.objects.values_list("pk", "slug").iterator()
+        }
+        attribute_slugs = {pk: slug for slug, (pk, _) in slug_map.items()}
+        values = AttributeValue.objects.values_list("pk", "slug", "attribute_id")
+        for pk, slug, attribute_id in values.iterator():
+            slug_map[attribute_slugs[attribute_id]][1][slug] = pk
+        return slug_map
+
+    return attribute_slug_map_cache.get_or_set(fetch)
+
+
+def invalidate_attribute_slug_map():
+    attribute_slug_map_cache.invalidate()
+
 
 def _associate_attribute_to_instance(
     instance: Union[Product, ProductVariant, Page], attribute_pk: int
@@ -81,4 +111,32 @@ def associate_attribute_values_to_instance(
     # Associate the attribute and the passed values
     assignment = _associate_attribute_to_instance(instance, attribute.pk)
     assignment.values.set(values)
+    update_product_attribute_value_index(assignment, values)
     return assignment
+
+
+def update_product_attribute_value_index(
+    assignment: AttributeAssignmentType, values: Iterable[AttributeValue]
+):
+    """Replace the indexed values of a product or variant attribute assignment."""
+    if isinstance(assignment, AssignedProductAttribute):
+        lookup = {"product_assignment": assignment}
+        product_id = assignment.product_id
+    elif isinstance(assignment, AssignedVariantAttribute):
+        lookup = {"variant_assignment": assignment}
+        product_id = assignment.variant.product_id
+    else:
+        return
+
+    ProductAttributeValueIndex.objects.filter(**lookup).delete()
+    ProductAttributeValueIndex.objects.bulk_create(
+        [
+            ProductAttributeValueIndex(
+                product_id=product_id,
+                attribute_id=value.attribute_id,
+                value=value,
+                **lookup,
+            )
+            for value in values
+        ]
+    )
@@ -1,4 +1,10 @@
 import logging
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict
+
+if TYPE_CHECKING:
+    # flake8: noqa
+    from prices import TaxedMoney
 
 logger = logging.getLogger(__name__)
 
@@ -11,3 +17,11 @@ class AddressType:
         (BILLING, "Billing"),
         (SHIPPING, "Shipping"),
     ]
+
+
+@dataclass
+class CheckoutPrices:
+    line_totals: Dict[int, "TaxedMoney"]  # keyed by the checkout line pk
+    subtotal: "TaxedMoney"
+    shipping_price: "TaxedMoney"
+    total: "TaxedMoney"
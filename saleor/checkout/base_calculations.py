@@ -4,9 +4,11 @@ It's recommended to use functions from calculations.py module to take in account
 manager.
 """
 
-from typing import TYPE_CHECKING, Iterable, List, Optional
+from decimal import ROUND_HALF_UP, Decimal
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
 
-from prices import TaxedMoney
+from babel.numbers import get_currency_precision
+from prices import Money, TaxedMoney
 
 from ..core.prices import quantize_price
 from ..core.taxes import zero_taxed_money
@@ -14,20 +16,24 @@ from ..discount import DiscountInfo
 
 if TYPE_CHECKING:
     # flake8: noqa
-    from .models import Checkout, CheckoutLine
+    from .fetch import CheckoutInfo, CheckoutLineInfo
+    from .models import CheckoutLine
     from ..channel.models import Channel
 
 
-def base_checkout_shipping_price(
-    checkout: "Checkout", lines: Iterable["CheckoutLine"]
-) -> TaxedMoney:
+def base_checkout_shipping_price(checkout_info: "CheckoutInfo") -> TaxedMoney:
     """Return checkout shipping price."""
-    shipping_method = checkout.shipping_method
-    if not shipping_method or not checkout.is_shipping_required():
+    from ..shipping.models import ShippingMethodChannelListing
+
+    checkout = checkout_info.checkout
+    channel_listing = checkout_info.shipping_method_channel_listing
+    if not checkout_info.shipping_method or not checkout_info.is_shipping_required():
         return zero_taxed_money(checkout.currency)
-    shipping_price = shipping_method.channel_listings.get(
-        channel_id=checkout.channel_id,
-    ).get_total()
+    if channel_listing is None:
+        raise ShippingMethodChannelListing.DoesNotExist(
+            "Shipping method is not available in the checkout channel."
+        )
+    shipping_price = channel_listing.get_total()
 
     return quantize_price(
         TaxedMoney(net=shipping_price, gross=shipping_price), shipping_price.currency
@@ -59,3 +65,38 @@ def base_checkout_line_total(
     amount = line.quantity * line.variant.get_price(channel.slug, discounts or [])
     price = quantize_price(amount, amount.currency)
     return TaxedMoney(net=price, gross=price)
+
+
+def base_checkout_lines_unit_prices(
+    lines: Iterable["CheckoutLineInfo"],
+    channel: "Channel",
+    discounts: Optional[Iterable[DiscountInfo]] = None,
+) -> Dict[int, Money]:
+    """Return discounted unit prices of the lines' variants keyed by variant pk."""
+    from ..discount.utils import calculate_discounted_price
+    from ..product.models import ProductVariantChannelListing
+
+    unit_prices = {}
+    for line_info in lines:
+        if line_info.channel_listing is None:
+            raise ProductVariantChannelListing.DoesNotExist(
+                "Variant is not available in the checkout channel."
+            )
+        unit_prices[line_info.variant.pk] = calculate_discounted_price(
+            product=line_info.product,
+            price=line_info.channel_listing.price,
+            collections=line_info.collections,
+            discounts=discounts,
+            channel=channel,
+        )
+    return unit_prices
+
+
+def get_currency_exponent(currency: str) -> Decimal:
+    """Return the exponent that amounts in the currency are quantized to."""
+    return Decimal(10) ** -get_currency_precision(currency)
+
+
+def quantize_amount(amount: Decimal, exponent: Decimal) -> Decimal:
+    """Quantize the amount the same way as `Money.quantize` does."""
+    return amount.quantize(exponent, rounding=ROUND_HALF_UP)
@@ -1,17 +1,72 @@
-from typing import TYPE_CHECKING, Iterable, Optional
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Tuple
 
 from ..core.prices import quantize_price
 from ..core.taxes import zero_taxed_money
 from ..discount import DiscountInfo
 from ..plugins.manager import get_plugins_manager
+from . import CheckoutPrices
+from .fetch import fetch_checkout_info
 
 if TYPE_CHECKING:
     from prices import TaxedMoney
 
+    from .fetch import CheckoutInfo
     from .models import Checkout, CheckoutLine
     from ..channel.models import Channel
 
 
+def _get_checkout_prices_cache_key(
+    checkout: "Checkout",
+    lines: Iterable["CheckoutLine"],
+    discounts: Optional[Iterable[DiscountInfo]],
+) -> Tuple:
+    address = checkout.shipping_address
+    return (
+        checkout.token,
+        checkout.channel_id,
+        checkout.currency,
+        checkout.shipping_method_id,
+        (str(address.country), address.postal_code) if address else None,
+        checkout.discount_amount,
+        tuple((line.pk, line.variant_id, line.quantity) for line in lines),
+        tuple(sorted(discount.sale.pk for discount in discounts or [])),
+    )
+
+
+def checkout_prices(
+    *,
+    checkout: "Checkout",
+    lines: Iterable["CheckoutLine"],
+    discounts: Optional[Iterable[DiscountInfo]] = None,
+    memo: Optional[Dict[Tuple, CheckoutPrices]] = None,
+    checkout_info: Optional["CheckoutInfo"] = None,
+) -> CheckoutPrices:
+    """Return line totals, subtotal, shipping price and total of the checkout.
+
+    All prices are calculated together and memoized by the checkout token and
+    a fingerprint of its lines, discounts, shipping and voucher discount. Pass
+    a request scoped `memo` to share the prices between checkout instances
+    loaded separately within one request; otherwise they are memoized on the
+    checkout instance. Pass the `checkout_info` of the lines if it's already
+    fetched to avoid fetching it again.
+    """
+    lines = list(lines)
+    if memo is None:
+        memo = getattr(checkout, "_prices_memo", None)
+        if memo is None:
+            memo = checkout._prices_memo = {}  # type: ignore
+    cache_key = _get_checkout_prices_cache_key(checkout, lines, discounts)
+    prices = memo.get(cache_key)
+    if prices is None:
+        if checkout_info is None:
+            checkout_info = fetch_checkout_info(checkout, lines)
+        prices = get_plugins_manager().calculate_checkout_prices(
+            checkout_info, discounts or []
+        )
+        memo[cache_key] = prices
+    return prices
+
+
 def checkout_shipping_price(
     *,
     checkout: "Checkout",
@@ -45,12 +100,14 @@ def checkout_subtotal(
 
 
 def calculate_checkout_total_with_gift_cards(
-    checkout: "Checkout", discounts: Optional[Iterable[DiscountInfo]] = None
+    checkout: "Checkout",
+    discounts: Optional[Iterable[DiscountInfo]] = None,
+    memo: Optional[Dict[Tuple, CheckoutPrices]] = None,
 ) -> "TaxedMoney":
-    total = (
-        checkout_total(checkout=checkout, lines=list(checkout), discounts=discounts,)
-        - checkout.get_total_gift_cards_balance()
+    prices = checkout_prices(
+        checkout=checkout, lines=list(checkout), discounts=discounts, memo=memo
     )
+    total = prices.total - checkout.get_total_gift_cards_balance()
 
     return max(total, zero_taxed_money(total.currency))
 
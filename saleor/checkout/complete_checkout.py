@@ -1,10 +1,11 @@
 from datetime import date
 from decimal import Decimal
-from typing import Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from django.contrib.sites.models import Site
 from django.core.exceptions import ValidationError
 from django.db import transaction
+from django.db.models import prefetch_related_objects
 from django.utils.encoding import smart_text
 from django.utils.translation import get_language
 from prices import TaxedMoney
@@ -12,7 +13,6 @@ from prices import TaxedMoney
 from ..account.error_codes import AccountErrorCode
 from ..account.models import User
 from ..account.utils import store_user_address
-from ..channel.models import Channel
 from ..checkout import calculations
 from ..checkout.error_codes import CheckoutErrorCode
 from ..core.exceptions import InsufficientStock
@@ -35,10 +35,11 @@ from ..payment import PaymentError, gateway
 from ..payment.models import Payment, Transaction
 from ..payment.utils import store_customer_id
 from ..plugins.manager import get_plugins_manager
-from ..warehouse.availability import check_stock_quantity
-from ..warehouse.management import allocate_stock
+from ..warehouse.availability import check_stock_quantity_bulk
+from ..warehouse.management import allocate_stocks
 from . import AddressType, models
 from .checkout_cleaner import clean_checkout_payment, clean_checkout_shipping
+from .fetch import CheckoutInfo, CheckoutLineInfo, fetch_checkout_info
 from .models import Checkout, CheckoutLine
 from .utils import get_voucher_for_checkout
 
@@ -127,18 +128,12 @@ def _validate_gift_cards(checkout: Checkout):
 
 
 def _create_line_for_order(
-    checkout_line: "CheckoutLine", discounts, channel: "Channel"
+    line_info: CheckoutLineInfo, total_line_price: TaxedMoney
 ) -> OrderLine:
-    """Create a line for the given order.
-
-    :raises InsufficientStock: when there is not enough items in stock for this variant.
-    """
-
-    quantity = checkout_line.quantity
-    variant = checkout_line.variant
-    product = variant.product
-    country = checkout_line.checkout.get_country()
-    check_stock_quantity(variant, country, quantity)
+    """Create a line for the given order."""
+    quantity = line_info.line.quantity
+    variant = line_info.variant
+    product = line_info.product
 
     product_name = str(product)
     variant_name = str(variant)
@@ -152,13 +147,7 @@ def _create_line_for_order(
     if translated_variant_name == variant_name:
         translated_variant_name = ""
 
-    manager = get_plugins_manager()
-    total_line_price = manager.calculate_checkout_line_total(
-        checkout_line, discounts, channel
-    )
-    unit_price = quantize_price(
-        total_line_price / checkout_line.quantity, total_line_price.currency
-    )
+    unit_price = quantize_price(total_line_price / quantity, total_line_price.currency)
     tax_rate = Decimal("0.0")
     # The condition will return False when unit_price.gross is 0.0
     if not isinstance(unit_price, Decimal) and unit_price.gross:
@@ -170,7 +159,7 @@ def _create_line_for_order(
         translated_product_name=translated_product_name,
         translated_variant_name=translated_variant_name,
         product_sku=variant.sku,
-        is_shipping_required=variant.is_shipping_required(),
+        is_shipping_required=line_info.is_shipping_required(),
         quantity=quantity,
         variant=variant,
         unit_price=unit_price,  # type: ignore
@@ -180,6 +169,27 @@ def _create_line_for_order(
     return line
 
 
+def _create_lines_for_order(
+    checkout_info: CheckoutInfo, line_totals: Dict[int, TaxedMoney]
+) -> List[OrderLine]:
+    """Create lines for the given order.
+
+    :raises InsufficientStock: when there is not enough items in stock for a variant.
+    """
+    lines = checkout_info.lines
+    check_stock_quantity_bulk(
+        [line_info.variant for line_info in lines],
+        checkout_info.checkout.get_country(),
+        [line_info.line.quantity for line_info in lines],
+    )
+    prefetch_related_objects([line_info.variant for line_info in lines], "translations")
+    prefetch_related_objects([line_info.product for line_info in lines], "translations")
+    return [
+        _create_line_for_order(line_info, line_totals[line_info.line.pk])
+        for line_info in lines
+    ]
+
+
 def _prepare_order_data(
     *, checkout: Checkout, lines: Iterable[CheckoutLine], discounts
 ) -> dict:
@@ -190,16 +200,18 @@ def _prepare_order_data(
     order_data = {}
 
     manager = get_plugins_manager()
-    taxed_total = calculations.checkout_total(
-        checkout=checkout, lines=lines, discounts=discounts
+    lines = list(lines)
+    checkout_info = fetch_checkout_info(checkout, lines)
+    prices = calculations.checkout_prices(
+        checkout=checkout,
+        lines=lines,
+        discounts=discounts,
+        checkout_info=checkout_info,
     )
-    cards_total = checkout.get_total_gift_cards_balance()
-    taxed_total.gross -= cards_total
-    taxed_total.net -= cards_total
-
+    taxed_total = prices.total - checkout.get_total_gift_cards_balance()
     taxed_total = max(taxed_total, zero_taxed_money(checkout.currency))
 
-    shipping_total = manager.calculate_checkout_shipping(checkout, lines, discounts)
+    shipping_total = prices.shipping_price
     order_data.update(_process_shipping_data_for_order(checkout, shipping_total))
     order_data.update(_process_user_data_for_order(checkout))
     order_data.update(
@@ -210,11 +222,7 @@ def _prepare_order_data(
         }
     )
 
-    channel = checkout.channel
-    order_data["lines"] = [
-        _create_line_for_order(checkout_line=line, discounts=discounts, channel=channel)
-        for line in lines
-    ]
+    order_data["lines"] = _create_lines_for_order(checkout_info, prices.line_totals)
 
     # validate checkout gift cards
     _validate_gift_cards(checkout)
@@ -225,9 +233,7 @@ def _prepare_order_data(
     # assign gift cards to the order
 
     order_data["total_price_left"] = (
-        manager.calculate_checkout_subtotal(checkout, lines, discounts)
-        + shipping_total
-        - checkout.discount
+        prices.subtotal + shipping_total - checkout.discount
     ).gross
 
     manager.preprocess_order_creation(checkout, discounts)
@@ -276,10 +282,10 @@ def _create_order(*, checkout: Checkout, order_data: dict, user: User) -> Order:
     order_lines = OrderLine.objects.bulk_create(order_lines)
 
     # allocate stocks from the lines
-    for line in order_lines:  # type: OrderLine
-        variant = line.variant
-        if variant and variant.track_inventory:
-            allocate_stock(line, checkout.get_country(), line.quantity)
+    allocate_stocks(
+        [line for line in order_lines if line.variant and line.variant.track_inventory],
+        checkout.get_country(),
+    )
 
     # Add gift cards to the order
     for gift_card in checkout.gift_cards.select_for_update():
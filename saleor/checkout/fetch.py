@@ -0,0 +1,116 @@
+"""Fetch the checkout data required by calculations in a fixed number of queries.
+
+The checkout utilities and calculations use the variants, products, collections
+and channel listings of all checkout lines. Fetching them through the model
+relations issues queries for every line, so they're loaded at once into
+`CheckoutInfo` and `CheckoutLineInfo` which are passed around instead.
+"""
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable, List, Optional
+
+from django.db.models import prefetch_related_objects
+
+if TYPE_CHECKING:
+    # flake8: noqa
+    from ..channel.models import Channel
+    from ..product.models import (
+        Collection,
+        Product,
+        ProductVariant,
+        ProductVariantChannelListing,
+    )
+    from ..shipping.models import ShippingMethod, ShippingMethodChannelListing
+    from .models import Checkout, CheckoutLine
+
+
+@dataclass
+class CheckoutLineInfo:
+    line: "CheckoutLine"
+    variant: "ProductVariant"
+    channel_listing: Optional["ProductVariantChannelListing"]
+    product: "Product"
+    collections: List["Collection"]
+
+    def is_shipping_required(self) -> bool:
+        return self.product.product_type.is_shipping_required
+
+
+@dataclass
+class CheckoutInfo:
+    checkout: "Checkout"
+    channel: "Channel"
+    lines: List[CheckoutLineInfo]
+    shipping_method: Optional["ShippingMethod"]
+    shipping_method_channel_listing: Optional["ShippingMethodChannelListing"]
+
+    @property
+    def checkout_lines(self) -> List["CheckoutLine"]:
+        return [line_info.line for line_info in self.lines]
+
+    def get_line_info(self, variant_id: int) -> Optional[CheckoutLineInfo]:
+        return next(
+            (
+                line_info
+                for line_info in self.lines
+                if line_info.variant.pk == variant_id
+            ),
+            None,
+        )
+
+    def is_shipping_required(self) -> bool:
+        return any(line_info.is_shipping_required() for line_info in self.lines)
+
+
+def fetch_checkout_lines(
+    lines: Iterable["CheckoutLine"], channel_id: int
+) -> List[CheckoutLineInfo]:
+    """Return infos of the given checkout lines.
+
+    Relations already loaded on the lines are reused, the missing ones are fetched
+    for all lines at once.
+    """
+    from ..product.models import ProductVariantChannelListing
+
+    lines = list(lines)
+    prefetch_related_objects(
+        lines, "variant__product__product_type", "variant__product__collections"
+    )
+    channel_listings = {
+        channel_listing.variant_id: channel_listing
+        for channel_listing in ProductVariantChannelListing.objects.filter(
+            variant_id__in={line.variant_id for line in lines}, channel_id=channel_id
+        )
+    }
+    return [
+        CheckoutLineInfo(
+            line=line,
+            variant=line.variant,
+            channel_listing=channel_listings.get(line.variant_id),
+            product=line.variant.product,
+            collections=list(line.variant.product.collections.all()),
+        )
+        for line in lines
+    ]
+
+
+def fetch_checkout_info(
+    checkout: "Checkout", lines: Optional[Iterable["CheckoutLine"]] = None
+) -> CheckoutInfo:
+    """Return the checkout info with infos of the given or all checkout lines."""
+    from ..shipping.models import ShippingMethodChannelListing
+
+    if lines is None:
+        lines = checkout.lines.select_related("variant__product")
+    shipping_method = checkout.shipping_method
+    shipping_method_channel_listing = None
+    if shipping_method is not None:
+        shipping_method_channel_listing = ShippingMethodChannelListing.objects.filter(
+            shipping_method_id=shipping_method.pk, channel_id=checkout.channel_id
+        ).first()
+    return CheckoutInfo(
+        checkout=checkout,
+        channel=checkout.channel,
+        lines=fetch_checkout_lines(lines, checkout.channel_id),
+        shipping_method=shipping_method,
+        shipping_method_channel_listing=shipping_method_channel_listing,
+    )
@@ -2,10 +2,12 @@ import pytest
 from measurement.measures import Weight
 from prices import Money, TaxedMoney
 
-from ...product.models import Category
+from ...core.exceptions import InsufficientStock, ProductNotPublished
+from ...product.models import Category, ProductChannelListing
 from .. import calculations, utils
+from ..fetch import fetch_checkout_info
 from ..models import Checkout
-from ..utils import add_variant_to_checkout
+from ..utils import add_variant_to_checkout, add_variants_to_checkout
 
 
 @pytest.fixture()
@@ -48,6 +50,81 @@ def test_replacing_same_variant(checkout, product):
     assert checkout.quantity == 2
 
 
+def test_adding_same_variant_with_checkout_info(checkout, product):
+    variant = product.variants.get()
+    checkout_info = fetch_checkout_info(checkout)
+    add_variant_to_checkout(checkout, variant, 1, checkout_info=checkout_info)
+    add_variant_to_checkout(checkout, variant, 2, checkout_info=checkout_info)
+    line = checkout.lines.get()
+    assert checkout_info.checkout_lines == [line]
+    assert checkout_info.lines[0].line.quantity == 3
+    assert checkout.quantity == 3
+
+
+def test_removing_variant_with_checkout_info(checkout_with_item):
+    checkout = checkout_with_item
+    variant = checkout.lines.get().variant
+    checkout_info = fetch_checkout_info(checkout)
+    add_variant_to_checkout(
+        checkout, variant, 0, replace=True, checkout_info=checkout_info
+    )
+    assert checkout.lines.count() == 0
+    assert checkout_info.lines == []
+    assert checkout.quantity == 0
+
+
+def test_add_variants_to_checkout(checkout, product_list):
+    variants = [product.variants.get() for product in product_list]
+    add_variants_to_checkout(checkout, variants, [1, 2, 3])
+    lines = {line.variant_id: line.quantity for line in checkout.lines.all()}
+    assert lines == {variants[0].pk: 1, variants[1].pk: 2, variants[2].pk: 3}
+    assert checkout.quantity == 6
+
+
+def test_add_variants_to_checkout_updates_lines(checkout, product_list):
+    variants = [product.variants.get() for product in product_list]
+    add_variant_to_checkout(checkout, variants[0], 1)
+    add_variant_to_checkout(checkout, variants[1], 1)
+    add_variants_to_checkout(checkout, [variants[0], variants[1]], [2, 0], replace=True)
+    lines = {line.variant_id: line.quantity for line in checkout.lines.all()}
+    assert lines == {variants[0].pk: 2}
+    assert checkout.quantity == 2
+
+
+def test_add_variants_to_checkout_sums_duplicated_variants(checkout, product):
+    variant = product.variants.get()
+    add_variants_to_checkout(checkout, [variant, variant], [1, 2])
+    assert checkout.lines.get().quantity == 3
+    assert checkout.quantity == 3
+
+
+def test_add_variants_to_checkout_insufficient_stock(checkout, product_list):
+    variants = [product.variants.get() for product in product_list]
+    with pytest.raises(InsufficientStock) as exc:
+        add_variants_to_checkout(checkout, variants, [1, 101, 1])
+    assert exc.value.item == variants[1]
+    assert not checkout.lines.exists()
+
+
+def test_add_variants_to_checkout_unpublished_product(checkout, product_list):
+    variants = [product.variants.get() for product in product_list]
+    ProductChannelListing.objects.filter(product=product_list[2]).update(
+        is_published=False
+    )
+    with pytest.raises(ProductNotPublished):
+        add_variants_to_checkout(checkout, variants, [1, 1, 1])
+    assert not checkout.lines.exists()
+
+
+def test_add_variants_to_checkout_number_of_queries(
+    checkout, product_list, assert_max_num_queries
+):
+    variants = [product.variants.get() for product in product_list]
+    add_variants_to_checkout(checkout, variants[:1], [1])
+    with assert_max_num_queries(7):
+        add_variants_to_checkout(checkout, variants, [1, 2, 3])
+
+
 def test_adding_invalid_quantity(checkout, product):
     variant = product.variants.get()
     with pytest.raises(ValueError):
@@ -24,6 +24,7 @@ from ..utils import (
     change_billing_address_in_checkout,
     change_shipping_address_in_checkout,
     clear_shipping_method,
+    get_valid_shipping_methods_for_checkout,
     get_voucher_discount_for_checkout,
     get_voucher_for_checkout,
     is_fully_paid,
@@ -49,9 +50,108 @@ def test_is_valid_shipping_method(checkout_with_item, address, shipping_zone):
     zone = ShippingZone.objects.create(name="DE", countries=["DE"])
     shipping_method.shipping_zone = zone
     shipping_method.save()
+    # valid shipping methods are memoized on the checkout instance
+    checkout = Checkout.objects.get(pk=checkout.pk)
     assert not is_valid_shipping_method(checkout, lines, None)
 
 
+def test_get_valid_shipping_methods_for_checkout(
+    checkout_with_item, address, shipping_zone
+):
+    # given
+    checkout = checkout_with_item
+    checkout.shipping_address = address
+    checkout.save()
+    lines = list(checkout)
+
+    # when
+    shipping_methods = get_valid_shipping_methods_for_checkout(checkout, lines, None)
+
+    # then
+    assert shipping_methods == list(
+        shipping_zone.shipping_methods.filter(
+            channel_listings__channel=checkout.channel
+        ).order_by("channel_listings__price_amount", "pk")
+    )
+    for shipping_method in shipping_methods:
+        assert shipping_method.channel_listing.channel_id == checkout.channel_id
+
+
+def test_get_valid_shipping_methods_for_checkout_is_memoized(
+    checkout_with_item, address, shipping_zone, assert_num_queries
+):
+    # given
+    checkout = checkout_with_item
+    checkout.shipping_address = address
+    checkout.save()
+    lines = list(checkout)
+    shipping_methods = get_valid_shipping_methods_for_checkout(checkout, lines, None)
+
+    # when
+    with assert_num_queries(0):
+        memoized_shipping_methods = get_valid_shipping_methods_for_checkout(
+            checkout, lines, None
+        )
+
+    # then
+    assert memoized_shipping_methods is shipping_methods
+
+
+def test_get_valid_shipping_methods_for_checkout_address_changed(
+    checkout_with_item, address, shipping_zone
+):
+    # given
+    checkout = checkout_with_item
+    checkout.shipping_address = address
+    checkout.save()
+    lines = list(checkout)
+    assert get_valid_shipping_methods_for_checkout(checkout, lines, None)
+
+    # when
+    checkout.shipping_address = None
+
+    # then
+    assert get_valid_shipping_methods_for_checkout(checkout, lines, None) is None
+
+
+def test_checkout_prices_shared_in_memo(checkout_with_item, assert_num_queries):
+    # given
+    memo = {}
+    lines = list(checkout_with_item)
+    prices = calculations.checkout_prices(
+        checkout=checkout_with_item, lines=lines, memo=memo
+    )
+    checkout = Checkout.objects.get(pk=checkout_with_item.pk)
+
+    # when
+    with assert_num_queries(0):
+        memoized_prices = calculations.checkout_prices(
+            checkout=checkout, lines=lines, memo=memo
+        )
+
+    # then
+    assert memoized_prices is prices
+
+
+def test_checkout_prices_memo_lines_changed(checkout_with_item):
+    # given
+    memo = {}
+    lines = list(checkout_with_item)
+    prices = calculations.checkout_prices(
+        checkout=checkout_with_item, lines=lines, memo=memo
+    )
+
+    # when
+    lines[0].quantity += 1
+
+    # then
+    new_prices = calculations.checkout_prices(
+        checkout=checkout_with_item, lines=lines, memo=memo
+    )
+    assert new_prices.subtotal > prices.subtotal
+    assert len(memo) == 2
+
+
 def test_clear_shipping_method(checkout, shipping_method):
     checkout.shipping_method = shipping_method
     checkout.save()
@@ -0,0 +1,51 @@
+from ..fetch import fetch_checkout_info, fetch_checkout_lines
+
+
+def test_fetch_checkout_info(checkout_with_items, assert_num_queries):
+    # given
+    checkout = checkout_with_items
+    lines_count = checkout.lines.count()
+
+    # when
+    with assert_num_queries(5):
+        checkout_info = fetch_checkout_info(checkout)
+
+    # then
+    assert checkout_info.channel == checkout.channel
+    assert checkout_info.shipping_method is None
+    assert len(checkout_info.lines) == lines_count
+    for line_info in checkout_info.lines:
+        assert line_info.variant == line_info.line.variant
+        assert line_info.product == line_info.line.variant.product
+        assert line_info.channel_listing.channel_id == checkout.channel_id
+        assert line_info.collections == list(line_info.product.collections.all())
+
+
+def test_fetch_checkout_info_with_shipping_method(checkout_with_item, shipping_method):
+    # given
+    checkout = checkout_with_item
+    checkout.shipping_method = shipping_method
+    checkout.save(update_fields=["shipping_method"])
+
+    # when
+    checkout_info = fetch_checkout_info(checkout)
+
+    # then
+    assert checkout_info.shipping_method == shipping_method
+    assert checkout_info.shipping_method_channel_listing == (
+        shipping_method.channel_listings.get(channel_id=checkout.channel_id)
+    )
+    assert checkout_info.is_shipping_required()
+
+
+def test_fetch_checkout_lines_reuses_loaded_lines(checkout_with_item):
+    # given
+    lines = list(checkout_with_item.lines.select_related("variant__product"))
+
+    # when
+    lines_info = fetch_checkout_lines(lines, checkout_with_item.channel_id)
+
+    # then
+    assert [line_info.line for line_info in lines_info] == lines
+    assert lines_info[0].line is lines[0]
+    assert lines_info[0].variant is lines[0].variant
@@ -1,10 +1,10 @@
 """Checkout-related utility functions."""
-from typing import Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from django.core.exceptions import ValidationError
-from django.db.models import Max, Min, Sum
+from django.db.models import Sum
 from django.utils import timezone
-from prices import Money, MoneyRange, TaxedMoneyRange
+from prices import Money, MoneyRange, TaxedMoney, TaxedMoneyRange
 
 from ..account.models import User
 from ..channel.models import Channel
@@ -30,9 +30,11 @@ from ..giftcard.utils import (
     remove_gift_card_code_from_checkout,
 )
 from ..plugins.manager import get_plugins_manager
+from ..product.models import ProductChannelListing, ProductVariant
 from ..shipping.models import ShippingMethod
-from ..warehouse.availability import check_stock_quantity
+from ..warehouse.availability import check_stock_quantity, check_stock_quantity_bulk
 from . import AddressType
+from .fetch import CheckoutInfo, CheckoutLineInfo, fetch_checkout_lines
 from .models import Checkout, CheckoutLine
 
 
@@ -42,11 +44,19 @@ def get_user_checkout(
     return checkout_queryset.filter(user=user, channel__is_active=True).first()
 
 
-def update_checkout_quantity(checkout):
-    """Update the total quantity in checkout."""
-    total_lines = checkout.lines.aggregate(total_quantity=Sum("quantity"))[
-        "total_quantity"
-    ]
+def update_checkout_quantity(
+    checkout, lines: Optional[Iterable[CheckoutLineInfo]] = None
+):
+    """Update the total quantity in checkout.
+
+    Quantities of the given line infos are summed instead of querying the lines.
+    """
+    if lines is None:
+        total_lines = checkout.lines.aggregate(total_quantity=Sum("quantity"))[
+            "total_quantity"
+        ]
+    else:
+        total_lines = sum(line_info.line.quantity for line_info in lines)
     if not total_lines:
         total_lines = 0
     checkout.quantity = total_lines
@@ -54,10 +64,19 @@ def update_checkout_quantity(checkout):
 
 
 def check_variant_in_stock(
-    checkout, variant, quantity=1, replace=False, check_quantity=True
+    checkout,
+    variant,
+    quantity=1,
+    replace=False,
+    check_quantity=True,
+    checkout_info: Optional[CheckoutInfo] = None,
 ) -> Tuple[int, Optional[CheckoutLine]]:
     """Check if a given variant is in stock and return the new quantity + line."""
-    line = checkout.lines.filter(variant=variant).first()
+    if checkout_info is None:
+        line = checkout.lines.filter(variant=variant).first()
+    else:
+        line_info = checkout_info.get_line_info(variant.pk)
+        line = line_info.line if line_info else None
     line_quantity = 0 if line is None else line.quantity
 
     new_quantity = quantity if replace else (quantity + line_quantity)
@@ -74,40 +93,149 @@ def check_variant_in_stock(
 
 
 def add_variant_to_checkout(
-    checkout, variant, quantity=1, replace=False, check_quantity=True
+    checkout,
+    variant,
+    quantity=1,
+    replace=False,
+    check_quantity=True,
+    checkout_info: Optional[CheckoutInfo] = None,
 ):
     """Add a product variant to checkout.
 
     If `replace` is truthy then any previous quantity is discarded instead
     of added to.
-    """
-    product_channel_listing = variant.product.channel_listings.filter(
-        channel_id=checkout.channel_id
-    ).first()
-    if not product_channel_listing or not product_channel_listing.is_published:
-        raise ProductNotPublished()
 
-    new_quantity, line = check_variant_in_stock(
+    If `checkout_info` is given, the lines are looked up in it instead of
+    querying them and it's updated with the changed line.
+    """
+    add_variants_to_checkout(
         checkout,
-        variant,
-        quantity=quantity,
+        [variant],
+        [quantity],
         replace=replace,
         check_quantity=check_quantity,
+        checkout_info=checkout_info,
     )
 
-    if line is None:
-        line = checkout.lines.filter(variant=variant).first()
 
-    if new_quantity == 0:
-        if line is not None:
-            line.delete()
-    elif line is None:
-        checkout.lines.create(checkout=checkout, variant=variant, quantity=new_quantity)
-    elif new_quantity > 0:
-        line.quantity = new_quantity
-        line.save(update_fields=["quantity"])
+def add_variants_to_checkout(
+    checkout,
+    variants: Iterable[ProductVariant],
+    quantities: Iterable[int],
+    replace=False,
+    check_quantity=True,
+    checkout_info: Optional[CheckoutInfo] = None,
+):
+    """Add product variants to checkout.
+
+    Publication and stock of all variants are checked at once, the lines are
+    created, updated and deleted in bulk and the checkout quantity is updated
+    once. Quantities of a variant given more than once are added up, or the last
+    one is used if `replace` is truthy.
+    """
+    quantities_by_variant_id: Dict[int, int] = {}
+    variants_by_id: Dict[int, ProductVariant] = {}
+    for variant, quantity in zip(variants, quantities):
+        variants_by_id[variant.pk] = variant
+        if replace:
+            quantities_by_variant_id[variant.pk] = quantity
+        else:
+            quantities_by_variant_id[variant.pk] = (
+                quantities_by_variant_id.get(variant.pk, 0) + quantity
+            )
+    if not variants_by_id:
+        return
+
+    published_product_ids = set(
+        ProductChannelListing.objects.filter(
+            channel_id=checkout.channel_id,
+            product_id__in={variant.product_id for variant in variants_by_id.values()},
+            is_published=True,
+        ).values_list("product_id", flat=True)
+    )
+    if any(
+        variant.product_id not in published_product_ids
+        for variant in variants_by_id.values()
+    ):
+        raise ProductNotPublished()
+
+    if checkout_info is None:
+        lines_by_variant_id = {
+            line.variant_id: line
+            for line in checkout.lines.filter(variant_id__in=variants_by_id.keys())
+        }
+    else:
+        lines_by_variant_id = {
+            line_info.variant.pk: line_info.line for line_info in checkout_info.lines
+        }
+
+    new_quantities = {}
+    for variant_id, quantity in quantities_by_variant_id.items():
+        line = lines_by_variant_id.get(variant_id)
+        line_quantity = 0 if line is None else line.quantity
+        new_quantity = quantity if replace else (quantity + line_quantity)
+        if new_quantity < 0:
+            raise ValueError(
+                "%r is not a valid quantity (results in %r)" % (quantity, new_quantity)
+            )
+        new_quantities[variant_id] = new_quantity
+
+    if check_quantity:
+        variants_in_stock = [
+            variant_id
+            for variant_id, new_quantity in new_quantities.items()
+            if new_quantity > 0
+        ]
+        check_stock_quantity_bulk(
+            [variants_by_id[variant_id] for variant_id in variants_in_stock],
+            checkout.get_country(),
+            [new_quantities[variant_id] for variant_id in variants_in_stock],
+        )
+
+    lines_to_create = []
+    lines_to_update = []
+    lines_to_delete = []
+    for variant_id, new_quantity in new_quantities.items():
+        line = lines_by_variant_id.get(variant_id)
+        if new_quantity == 0:
+            if line is not None:
+                lines_to_delete.append(line)
+        elif line is None:
+            lines_to_create.append(
+                CheckoutLine(
+                    checkout=checkout,
+                    variant=variants_by_id[variant_id],
+                    quantity=new_quantity,
+                )
+            )
+        elif line.quantity != new_quantity:
+            line.quantity = new_quantity
+            lines_to_update.append(line)
+
+    if lines_to_delete:
+        CheckoutLine.objects.filter(
+            pk__in=[line.pk for line in lines_to_delete]
+        ).delete()
+    if lines_to_update:
+        CheckoutLine.objects.bulk_update(lines_to_update, ["quantity"])
+    if lines_to_create:
+        CheckoutLine.objects.bulk_create(lines_to_create)
+
+    if checkout_info is not None:
+        deleted_line_ids = {line.pk for line in lines_to_delete}
+        checkout_info.lines = [
+            line_info
+            for line_info in checkout_info.lines
+            if line_info.line.pk not in deleted_line_ids
+        ]
+        if lines_to_create:
+            checkout_info.lines.extend(
+                fetch_checkout_lines(lines_to_create, checkout.channel_id)
+            )
 
-    update_checkout_quantity(checkout)
+    update_checkout_quantity(
+        checkout, checkout_info.lines if checkout_info is not None else None
+    )
 
 
 def _check_new_checkout_address(checkout, address, address_type):
@@ -215,12 +343,24 @@ def get_prices_of_discounted_specific_product(
     Product must be assigned directly to the discounted category, assigning
     product to child category won't work.
     """
-    line_prices = []
-    discounted_lines = get_discounted_lines(lines, voucher)
+    line_prices: List[Money] = []
+    lines_info = fetch_checkout_lines(lines, channel.pk)
+    discounted_lines = get_discounted_lines(
+        [line_info.line for line_info in lines_info], voucher
+    )
+    if not discounted_lines:
+        return line_prices
+    discounted_line_pks = {line.pk for line in discounted_lines}
+    discounted_lines_info = [
+        line_info
+        for line_info in lines_info
+        if line_info.line.pk in discounted_line_pks
+    ]
+    line_totals = get_plugins_manager().calculate_checkout_line_totals(
+        discounted_lines_info, discounts or [], channel
+    )
     for line in discounted_lines:
-        line_total = calculations.checkout_line_total(
-            line=line, discounts=discounts or [], channel=channel
-        ).gross
+        line_total = line_totals[line.pk].gross
         line_unit_price = quantize_price(
             (line_total / line.quantity), line_total.currency
         )
@@ -424,19 +564,60 @@ def remove_voucher_from_checkout(checkout: Checkout):
     )
 
 
+def _get_shipping_methods_cache_key(
+    checkout: Checkout,
+    lines: Iterable[CheckoutLine],
+    discounts: Iterable[DiscountInfo],
+    country_code: Optional[str],
+) -> Tuple:
+    address = checkout.shipping_address
+    return (
+        checkout.channel_id,
+        country_code,
+        (str(address.country), address.postal_code) if address else None,
+        tuple(sorted((line.variant_id, line.quantity) for line in lines)),
+        tuple(sorted(discount.sale.pk for discount in discounts or [])),
+    )
+
+
 def get_valid_shipping_methods_for_checkout(
     checkout: Checkout,
     lines: Iterable[CheckoutLine],
     discounts: Iterable[DiscountInfo],
     country_code: Optional[str] = None,
-):
-    manager = get_plugins_manager()
-    return ShippingMethod.objects.applicable_shipping_methods_for_instance(
+    subtotal: Optional[TaxedMoney] = None,
+) -> Optional[List[ShippingMethod]]:
+    """Return shipping methods applicable for the checkout sorted by price.
+
+    The result is memoized on the checkout instance, which lives for a single
+    request, so resolvers and mutations validating the same checkout share it.
+    It's computed again if the lines, discounts or shipping address change.
+    Pass the `subtotal` if it's already calculated to avoid calculating it again.
+    """
+    lines = list(lines)
+    cache_key = _get_shipping_methods_cache_key(
+        checkout, lines, discounts, country_code
+    )
+    cached_key, shipping_methods = getattr(
+        checkout, "_valid_shipping_methods_cache", (None, None)
+    )
+    if cached_key == cache_key:
+        return shipping_methods
+
+    if subtotal is None:
+        manager = get_plugins_manager()
+        subtotal = manager.calculate_checkout_subtotal(checkout, lines, discounts)
+    shipping_methods = ShippingMethod.objects.applicable_shipping_methods_for_instance(
         checkout,
         channel_id=checkout.channel_id,
-        price=manager.calculate_checkout_subtotal(checkout, lines, discounts).gross,
+        price=subtotal.gross,
         country_code=country_code,
     )
+    checkout._valid_shipping_methods_cache = (  # type: ignore
+        cache_key,
+        shipping_methods,
+    )
+    return shipping_methods
 
 
 def is_valid_shipping_method(
@@ -468,14 +649,13 @@ def get_shipping_price_estimate(
     if shipping_methods is None:
         return None
 
-    # TODO: extension manager should be able to have impact on shipping price estimates
-    min_price_amount, max_price_amount = shipping_methods.aggregate(
-        price_amount_min=Min("price_amount"), price_amount_max=Max("price_amount")
-    ).values()
-
-    if min_price_amount is None:
+    if not shipping_methods:
         return None
 
+    # TODO: extension manager should be able to have impact on shipping price estimates
+    price_amounts = [method.channel_listing.price_amount for method in shipping_methods]
+    min_price_amount, max_price_amount = min(price_amounts), max(price_amounts)
+
     manager = get_plugins_manager()
     prices = MoneyRange(
         start=Money(min_price_amount, checkout.currency),
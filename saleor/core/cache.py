@@ -0,0 +1,75 @@
+import uuid
+import weakref
+from typing import Any, Callable, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+class ProcessCache:
+    """Value cached in the worker process and shared between requests.
+
+    The value is tagged with a version stored in the shared Django cache. Calling
+    `invalidate` changes that version once the current transaction commits, which
+    makes every worker process drop its copy of the value and fetch it again on
+    the next access.
+
+    Invalidation reaches other processes only through a cache shared by them,
+    like Redis. The version expires after `PROCESS_CACHE_VERSION_TIMEOUT` seconds,
+    which bounds how long other processes may keep a stale value when the cache
+    isn't shared.
+    """
+
+    instances: "weakref.WeakSet[ProcessCache]" = weakref.WeakSet()
+
+    def __init__(self, version_key: str):
+        self.version_key = version_key
+        self._entry: Tuple[Optional[str], Any] = (None, None)
+        ProcessCache.instances.add(self)
+
+    def get_version(self) -> str:
+        version = cache.get(self.version_key)
+        if version is None:
+            new_version = uuid.uuid4().hex
+            cache.add(
+                self.version_key, new_version, settings.PROCESS_CACHE_VERSION_TIMEOUT
+            )
+            version = cache.get(self.version_key) or new_version
+        return version
+
+    def get(self, version: str) -> Optional[Any]:
+        cached_version, value = self._entry
+        return value if cached_version == version else None
+
+    def set(self, version: str, value: Any):
+        self._entry = (version, value)
+
+    def get_or_set(self, fetch: Callable[[], Any]) -> Any:
+        version = self.get_version()
+        value = self.get(version)
+        if value is None:
+            value = fetch()
+            self.set(version, value)
+        return value
+
+    def invalidate(self):
+        # Changing the version before the commit would let other processes cache
+        # the rows being replaced under the new version
+        transaction.on_commit(self._change_version)
+        self.clear()
+
+    def _change_version(self):
+        cache.set(
+            self.version_key, uuid.uuid4().hex, settings.PROCESS_CACHE_VERSION_TIMEOUT
+        )
+        self.clear()
+
+    def clear(self):
+        self._entry = (None, None)
+
+
+def clear_process_caches():
+    """Drop values cached in the current process without invalidating others."""
+    for process_cache in list(ProcessCache.instances):
+        process_cache.clear()
@@ -21,6 +21,7 @@ from ....product.models import Category, Collection, Product, ProductType
 from ....shipping.models import ShippingMethod, ShippingZone
 from ....warehouse.models import Warehouse
 from ....webhook.models import Webhook
+from ....webhook.utils import invalidate_webhook_subscriptions
 
 
 class Command(BaseCommand):
@@ -92,6 +93,7 @@ class Command(BaseCommand):
         self.stdout.write("Removed pages")
 
         Webhook.objects.all().delete()
+        invalidate_webhook_subscriptions()
         self.stdout.write("Removed webhooks")
 
         # Delete all users except for staff members.
@@ -0,0 +1,51 @@
+from unittest.mock import ANY, Mock, patch
+
+from ...tests.utils import flush_post_commit_hooks
+from ..cache import ProcessCache
+
+
+def test_process_cache_get_or_set():
+    # given
+    process_cache = ProcessCache("test_process_cache_version")
+    fetch = Mock(return_value=["value"])
+
+    # when
+    first_value = process_cache.get_or_set(fetch)
+    second_value = process_cache.get_or_set(fetch)
+
+    # then
+    assert first_value == second_value == ["value"]
+    fetch.assert_called_once_with()
+
+
+def test_process_cache_invalidate_changes_version_on_commit(db):
+    # given
+    process_cache = ProcessCache("test_process_cache_version")
+    process_cache.get_or_set(lambda: ["old value"])
+    version = process_cache.get_version()
+
+    # when
+    process_cache.invalidate()
+
+    # then
+    assert process_cache.get(version) is None
+    assert process_cache.get_version() == version
+    process_cache.set(version, ["value fetched before commit"])
+    flush_post_commit_hooks()
+    new_version = process_cache.get_version()
+    assert new_version != version
+    assert process_cache.get(new_version) is None
+
+
+@patch("saleor.core.cache.cache")
+def test_process_cache_version_expires(mocked_cache, settings):
+    # given
+    settings.PROCESS_CACHE_VERSION_TIMEOUT = 30
+    mocked_cache.get.return_value = None
+    process_cache = ProcessCache("test_process_cache_version")
+
+    # when
+    process_cache.get_version()
+
+    # then
+    mocked_cache.add.assert_called_once_with("test_process_cache_version", ANY, 30)
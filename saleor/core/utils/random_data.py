@@ -34,6 +34,7 @@ from ...attribute.models import (
     AttributeValue,
     AttributeVariant,
 )
+from ...attribute.utils import update_product_attribute_value_index
 from ...channel.models import Channel
 from ...checkout import AddressType
 from ...core.permissions import (
@@ -349,7 +350,9 @@ def assign_attributes_to_products(product_attributes):
             pk=pk, defaults=defaults
         )
         if created:
-            assoc.values.set(AttributeValue.objects.filter(pk__in=assigned_values))
+            values = AttributeValue.objects.filter(pk__in=assigned_values)
+            assoc.values.set(values)
+            update_product_attribute_value_index(assoc, values)
 
 
 def assign_attributes_to_variants(variant_attributes):
@@ -363,7 +366,9 @@ def assign_attributes_to_variants(variant_attributes):
             pk=pk, defaults=defaults
         )
         if created:
-            assoc.values.set(AttributeValue.objects.filter(pk__in=assigned_values))
+            values = AttributeValue.objects.filter(pk__in=assigned_values)
+            assoc.values.set(values)
+            update_product_attribute_value_index(assoc, values)
 
 
 def assign_attributes_to_pages(page_attributes):
@@ -590,9 +595,7 @@ def create_order_lines(order, discounts, how_many=10):
     lines = OrderLine.objects.bulk_create(lines)
     manager = get_plugins_manager()
     country = order.shipping_method.shipping_zone.countries[0]
-    warehouses = Warehouse.objects.filter(
-        shipping_zones__countries__contains=country
-    ).order_by("?")
+    warehouses = Warehouse.objects.for_country(country).order_by("?")
     warehouse_iter = itertools.cycle(warehouses)
     for line in lines:
         unit_price = manager.calculate_order_line_unit(line)
@@ -621,6 +624,9 @@ def create_fulfillments(order):
 
             allocation.quantity_allocated = F("quantity_allocated") - quantity
             allocation.save(update_fields=["quantity_allocated"])
+            stock = allocation.stock
+            stock.quantity_allocated = F("quantity_allocated") - quantity
+            stock.save(update_fields=["quantity_allocated"])
 
     update_order_status(order)
 
@@ -4,6 +4,7 @@ from functools import partial
 from django.conf import settings
 from django.db import models
 from django.db.models import F, Q
+from django.db.models.signals import m2m_changed
 from django.utils import timezone
 from django_countries.fields import CountryField
 from django_prices.models import MoneyField
@@ -243,6 +244,19 @@ class Sale(models.Model):
     def __repr__(self):
         return "Sale(name=%r, type=%s)" % (str(self.name), self.get_type_display(),)
 
+    def save(self, *args, **kwargs):
+        from .utils import invalidate_discounts_cache
+
+        super().save(*args, **kwargs)
+        invalidate_discounts_cache()
+
+    def delete(self, *args, **kwargs):
+        from .utils import invalidate_discounts_cache
+
+        result = super().delete(*args, **kwargs)
+        invalidate_discounts_cache()
+        return result
+
     def __str__(self):
         return self.name
 
@@ -287,6 +301,19 @@ class SaleChannelListing(models.Model):
         unique_together = [["sale", "channel"]]
         ordering = ("pk",)
 
+    def save(self, *args, **kwargs):
+        from .utils import invalidate_discounts_cache
+
+        super().save(*args, **kwargs)
+        invalidate_discounts_cache()
+
+    def delete(self, *args, **kwargs):
+        from .utils import invalidate_discounts_cache
+
+        result = super().delete(*args, **kwargs)
+        invalidate_discounts_cache()
+        return result
+
 
 class SaleTranslation(models.Model):
     language_code = models.CharField(max_length=10)
@@ -298,3 +325,18 @@ class SaleTranslation(models.Model):
     class Meta:
         ordering = ("language_code", "name", "pk")
         unique_together = (("language_code", "sale"),)
+
+
+def invalidate_discounts_cache_on_catalogue_change(sender, action, **kwargs):
+    from .utils import invalidate_discounts_cache
+
+    if action in {"post_add", "post_remove", "post_clear"}:
+        invalidate_discounts_cache()
+
+
+for sale_catalogue in (Sale.products, Sale.categories, Sale.collections):
+    m2m_changed.connect(
+        invalidate_discounts_cache_on_catalogue_change,
+        sender=sale_catalogue.through,
+        dispatch_uid=f"invalidate_discounts_cache_{sale_catalogue.field.name}",
+    )
@@ -20,8 +20,11 @@ from ..templatetags.voucher import discount_as_negative
 from ..utils import (
     add_voucher_usage_by_customer,
     decrease_voucher_usage,
+    fetch_active_discounts_from_database,
+    fetch_discounts,
     get_product_discount_on_sale,
     increase_voucher_usage,
+    invalidate_discounts_cache,
     remove_voucher_usage_by_customer,
     validate_voucher,
 )
@@ -526,3 +529,83 @@ def test_get_not_applicable_sale_discount(sale, channel_PLN):
 
     with pytest.raises(NotApplicable):
         sale.get_discount(None)
+
+
+def test_fetch_discounts_cached_between_calls(sale, assert_num_queries):
+    now = timezone.now()
+    discounts = fetch_discounts(now)
+
+    with assert_num_queries(0):
+        cached_discounts = fetch_discounts(now + timedelta(seconds=1))
+
+    assert [discount.sale for discount in cached_discounts] == [sale]
+    assert cached_discounts == discounts
+
+
+def test_fetch_discounts_cache_invalidated(sale, product):
+    now = timezone.now()
+    fetch_discounts(now)
+
+    sale.products.remove(product)
+    invalidate_discounts_cache()
+
+    discounts = fetch_discounts(now)
+    assert discounts[0].product_ids == set()
+
+
+def test_fetch_active_discounts_from_database_skips_cache(sale, product):
+    fetch_discounts(timezone.now())
+
+    # deleting the through rows directly doesn't invalidate the cache
+    Sale.products.through.objects.filter(sale=sale, product=product).delete()
+
+    discounts = fetch_active_discounts_from_database()
+    assert discounts[0].product_ids == set()
+
+
+def test_fetch_discounts_cache_invalidated_on_sale_catalogue_change(
+    sale, product, category, collection
+):
+    now = timezone.now()
+    fetch_discounts(now)
+
+    sale.products.remove(product)
+    sale.categories.clear()
+    collection.sale_set.remove(sale)
+
+    discounts = fetch_discounts(now)
+    assert discounts[0].product_ids == set()
+    assert discounts[0].category_ids == set()
+    assert discounts[0].collection_ids == set()
+
+
+def test_fetch_discounts_cache_invalidated_on_sale_save(sale, channel_USD):
+    now = timezone.now()
+    fetch_discounts(now)
+
+    new_sale = Sale.objects.create(name="New sale", start_date=now)
+
+    discounts = fetch_discounts(now)
+    assert {discount.sale for discount in discounts} == {sale, new_sale}
+
+
+def test_fetch_discounts_cache_expires_when_sale_ends(sale):
+    now = timezone.now()
+    sale.end_date = now + timedelta(hours=1)
+    sale.save(update_fields=["end_date"])
+    assert len(fetch_discounts(now)) == 1
+
+    discounts = fetch_discounts(now + timedelta(hours=2))
+
+    assert discounts == []
+
+
+def test_fetch_discounts_cache_expires_when_sale_starts(sale):
+    now = timezone.now()
+    sale.start_date = now + timedelta(hours=1)
+    sale.save(update_fields=["start_date"])
+    assert fetch_discounts(now) == []
+
+    discounts = fetch_discounts(now + timedelta(hours=2))
+
+    assert [discount.sale for discount in discounts] == [sale]
@@ -8,6 +8,7 @@ from prices import Money
 
 from ..channel.models import Channel
 from ..checkout import calculations
+from ..core.cache import ProcessCache
 from ..core.taxes import zero_money
 from . import DiscountInfo
 from .models import NotApplicable, Sale, SaleChannelListing, VoucherCustomer
@@ -20,6 +21,8 @@ if TYPE_CHECKING:
     from ..product.models import Collection, Product
     from .models import Voucher
 
+discounts_cache = ProcessCache("discounts_version")
+
 
 def increase_voucher_usage(voucher: "Voucher") -> None:
     """Increase voucher uses by 1."""
@@ -110,19 +113,22 @@ def calculate_discounted_price(
 
 
 def get_discounted_lines(lines, voucher):
-    discounted_products = voucher.products.all()
-    discounted_categories = set(voucher.categories.all())
-    discounted_collections = set(voucher.collections.all())
+    discounted_products = set(voucher.products.values_list("pk", flat=True))
+    discounted_categories = set(voucher.categories.values_list("pk", flat=True))
+    discounted_collections = set(voucher.collections.values_list("pk", flat=True))
 
     discounted_lines = []
     if discounted_products or discounted_collections or discounted_categories:
         for line in lines:
+            if not line.variant:
+                continue
             line_product = line.variant.product
-            line_category = line.variant.product.category
-            line_collections = set(line.variant.product.collections.all())
-            if line.variant and (
-                line_product in discounted_products
-                or line_category in discounted_categories
+            line_collections = set(
+                collection.pk for collection in line_product.collections.all()
+            )
+            if (
+                line_product.pk in discounted_products
+                or line_product.category_id in discounted_categories
                 or line_collections.intersection(discounted_collections)
             ):
                 discounted_lines.append(line)
@@ -185,7 +191,7 @@ def get_products_voucher_discount(
 
 
 def fetch_categories(sale_pks: Iterable[str]) -> Dict[int, Set[int]]:
-    from ..product.models import Category
+    from ..product.utils.categories import get_category_tree_index
 
     categories = (
         Sale.categories.through.objects.filter(sale_id__in=sale_pks)
@@ -195,13 +201,12 @@ def fetch_categories(sale_pks: Iterable[str]) -> Dict[int, Set[int]]:
     category_map: Dict[int, Set[int]] = defaultdict(set)
     for sale_pk, category_pk in categories:
         category_map[sale_pk].add(category_pk)
+    if not category_map:
+        return category_map
+    category_tree = get_category_tree_index()
     subcategory_map: Dict[int, Set[int]] = defaultdict(set)
     for sale_pk, category_pks in category_map.items():
-        subcategory_map[sale_pk] = set(
-            Category.tree.filter(pk__in=category_pks)
-            .get_descendants(include_self=True)
-            .values_list("pk", flat=True)
-        )
+        subcategory_map[sale_pk] = category_tree.get_descendant_ids(category_pks)
     return subcategory_map
 
 
@@ -240,7 +245,7 @@ def fetch_sale_channel_listings(sale_pks: Iterable[str],):
     return channel_listings_map
 
 
-def fetch_discounts(date: datetime.date) -> List[DiscountInfo]:
+def _fetch_discounts(date: datetime.date) -> List[DiscountInfo]:
     sales = list(Sale.objects.active(date))
     pks = {s.pk for s in sales}
     collections = fetch_collections(pks)
@@ -260,5 +265,62 @@ def fetch_discounts(date: datetime.date) -> List[DiscountInfo]:
     ]
 
 
+def _get_discounts_valid_until(
+    date: datetime.date, discounts: List[DiscountInfo]
+) -> Optional[datetime.date]:
+    """Return the date when the set of active sales changes next."""
+    dates = [
+        discount.sale.end_date
+        for discount in discounts
+        if discount.sale.end_date is not None
+    ]
+    next_start_date = (
+        Sale.objects.filter(start_date__gt=date)
+        .order_by("start_date")
+        .values_list("start_date", flat=True)
+        .first()
+    )
+    if next_start_date is not None:
+        dates.append(next_start_date)
+    return min(dates, default=None)
+
+
+def fetch_discounts(date: datetime.date) -> List[DiscountInfo]:
+    """Return sales active at the given date.
+
+    Discounts are cached in the worker process until a sale starts or ends, or
+    until `invalidate_discounts_cache` is called after changing sales.
+    """
+    version = discounts_cache.get_version()
+    cached = discounts_cache.get(version)
+    if cached is not None:
+        valid_from, valid_until, discounts = cached
+        if valid_from <= date and (valid_until is None or date < valid_until):
+            return list(discounts)
+
+    discounts = _fetch_discounts(date)
+    valid_until = _get_discounts_valid_until(date, discounts)
+    discounts_cache.set(version, (date, valid_until, discounts))
+    return list(discounts)
+
+
+def invalidate_discounts_cache():
+    """Make all worker processes fetch active discounts from the database again.
+
+    Call it after changing sales, their channel listings, their catalogues or
+    the category tree.
+    """
+    discounts_cache.invalidate()
+
+
 def fetch_active_discounts() -> List[DiscountInfo]:
     return fetch_discounts(timezone.now())
+
+
+def fetch_active_discounts_from_database() -> List[DiscountInfo]:
+    """Return sales active now, bypassing the process cache.
+
+    Use it when storing data calculated from the discounts, as the cache of
+    another process may not be invalidated yet.
+    """
+    return _fetch_discounts(timezone.now())
@@ -1,6 +1,7 @@
 import graphene
 
 from ...attribute import models
+from ...attribute.utils import invalidate_attribute_slug_map
 from ...core.permissions import PageTypePermissions
 from ..core.mutations import ModelBulkDeleteMutation
 from ..core.types.common import AttributeError
@@ -19,6 +20,11 @@ class AttributeBulkDelete(ModelBulkDeleteMutation):
         error_type_class = AttributeError
         error_type_field = "attribute_errors"
 
+    @classmethod
+    def bulk_action(cls, queryset):
+        queryset.delete()
+        invalidate_attribute_slug_map()
+
 
 class AttributeValueBulkDelete(ModelBulkDeleteMutation):
     class Arguments:
@@ -34,3 +40,8 @@ class AttributeValueBulkDelete(ModelBulkDeleteMutation):
         permissions = (PageTypePermissions.MANAGE_PAGE_TYPES_AND_ATTRIBUTES,)
         error_type_class = AttributeError
         error_type_field = "attribute_errors"
+
+    @classmethod
+    def bulk_action(cls, queryset):
+        queryset.delete()
+        invalidate_attribute_slug_map()
@@ -4,6 +4,7 @@ from graphene_django.filter import GlobalIDFilter, GlobalIDMultipleChoiceFilter
 
 from ...attribute.models import Attribute
 from ...product.models import Category, Product
+from ...product.utils.categories import get_descendant_category_ids
 from ..attribute.enums import AttributeTypeEnum
 from ..channel.filters import get_channel_slug_from_filter_data
 from ..core.filters import EnumFilter
@@ -28,7 +29,7 @@ def filter_attributes_by_product_types(qs, field, value, requestor, channel_slug
         if category is None:
             return qs.none()
 
-        tree = category.get_descendants(include_self=True)
+        tree = get_descendant_category_ids([category.pk])
         product_qs = product_qs.filter(category__in=tree)
 
         if not product_qs.user_has_access_to_all(requestor):
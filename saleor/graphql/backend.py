@@ -0,0 +1,138 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import partial
+from typing import TYPE_CHECKING, Hashable, List, Optional
+
+from django.conf import settings
+from graphql import GraphQLCoreBackend, GraphQLDocument
+from graphql.execution import ExecutionResult, execute
+from graphql.language.base import parse
+from graphql.validation import validate
+
+if TYPE_CHECKING:
+    # flake8: noqa
+    from graphql import GraphQLSchema
+    from graphql.language.ast import Document
+
+
+class DocumentCache:
+    """Thread-safe, bounded LRU cache of parsed and validated documents."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._documents: "OrderedDict[Hashable, GraphQLDocument]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._documents)
+
+    def get(self, key: Hashable) -> Optional[GraphQLDocument]:
+        with self._lock:
+            document = self._documents.get(key)
+            if document is None:
+                self.misses += 1
+                return None
+            self._documents.move_to_end(key)
+            self.hits += 1
+            return document
+
+    def set(self, key: Hashable, document: GraphQLDocument):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._documents[key] = document
+            self._documents.move_to_end(key)
+            while len(self._documents) > self.max_size:
+                self._documents.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._documents.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._documents),
+            "max_size": self.max_size,
+        }
+
+
+_document_cache: Optional[DocumentCache] = None
+_document_cache_lock = threading.Lock()
+
+
+def get_document_cache() -> DocumentCache:
+    """Return the document cache shared by all views of the worker process."""
+    global _document_cache
+    if _document_cache is None:
+        with _document_cache_lock:
+            if _document_cache is None:
+                _document_cache = DocumentCache(settings.GRAPHQL_QUERY_CACHE_SIZE)
+    return _document_cache
+
+
+def get_query_hash(query: str) -> str:
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+def execute_validated(
+    schema: "GraphQLSchema",
+    document_ast: "Document",
+    validation_errors: List[Exception],
+    *args,
+    **kwargs,
+):
+    if validation_errors:
+        return ExecutionResult(errors=validation_errors, invalid=True)
+    return execute(schema, document_ast, *args, **kwargs)
+
+
+class CachedGraphQLBackend(GraphQLCoreBackend):
+    """Backend that parses and validates every distinct query only once.
+
+    Documents are stored in a process-wide LRU cache keyed by the schema and the
+    sha256 hash of the query string. Validation errors are cached together with
+    the document, so invalid queries are not re-validated either.
+    """
+
+    def __init__(self, executor=None, cache: Optional[DocumentCache] = None):
+        super().__init__(executor=executor)
+        self.cache = cache
+
+    def get_cache(self) -> DocumentCache:
+        return self.cache if self.cache is not None else get_document_cache()
+
+    def document_from_string(
+        self, schema: "GraphQLSchema", document_string: str
+    ) -> GraphQLDocument:
+        if not isinstance(document_string, str):
+            return super().document_from_string(schema, document_string)
+
+        cache = self.get_cache()
+        key = (id(schema), get_query_hash(document_string))
+        document = cache.get(key)
+        if document is not None:
+            return document
+
+        document_ast = parse(document_string)
+        validation_errors = validate(schema, document_ast)
+        document = GraphQLDocument(
+            schema=schema,
+            document_string=document_string,
+            document_ast=document_ast,
+            execute=partial(
+                execute_validated,
+                schema,
+                document_ast,
+                validation_errors,
+                **self.execute_params,
+            ),
+        )
+        cache.set(key, document)
+        return document
@@ -12,9 +12,10 @@ from ...channel.utils import get_default_channel
 from ...checkout import models
 from ...checkout.complete_checkout import complete_checkout
 from ...checkout.error_codes import CheckoutErrorCode
+from ...checkout.fetch import fetch_checkout_info
 from ...checkout.utils import (
     add_promo_code_to_checkout,
-    add_variant_to_checkout,
+    add_variants_to_checkout,
     change_billing_address_in_checkout,
     change_shipping_address_in_checkout,
     get_user_checkout,
@@ -28,8 +29,7 @@ from ...core.transactions import transaction_with_commit_on_errors
 from ...order import models as order_models
 from ...payment import models as payment_models
 from ...product import models as product_models
-from ...shipping import models as shipping_models
-from ...warehouse.availability import check_stock_quantity, get_available_quantity
+from ...warehouse.availability import check_stock_quantity_bulk, get_available_quantity
 from ..account.i18n import I18nMixin
 from ..account.types import AddressInput
 from ..core.mutations import BaseMutation, ModelMutation
@@ -87,16 +87,17 @@ def update_checkout_shipping_method_if_invalid(
     )
 
     if not is_valid:
-        cheapest_alternative = get_valid_shipping_methods_for_checkout(
+        valid_methods = get_valid_shipping_methods_for_checkout(
             checkout, lines, discounts
-        ).first()
+        )
+        cheapest_alternative = valid_methods[0] if valid_methods else None
         checkout.shipping_method = cheapest_alternative
         checkout.save(update_fields=["shipping_method", "last_change"])
 
 
 def check_lines_quantity(variants, quantities, country):
     """Check if stock is sufficient for each line in the list of dicts."""
-    for variant, quantity in zip(variants, quantities):
+    for quantity in quantities:
         if quantity < 0:
             raise ValidationError(
                 {
@@ -116,27 +117,32 @@ def check_lines_quantity(variants, quantities, country):
                     )
                 }
             )
-        try:
-            check_stock_quantity(variant, country, quantity)
-        except InsufficientStock as e:
-            available_quantity = get_available_quantity(e.item, country)
-            message = (
-                "Could not add item "
-                + "%(item_name)s. Only %(remaining)d remaining in stock."
-                % {
-                    "remaining": available_quantity,
-                    "item_name": e.item.display_product(),
-                }
-            )
-            raise ValidationError({"quantity": ValidationError(message, code=e.code)})
+    try:
+        check_stock_quantity_bulk(variants, country, quantities)
+    except InsufficientStock as e:
+        available_quantity = get_available_quantity(e.item, country)
+        message = (
+            "Could not add item "
+            + "%(item_name)s. Only %(remaining)d remaining in stock."
+            % {
+                "remaining": available_quantity,
+                "item_name": e.item.display_product(),
+            }
+        )
+        raise ValidationError({"quantity": ValidationError(message, code=e.code)})
 
 
 def validate_variants_available_for_purchase(variants, channel_id):
+    product_channel_listings = {
+        channel_listing.product_id: channel_listing
+        for channel_listing in product_models.ProductChannelListing.objects.filter(
+            channel_id=channel_id,
+            product_id__in={variant.product_id for variant in variants},
+        )
+    }
     not_available_variants = []
     for variant in variants:
-        product_channel_listing = variant.product.channel_listings.filter(
-            channel_id=channel_id
-        ).first()
+        product_channel_listing = product_channel_listings.get(variant.product_id)
         if not (
             product_channel_listing
             and product_channel_listing.is_available_for_purchase()
@@ -357,18 +363,16 @@ class CheckoutCreate(ModelMutation, I18nMixin):
 
         # Create the checkout lines
         if variants and quantities:
-            for variant, quantity in zip(variants, quantities):
-                try:
-                    add_variant_to_checkout(instance, variant, quantity)
-                except InsufficientStock as exc:
-                    raise ValidationError(
-                        f"Insufficient product stock: {exc.item}", code=exc.code
-                    )
-                except ProductNotPublished as exc:
-                    raise ValidationError(
-                        "Can't create checkout with unpublished product.",
-                        code=exc.code,
-                    )
+            try:
+                add_variants_to_checkout(instance, variants, quantities)
+            except InsufficientStock as exc:
+                raise ValidationError(
+                    f"Insufficient product stock: {exc.item}", code=exc.code
+                )
+            except ProductNotPublished as exc:
+                raise ValidationError(
+                    "Can't create checkout with unpublished product.", code=exc.code,
+                )
             info.context.plugins.checkout_quantity_changed(instance)
         # Save provided addresses and associate them to the checkout
         cls.save_addresses(instance, cleaned_input)
@@ -445,23 +449,27 @@ class CheckoutLinesAdd(BaseMutation):
         check_lines_quantity(variants, quantities, checkout.get_country())
         validate_variants_available_for_purchase(variants, checkout.channel_id)
 
+        checkout_info = fetch_checkout_info(checkout)
         if variants and quantities:
-            for variant, quantity in zip(variants, quantities):
-                try:
-                    add_variant_to_checkout(
-                        checkout, variant, quantity, replace=replace
-                    )
-                except InsufficientStock as exc:
-                    raise ValidationError(
-                        f"Insufficient product stock: {exc.item}", code=exc.code
-                    )
-                except ProductNotPublished as exc:
-                    raise ValidationError(
-                        "Can't add unpublished product.", code=exc.code,
-                    )
+            try:
+                add_variants_to_checkout(
+                    checkout,
+                    variants,
+                    quantities,
+                    replace=replace,
+                    checkout_info=checkout_info,
+                )
+            except InsufficientStock as exc:
+                raise ValidationError(
+                    f"Insufficient product stock: {exc.item}", code=exc.code
+                )
+            except ProductNotPublished as exc:
+                raise ValidationError(
+                    "Can't add unpublished product.", code=exc.code,
+                )
             info.context.plugins.checkout_quantity_changed(checkout)
 
-        lines = list(checkout)
+        lines = checkout_info.checkout_lines
 
         update_checkout_shipping_method_if_invalid(
             checkout, lines, info.context.discounts
@@ -782,9 +790,6 @@ class CheckoutShippingMethodUpdate(BaseMutation):
             shipping_method_id,
             only_type=ShippingMethod,
             field="shipping_method_id",
-            qs=shipping_models.ShippingMethod.objects.prefetch_related(
-                "zip_code_rules"
-            ),
         )
 
         lines = list(checkout)
@@ -1,9 +1,18 @@
+from decimal import Decimal
+
 import pytest
 
 from .....checkout import calculations
+from .....checkout.models import CheckoutLine
 from .....checkout.utils import add_variant_to_checkout
 from .....payment import ChargeStatus, TransactionKind
 from .....payment.models import Payment
+from .....product.models import (
+    Product,
+    ProductChannelListing,
+    ProductVariant,
+    ProductVariantChannelListing,
+)
 
 
 @pytest.fixture
@@ -86,3 +95,63 @@ def checkout_with_charged_payment(checkout_with_billing_address):
     )
 
     return checkout
+
+
+@pytest.fixture
+def checkout_with_lines_factory(checkout, product_type, category):
+    """Return a function adding the given number of lines to the checkout."""
+    channel = checkout.channel
+
+    def create_lines(lines_count):
+        products = Product.objects.bulk_create(
+            [
+                Product(
+                    name=f"Product {index}",
+                    slug=f"product-{index}",
+                    product_type=product_type,
+                    category=category,
+                )
+                for index in range(lines_count)
+            ]
+        )
+        ProductChannelListing.objects.bulk_create(
+            [
+                ProductChannelListing(
+                    product=product,
+                    channel=channel,
+                    currency=channel.currency_code,
+                    is_published=True,
+                    visible_in_listings=True,
+                )
+                for product in products
+            ]
+        )
+        variants = ProductVariant.objects.bulk_create(
+            [
+                ProductVariant(product=product, sku=f"SKU-{product.slug}")
+                for product in products
+            ]
+        )
+        ProductVariantChannelListing.objects.bulk_create(
+            [
+                ProductVariantChannelListing(
+                    variant=variant,
+                    channel=channel,
+                    currency=channel.currency_code,
+                    price_amount=Decimal(index + 1),
+                    cost_price_amount=Decimal(1),
+                )
+                for index, variant in enumerate(variants)
+            ]
+        )
+        CheckoutLine.objects.bulk_create(
+            [
+                CheckoutLine(checkout=checkout, variant=variant, quantity=2)
+                for variant in variants
+            ]
+        )
+        checkout.quantity = sum(line.quantity for line in checkout.lines.all())
+        checkout.save(update_fields=["quantity"])
+        return checkout
+
+    return create_lines
@@ -0,0 +1,63 @@
+import pytest
+
+from .....checkout import calculations
+from ....tests.utils import get_graphql_content
+
+CHECKOUT_TOTALS_QUERY = """
+    query CheckoutTotals($token: UUID) {
+      checkout(token: $token) {
+        subtotalPrice {
+          gross {
+            amount
+          }
+        }
+        totalPrice {
+          gross {
+            amount
+          }
+        }
+      }
+    }
+"""
+
+
+@pytest.mark.django_db
+@pytest.mark.count_queries(autouse=False)
+def test_checkout_totals_with_100_lines(
+    api_client, checkout_with_lines_factory, settings, count_queries
+):
+    settings.PLUGINS = [
+        "saleor.plugins.tests.sample_plugins.PluginInactive",
+        "saleor.plugins.webhook.plugin.WebhookPlugin",
+    ]
+    checkout = checkout_with_lines_factory(100)
+
+    content = get_graphql_content(
+        api_client.post_graphql(CHECKOUT_TOTALS_QUERY, {"token": checkout.token})
+    )
+
+    data = content["data"]["checkout"]
+    # Lines cost 1, 2, ..., 100 and every line has quantity 2
+    assert data["subtotalPrice"]["gross"]["amount"] == 10100
+    assert data["totalPrice"]["gross"]["amount"] == 10100
+
+
+@pytest.mark.django_db
+@pytest.mark.count_queries(autouse=False)
+def test_checkout_prices_with_200_lines(
+    checkout_with_lines_factory, settings, count_queries
+):
+    settings.PLUGINS = [
+        "saleor.plugins.tests.sample_plugins.PluginInactive",
+        "saleor.plugins.webhook.plugin.WebhookPlugin",
+    ]
+    checkout = checkout_with_lines_factory(200)
+    lines = list(checkout.lines.all())
+
+    prices = calculations.checkout_prices(checkout=checkout, lines=lines)
+
+    # Lines cost 1, 2, ..., 200 and every line has quantity 2
+    assert len(prices.line_totals) == 200
+    assert prices.line_totals[lines[-1].pk].gross.amount == 400
+    assert prices.subtotal.gross.amount == 40200
+    assert prices.total.gross.amount == 40200
@@ -28,8 +28,8 @@ from ....payment.interface import GatewayResponse
 from ....plugins.manager import PluginsManager
 from ....plugins.tests.sample_plugins import ActiveDummyPaymentGateway
 from ....product.models import ProductChannelListing
-from ....shipping import models as shipping_models
 from ....warehouse.models import Stock
+from ....webhook.event_types import WebhookEventType
 from ...tests.utils import assert_no_permission, get_graphql_content
 from ..mutations import (
     clean_shipping_method,
@@ -113,7 +113,7 @@ MUTATION_CHECKOUT_CREATE = """
 """
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_object.delay")
 def test_checkout_create_triggers_webhooks(
     mocked_webhook_trigger,
     user_api_client,
@@ -121,9 +121,11 @@ def test_checkout_create_triggers_webhooks(
     graphql_address_data,
     settings,
     channel_USD,
+    webhook,
 ):
     """Create checkout object using GraphQL API."""
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
+    webhook.events.create(event_type=WebhookEventType.CHECKOUT_CREATED)
     variant = stock.product_variant
     variant_id = graphene.Node.to_global_id("ProductVariant", variant.id)
     shipping_address = graphql_address_data
@@ -2520,6 +2522,77 @@ def test_checkout_prices(user_api_client, checkout_with_item):
     assert data["subtotalPrice"]["gross"]["amount"] == (subtotal.gross.amount)
 
 
+@patch.object(
+    PluginsManager,
+    "calculate_checkout_prices",
+    autospec=True,
+    side_effect=PluginsManager.calculate_checkout_prices,
+)
+def test_checkout_prices_calculated_once_per_request(
+    mocked_calculate_checkout_prices,
+    user_api_client,
+    checkout_with_item,
+    address,
+    shipping_method,
+):
+    # given
+    checkout = checkout_with_item
+    checkout.shipping_address = address
+    checkout.shipping_method = shipping_method
+    checkout.save(update_fields=["shipping_address", "shipping_method"])
+    query = """
+    query getCheckout($token: UUID!) {
+        checkout(token: $token) {
+            totalPrice {
+                gross {
+                    amount
+                }
+            }
+            subtotalPrice {
+                gross {
+                    amount
+                }
+            }
+            shippingPrice {
+                gross {
+                    amount
+                }
+            }
+            lines {
+                totalPrice {
+                    gross {
+                        amount
+                    }
+                }
+            }
+            availableShippingMethods {
+                id
+            }
+        }
+    }
+    """
+    variables = {"token": str(checkout.token)}
+
+    # when
+    response = user_api_client.post_graphql(query, variables)
+
+    # then
+    content = get_graphql_content(response)
+    data = content["data"]["checkout"]
+    prices = calculations.checkout_prices(checkout=checkout, lines=list(checkout))
+    assert data["totalPrice"]["gross"]["amount"] == prices.total.gross.amount
+    assert data["subtotalPrice"]["gross"]["amount"] == prices.subtotal.gross.amount
+    assert data["shippingPrice"]["gross"]["amount"] == (
+        prices.shipping_price.gross.amount
+    )
+    line = checkout.lines.get()
+    assert data["lines"][0]["totalPrice"]["gross"]["amount"] == (
+        prices.line_totals[line.pk].gross.amount
+    )
+    # one call for the request and one for the expected prices
+    assert mocked_calculate_checkout_prices.call_count == 2
+
+
 MUTATION_UPDATE_SHIPPING_METHOD = """
     mutation checkoutShippingMethodUpdate(
             $checkoutId:ID!, $shippingMethodId:ID!){
@@ -2578,15 +2651,19 @@ def test_checkout_shipping_method_update(
         assert checkout.shipping_method is None
 
 
-@patch("saleor.shipping.models.check_shipping_method_for_zip_code")
+@patch("saleor.shipping.models.get_shipping_methods_excluded_by_zip_code")
 def test_checkout_shipping_method_update_excluded_zip_code(
-    mock_check_zip_code, staff_api_client, shipping_method, checkout_with_item, address
+    mock_excluded_by_zip_code,
+    staff_api_client,
+    shipping_method,
+    checkout_with_item,
+    address,
 ):
     checkout = checkout_with_item
     checkout.shipping_address = address
     checkout.save(update_fields=["shipping_address"])
     query = MUTATION_UPDATE_SHIPPING_METHOD
-    mock_check_zip_code.return_value = True
+    mock_excluded_by_zip_code.side_effect = lambda method_ids, _address: set(method_ids)
 
     checkout_id = graphene.Node.to_global_id("Checkout", checkout.pk)
     method_id = graphene.Node.to_global_id("ShippingMethod", shipping_method.id)
@@ -2605,9 +2682,7 @@ def test_checkout_shipping_method_update_excluded_zip_code(
         }
     ]
     assert checkout.shipping_method is None
-    assert (
-        mock_check_zip_code.call_count == shipping_models.ShippingMethod.objects.count()
-    )
+    mock_excluded_by_zip_code.assert_called_once()
 
 
 def test_query_checkout_line(checkout_with_item, user_api_client):
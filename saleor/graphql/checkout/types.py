@@ -1,7 +1,7 @@
 import graphene
 from promise import Promise
 
-from ...checkout import calculations, models
+from ...checkout import models
 from ...checkout.utils import get_valid_shipping_methods_for_checkout
 from ...core.exceptions import PermissionDenied
 from ...core.permissions import AccountPermissions
@@ -20,7 +20,8 @@ from ..product.resolvers import resolve_variant
 from ..shipping.dataloaders import ShippingMethodByIdLoader
 from ..shipping.types import ShippingMethod
 from ..utils import get_user_or_app_from_context
-from .dataloaders import CheckoutLinesByCheckoutTokenLoader
+from .dataloaders import CheckoutByIdLoader, CheckoutLinesByCheckoutTokenLoader
+from .utils import get_checkout_prices
 
 
 class GatewayConfigLine(graphene.ObjectType):
@@ -75,22 +76,17 @@ class CheckoutLine(CountableDjangoObjectType):
 
     @staticmethod
     def resolve_total_price(root, info):
-        context = info.context
-        channel = ChannelByCheckoutLineIDLoader(context).load(root.id)
-
-        def calculate_total_price_with_discounts(discounts):
-            def calculate_total_price_with_channel(channel):
-                return info.context.plugins.calculate_checkout_line_total(
-                    checkout_line=root, discounts=discounts, channel=channel,
-                )
-
-            return channel.then(calculate_total_price_with_channel)
+        def calculate_total_price(data):
+            checkout, lines, discounts = data
+            prices = get_checkout_prices(info.context, checkout, lines, discounts)
+            return prices.line_totals[root.pk]
 
-        return (
-            DiscountsByDateTimeLoader(context)
-            .load(context.request_time)
-            .then(calculate_total_price_with_discounts)
+        checkout = CheckoutByIdLoader(info.context).load(root.checkout_id)
+        lines = CheckoutLinesByCheckoutTokenLoader(info.context).load(root.checkout_id)
+        discounts = DiscountsByDateTimeLoader(info.context).load(
+            info.context.request_time
         )
+        return Promise.all([checkout, lines, discounts]).then(calculate_total_price)
 
     @staticmethod
     def resolve_requires_shipping(root: models.CheckoutLine, *_args):
@@ -196,16 +192,11 @@ class Checkout(CountableDjangoObjectType):
         )
 
     @staticmethod
-    # TODO: We should optimize it in/after PR#5819
     def resolve_total_price(root: models.Checkout, info):
         def calculate_total_price(data):
             lines, discounts = data
-            taxed_total = (
-                calculations.checkout_total(
-                    checkout=root, lines=lines, discounts=discounts
-                )
-                - root.get_total_gift_cards_balance()
-            )
+            prices = get_checkout_prices(info.context, root, lines, discounts)
+            taxed_total = prices.total - root.get_total_gift_cards_balance()
             return max(taxed_total, zero_taxed_money(root.currency))
 
         lines = CheckoutLinesByCheckoutTokenLoader(info.context).load(root.token)
@@ -216,13 +207,11 @@ class Checkout(CountableDjangoObjectType):
         return Promise.all([lines, discounts]).then(calculate_total_price)
 
     @staticmethod
-    # TODO: We should optimize it in/after PR#5819
     def resolve_subtotal_price(root: models.Checkout, info):
         def calculate_subtotal_price(data):
             lines, discounts = data
-            return calculations.checkout_subtotal(
-                checkout=root, lines=lines, discounts=discounts
-            )
+            prices = get_checkout_prices(info.context, root, lines, discounts)
+            return prices.subtotal
 
         lines = CheckoutLinesByCheckoutTokenLoader(info.context).load(root.token)
         discounts = DiscountsByDateTimeLoader(info.context).load(
@@ -232,13 +221,11 @@ class Checkout(CountableDjangoObjectType):
         return Promise.all([lines, discounts]).then(calculate_subtotal_price)
 
     @staticmethod
-    # TODO: We should optimize it in/after PR#5819
     def resolve_shipping_price(root: models.Checkout, info):
         def calculate_shipping_price(data):
             lines, discounts = data
-            return calculations.checkout_shipping_price(
-                checkout=root, lines=lines, discounts=discounts
-            )
+            prices = get_checkout_prices(info.context, root, lines, discounts)
+            return prices.shipping_price
 
         lines = CheckoutLinesByCheckoutTokenLoader(info.context).load(root.token)
         discounts = DiscountsByDateTimeLoader(info.context).load(
@@ -253,11 +240,13 @@ class Checkout(CountableDjangoObjectType):
         return root.lines.prefetch_related("variant")
 
     @staticmethod
-    # TODO: We should optimize it in/after PR#5819
     def resolve_available_shipping_methods(root: models.Checkout, info):
         def calculate_available_shipping_methods(data):
             lines, discounts = data
-            available = get_valid_shipping_methods_for_checkout(root, lines, discounts)
+            prices = get_checkout_prices(info.context, root, lines, discounts)
+            available = get_valid_shipping_methods_for_checkout(
+                root, lines, discounts, subtotal=prices.subtotal
+            )
             if available is None:
                 return []
             manager = get_plugins_manager()
@@ -265,11 +254,8 @@ class Checkout(CountableDjangoObjectType):
             for shipping_method in available:
                 # ignore mypy checking because it is checked in
                 # get_valid_shipping_methods_for_checkout
-                shipping_channel_listing = shipping_method.channel_listings.get(
-                    channel=root.channel
-                )
                 taxed_price = manager.apply_taxes_to_shipping(  # type: ignore
-                    shipping_channel_listing.price, root.shipping_address
+                    shipping_method.channel_listing.price, root.shipping_address
                 )
                 if display_gross:
                     shipping_method.price = taxed_price.gross
@@ -0,0 +1,30 @@
+from typing import Dict, Iterable, Optional, Tuple
+
+from ...checkout import CheckoutPrices, calculations
+from ...checkout.models import Checkout, CheckoutLine
+from ...discount import DiscountInfo
+
+
+def get_checkout_prices_memo(context) -> Dict[Tuple, CheckoutPrices]:
+    """Return checkout prices memoized for the current request.
+
+    Checkout types and mutations pass it to the calculations, so each price of a
+    checkout is calculated at most once per request.
+    """
+    if not hasattr(context, "checkout_prices"):
+        context.checkout_prices = {}
+    return context.checkout_prices
+
+
+def get_checkout_prices(
+    context,
+    checkout: Checkout,
+    lines: Iterable[CheckoutLine],
+    discounts: Optional[Iterable[DiscountInfo]],
+) -> CheckoutPrices:
+    return calculations.checkout_prices(
+        checkout=checkout,
+        lines=lines,
+        discounts=discounts,
+        memo=get_checkout_prices_memo(context),
+    )
@@ -0,0 +1,90 @@
+from unittest.mock import patch
+
+import graphene
+
+from ...backend import CachedGraphQLBackend, DocumentCache
+
+
+class Query(graphene.ObjectType):
+    hello = graphene.String()
+
+    def resolve_hello(self, info):
+        return "world"
+
+
+schema = graphene.Schema(query=Query)
+
+
+def test_cached_backend_reuses_document():
+    # given
+    cache = DocumentCache(max_size=10)
+    backend = CachedGraphQLBackend(cache=cache)
+
+    # when
+    first = backend.document_from_string(schema, "{ hello }")
+    second = backend.document_from_string(schema, "{ hello }")
+
+    # then
+    assert first is second
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 1, "max_size": 10}
+    assert first.execute().data == {"hello": "world"}
+
+
+def test_cached_backend_validates_only_once():
+    # given
+    cache = DocumentCache(max_size=10)
+    backend = CachedGraphQLBackend(cache=cache)
+
+    # when
+    with patch("saleor.graphql.backend.validate", return_value=[]) as validate:
+        document = backend.document_from_string(schema, "{ hello }")
+        document.execute()
+        backend.document_from_string(schema, "{ hello }").execute()
+
+    # then
+    validate.assert_called_once()
+
+
+def test_cached_backend_returns_cached_validation_errors():
+    # given
+    backend = CachedGraphQLBackend(cache=DocumentCache(max_size=10))
+
+    # when
+    result = backend.document_from_string(schema, "{ missingField }").execute()
+    cached_result = backend.document_from_string(schema, "{ missingField }").execute()
+
+    # then
+    assert result.invalid
+    assert cached_result.invalid
+    assert result.errors == cached_result.errors
+
+
+def test_document_cache_evicts_least_recently_used():
+    # given
+    cache = DocumentCache(max_size=2)
+    backend = CachedGraphQLBackend(cache=cache)
+    first = backend.document_from_string(schema, "{ hello }")
+    backend.document_from_string(schema, "query A { hello }")
+
+    # when
+    backend.document_from_string(schema, "{ hello }")
+    backend.document_from_string(schema, "query B { hello }")
+
+    # then
+    assert len(cache) == 2
+    assert backend.document_from_string(schema, "{ hello }") is first
+    assert cache.get((id(schema), "missing")) is None
+
+
+def test_document_cache_disabled_with_zero_size():
+    # given
+    cache = DocumentCache(max_size=0)
+    backend = CachedGraphQLBackend(cache=cache)
+
+    # when
+    first = backend.document_from_string(schema, "{ hello }")
+    second = backend.document_from_string(schema, "{ hello }")
+
+    # then
+    assert first is not second
+    assert len(cache) == 0
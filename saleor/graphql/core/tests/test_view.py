@@ -1,3 +1,4 @@
+import threading
 from unittest import mock
 
 import graphene
@@ -5,6 +6,7 @@ import pytest
 from django.test import override_settings
 
 from ....demo.views import EXAMPLE_QUERY
+from ...backend import get_query_hash
 from ...tests.fixtures import (
     ACCESS_CONTROL_ALLOW_CREDENTIALS,
     ACCESS_CONTROL_ALLOW_HEADERS,
@@ -13,6 +15,7 @@ from ...tests.fixtures import (
     API_PATH,
 )
 from ...tests.utils import get_graphql_content, get_graphql_content_from_response
+from ...views import GraphQLView
 
 
 def test_batch_queries(category, product, api_client, channel_USD):
@@ -309,3 +312,120 @@ def test_example_query(api_client, product):
     response = api_client.post_graphql(EXAMPLE_QUERY)
     content = get_graphql_content(response)
     assert content["data"]["products"]["edges"][0]["node"]["name"] == product.name
+
+
+PERSISTED_QUERY = "query GetShopName { shop { name } }"
+
+
+def _persisted_query_extensions(query_hash):
+    return {"persistedQuery": {"version": 1, "sha256Hash": query_hash}}
+
+
+def test_persisted_query_not_found(api_client, site_settings):
+    query_hash = get_query_hash("query NotRegistered { shop { name } }")
+    response = api_client.post({"extensions": _persisted_query_extensions(query_hash)})
+    content = get_graphql_content_from_response(response)
+    assert response.status_code == 200
+    assert content["errors"][0]["message"] == "PersistedQueryNotFound"
+
+
+def test_persisted_query_registered_and_resolved_by_hash(api_client, site_settings):
+    # given
+    query_hash = get_query_hash(PERSISTED_QUERY)
+    extensions = _persisted_query_extensions(query_hash)
+    response = api_client.post({"query": PERSISTED_QUERY, "extensions": extensions})
+    content = get_graphql_content(response)
+    assert content["data"]["shop"]["name"] == site_settings.site.name
+
+    # when
+    response = api_client.post({"extensions": extensions})
+
+    # then
+    content = get_graphql_content(response)
+    assert content["data"]["shop"]["name"] == site_settings.site.name
+
+
+def test_persisted_query_in_batch(api_client, site_settings):
+    query_hash = get_query_hash(PERSISTED_QUERY)
+    extensions = _persisted_query_extensions(query_hash)
+    api_client.post({"query": PERSISTED_QUERY, "extensions": extensions})
+
+    response = api_client.post([{"extensions": extensions}, {"query": PERSISTED_QUERY}])
+
+    content = get_graphql_content(response)
+    assert [entry["data"]["shop"]["name"] for entry in content] == [
+        site_settings.site.name,
+        site_settings.site.name,
+    ]
+
+
+def test_persisted_query_hash_mismatch(api_client, site_settings):
+    extensions = _persisted_query_extensions(get_query_hash("{ shop { domain } }"))
+    response = api_client.post({"query": PERSISTED_QUERY, "extensions": extensions})
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == (
+        "Provided sha256Hash does not match the query."
+    )
+
+
+def test_persisted_query_disabled(api_client, site_settings, settings):
+    settings.GRAPHQL_PERSISTED_QUERIES_ENABLED = False
+    extensions = _persisted_query_extensions(get_query_hash(PERSISTED_QUERY))
+    response = api_client.post({"query": PERSISTED_QUERY, "extensions": extensions})
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == "PersistedQueryNotSupported"
+
+
+def test_batch_queries_executed_in_parallel_and_mutations_in_order(
+    api_client, settings
+):
+    # given
+    settings.GRAPHQL_BATCH_MAX_WORKERS = 2
+    calls = []
+
+    def get_response(self, request, data):
+        calls.append((data["query"], threading.current_thread().name))
+        return {"data": data["query"]}, 200
+
+    query = "query Shop { shop { name } }"
+    mutation = "mutation Logout { tokensDeactivateAll { errors { field } } }"
+    data = [{"query": query}, {"query": mutation}, {"query": query}]
+
+    # when
+    with mock.patch.object(GraphQLView, "get_response", get_response):
+        response = api_client.post(data)
+
+    # then
+    content = get_graphql_content(response)
+    assert [entry["data"] for entry in content] == [query, mutation, query]
+    threads = {query: set(), mutation: set()}
+    for executed_query, thread_name in calls:
+        threads[executed_query].add(thread_name)
+    assert all(name.startswith("graphql-batch") for name in threads[query])
+    assert threads[mutation] == {threading.current_thread().name}
+    assert [executed_query for executed_query, _ in calls].index(mutation) == 1
+
+
+def test_batch_queries_executed_in_parallel_get_own_request_state(
+    api_client, settings
+):
+    # given
+    settings.GRAPHQL_BATCH_MAX_WORKERS = 2
+    requests = []
+
+    def get_response(self, request, data):
+        requests.append(request)
+        return {"data": None}, 200
+
+    query = "query Shop { shop { name } }"
+
+    # when
+    with mock.patch.object(GraphQLView, "get_response", get_response):
+        api_client.post([{"query": query}, {"query": query}])
+
+    # then
+    first_request, second_request = requests
+    assert first_request is not second_request
+    assert first_request.dataloaders is not second_request.dataloaders
+    assert first_request.plugins is not second_request.plugins
+    assert first_request.discounts is not second_request.discounts
@@ -19,7 +19,6 @@ from ....order.actions import (
 from ....order.error_codes import OrderErrorCode
 from ....order.utils import get_valid_shipping_methods_for_order, update_order_prices
 from ....payment import CustomPaymentChoices, PaymentError, TransactionKind, gateway
-from ....shipping import models as shipping_models
 from ...account.types import AddressInput
 from ...core.mutations import BaseMutation, ModelMutation
 from ...core.scalars import PositiveDecimal
@@ -43,9 +42,7 @@ def clean_order_update_shipping(order, method):
         )
 
     valid_methods = get_valid_shipping_methods_for_order(order)
-    if valid_methods is None or method.pk not in valid_methods.values_list(
-        "id", flat=True
-    ):
+    if valid_methods is None or method not in valid_methods:
         raise ValidationError(
             {
                 "shipping_method": ValidationError(
@@ -254,9 +251,6 @@ class OrderUpdateShipping(BaseMutation):
             data["shipping_method"],
             field="shipping_method",
             only_type=ShippingMethod,
-            qs=shipping_models.ShippingMethod.objects.prefetch_related(
-                "zip_code_rules"
-            ),
         )
 
         clean_order_update_shipping(order, method)
@@ -15,6 +15,7 @@ from ...payment.utils import create_payment, is_currency_supported
 from ..account.i18n import I18nMixin
 from ..account.types import AddressInput
 from ..checkout.types import Checkout
+from ..checkout.utils import get_checkout_prices_memo
 from ..core.mutations import BaseMutation
 from ..core.scalars import PositiveDecimal
 from ..core.types import common as common_types
@@ -156,7 +157,9 @@ class CheckoutPaymentCreate(BaseMutation, I18nMixin):
         cls.validate_gateway(gateway, checkout.currency)
         cls.validate_return_url(data)
         checkout_total = calculate_checkout_total_with_gift_cards(
-            checkout, info.context.discounts
+            checkout,
+            info.context.discounts,
+            memo=get_checkout_prices_memo(info.context),
         )
         amount = data.get("amount", checkout_total.gross.amount)
 
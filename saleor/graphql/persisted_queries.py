@@ -0,0 +1,74 @@
+"""Apollo-style automatic persisted queries.
+
+A client sends only the sha256 hash of the query in
+`extensions.persistedQuery.sha256Hash`. If the server doesn't know the hash yet
+it responds with `PersistedQueryNotFound` and the client retries with both the
+hash and the full query, which is then stored in the cache for subsequent
+requests.
+"""
+import json
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .backend import get_query_hash
+
+CACHE_KEY = "graphql_persisted_query_"
+SUPPORTED_VERSION = 1
+
+
+class PersistedQueryError(Exception):
+    pass
+
+
+class PersistedQueryNotFound(PersistedQueryError):
+    def __init__(self):
+        super().__init__("PersistedQueryNotFound")
+
+
+class PersistedQueryNotSupported(PersistedQueryError):
+    def __init__(self):
+        super().__init__("PersistedQueryNotSupported")
+
+
+def get_persisted_query_params(extensions) -> Optional[dict]:
+    if isinstance(extensions, str):
+        try:
+            extensions = json.loads(extensions)
+        except ValueError:
+            return None
+    if not isinstance(extensions, dict):
+        return None
+    persisted_query = extensions.get("persistedQuery")
+    return persisted_query if isinstance(persisted_query, dict) else None
+
+
+def resolve_persisted_query(query: Optional[str], extensions) -> Optional[str]:
+    """Return the query string for a request that may use a persisted query.
+
+    Raise PersistedQueryNotFound when only a hash was sent and it is unknown.
+    Store the query in the cache when both the query and its hash were sent.
+    """
+    persisted_query = get_persisted_query_params(extensions)
+    if persisted_query is None:
+        return query
+    if not settings.GRAPHQL_PERSISTED_QUERIES_ENABLED:
+        raise PersistedQueryNotSupported()
+    if persisted_query.get("version") != SUPPORTED_VERSION:
+        raise PersistedQueryError("Unsupported persisted query version.")
+    query_hash = persisted_query.get("sha256Hash")
+    if not query_hash or not isinstance(query_hash, str):
+        raise PersistedQueryError("Missing persisted query hash.")
+
+    cache_key = CACHE_KEY + query_hash
+    if not query:
+        query = cache.get(cache_key)
+        if query is None:
+            raise PersistedQueryNotFound()
+        return query
+
+    if not isinstance(query, str) or get_query_hash(query) != query_hash:
+        raise PersistedQueryError("Provided sha256Hash does not match the query.")
+    cache.set(cache_key, query, settings.GRAPHQL_PERSISTED_QUERIES_TIMEOUT)
+    return query
@@ -3,16 +3,14 @@ from typing import Dict, Iterable, List, Optional
 
 import django_filters
 import graphene
-from django.db.models import Exists, F, OuterRef, Q, Subquery, Sum
+from django.db.models import Count, F, Q, Subquery, Sum
 from django.db.models.functions import Coalesce
 from graphene_django.filter import GlobalIDFilter, GlobalIDMultipleChoiceFilter
 
-from ...attribute.models import (
-    AssignedProductAttribute,
-    AssignedVariantAttribute,
-    Attribute,
-)
+from ...attribute.models import ProductAttributeValueIndex
+from ...attribute.utils import get_attribute_slug_map
 from ...product.models import Category, Collection, Product, ProductType, ProductVariant
+from ...product.utils.categories import get_descendant_category_ids
 from ...search.backends import picker
 from ...warehouse.models import Stock
 from ..channel.filters import get_channel_slug_from_filter_data
@@ -33,25 +31,16 @@ from .enums import (
 def _clean_product_attributes_filter_input(
     filter_value,
 ) -> Dict[int, List[Optional[int]]]:
-    attributes = Attribute.objects.prefetch_related("values")
-    attributes_map: Dict[str, int] = {
-        attribute.slug: attribute.pk for attribute in attributes
-    }
-    values_map: Dict[str, Dict[str, int]] = {
-        attr.slug: {value.slug: value.pk for value in attr.values.all()}
-        for attr in attributes
-    }
+    attributes_map = get_attribute_slug_map()
     queries: Dict[int, List[Optional[int]]] = defaultdict(list)
     # Convert attribute:value pairs into a dictionary where
     # attributes are keys and values are grouped in lists
     for attr_name, val_slugs in filter_value:
         if attr_name not in attributes_map:
             raise ValueError("Unknown attribute name: %r" % (attr_name,))
-        attr_pk = attributes_map[attr_name]
+        attr_pk, values_map = attributes_map[attr_name]
         attr_val_pk = [
-            values_map[attr_name][val_slug]
-            for val_slug in val_slugs
-            if val_slug in values_map[attr_name]
+            values_map[val_slug] for val_slug in val_slugs if val_slug in values_map
         ]
         queries[attr_pk] += attr_val_pk
 
@@ -62,25 +51,24 @@ T_PRODUCT_FILTER_QUERIES = Dict[int, Iterable[int]]
 
 
 def filter_products_by_attributes_values(qs, queries: T_PRODUCT_FILTER_QUERIES):
-    filters = [
-        Q(
-            Exists(
-                AssignedProductAttribute.objects.filter(
-                    product__id=OuterRef("pk"), values__pk__in=values
-                )
-            )
-        )
-        | Q(
-            Exists(
-                AssignedVariantAttribute.objects.filter(
-                    variant__product__id=OuterRef("pk"), values__pk__in=values,
-                )
-            )
-        )
-        for values in queries.values()
-    ]
+    """Filter products having any of the given values for each of the attributes.
 
-    return qs.filter(*filters)
+    Uses the product attribute value index, so products that match all attributes
+    are found with a single grouped subquery.
+    """
+    if not queries:
+        return qs
+    value_ids = {value_id for values in queries.values() for value_id in values}
+    product_ids = (
+        ProductAttributeValueIndex.objects.filter(
+            attribute_id__in=list(queries), value_id__in=value_ids
+        )
+        .values("product_id")
+        .annotate(attributes_count=Count("attribute_id", distinct=True))
+        .filter(attributes_count=len(queries))
+        .values("product_id")
+    )
+    return qs.filter(pk__in=Subquery(product_ids))
 
 
 def filter_products_by_attributes(qs, filter_value):
@@ -119,10 +107,7 @@ def filter_products_by_minimal_price(
 
 
 def filter_products_by_categories(qs, categories):
-    categories = [
-        category.get_descendants(include_self=True) for category in categories
-    ]
-    ids = {category.id for tree in categories for category in tree}
+    ids = get_descendant_category_ids([category.pk for category in categories])
     return qs.filter(category__in=ids)
 
 
@@ -130,18 +115,20 @@ def filter_products_by_collections(qs, collections):
     return qs.filter(collections__in=collections)
 
 
-def filter_products_by_stock_availability(qs, stock_availability):
-    total_stock = (
+def get_out_of_stock_product_ids():
+    return (
         Stock.objects.select_related("product_variant")
         .values("product_variant__product_id")
-        .annotate(
-            total_quantity_allocated=Coalesce(Sum("allocations__quantity_allocated"), 0)
-        )
+        .annotate(total_quantity_allocated=Coalesce(Sum("quantity_allocated"), 0))
         .annotate(total_quantity=Coalesce(Sum("quantity"), 0))
         .annotate(total_available=F("total_quantity") - F("total_quantity_allocated"))
         .filter(total_available__lte=0)
         .values_list("product_variant__product_id", flat=True)
     )
+
+
+def filter_products_by_stock_availability(qs, stock_availability):
+    total_stock = get_out_of_stock_product_ids()
     if stock_availability == StockAvailability.IN_STOCK:
         qs = qs.exclude(id__in=Subquery(total_stock))
     elif stock_availability == StockAvailability.OUT_OF_STOCK:
@@ -14,6 +14,7 @@ from ....attribute import AttributeType
 from ....attribute.utils import associate_attribute_values_to_instance
 from ....core.exceptions import PermissionDenied
 from ....core.permissions import ProductPermissions, ProductTypePermissions
+from ....discount.utils import invalidate_discounts_cache
 from ....order import OrderStatus, models as order_models
 from ....page import models as page_models
 from ....page.error_codes import PageErrorCode
@@ -127,6 +128,8 @@ class CategoryCreate(ModelMutation):
     @classmethod
     def save(cls, info, instance, cleaned_input):
         instance.save()
+        # Sales assigned to a category apply to all its descendants
+        invalidate_discounts_cache()
         if cleaned_input.get("background_image"):
             create_category_background_image_thumbnails.delay(instance.pk)
 
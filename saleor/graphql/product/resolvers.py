@@ -1,8 +1,14 @@
+import hashlib
+import json
 from typing import Union
 
-from django.db.models import Sum
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q, Subquery, Sum
+from graphql.error import GraphQLError
 from promise import Promise
 
+from ...attribute.models import Attribute, AttributeValue, ProductAttributeValueIndex
 from ...checkout.models import CheckoutLine
 from ...order import OrderStatus
 from ...order.models import OrderLine
@@ -12,13 +18,21 @@ from ..channel.dataloaders import (
     ChannelByCheckoutLineIDLoader,
     ChannelByOrderLineIdLoader,
 )
+from ..core.fields import FilterInputConnectionField
 from ..product.dataloaders import (
     ProductChannelListingByProductIdAndChannelSlugLoader,
     ProductVariantByIdLoader,
 )
 from ..utils import get_database_id, get_user_or_app_from_context
 from ..utils.filters import filter_by_period
-from .filters import filter_products_by_stock_availability
+from .enums import StockAvailability
+from .filters import (
+    ProductFilter,
+    filter_products_by_stock_availability,
+    get_out_of_stock_product_ids,
+)
+
+PRODUCT_FACETS_CACHE_KEY = "product_facets_"
 
 
 def resolve_category_by_slug(slug):
@@ -88,6 +102,138 @@ def resolve_products(
     return ChannelQsContext(qs=qs.distinct(), channel_slug=channel_slug)
 
 
+def _get_product_facets_cache_key(*args) -> str:
+    data = json.dumps(args, sort_keys=True, default=str)
+    return PRODUCT_FACETS_CACHE_KEY + hashlib.sha256(data.encode()).hexdigest()
+
+
+def _count_product_facets(
+    product_ids, requestor, channel_slug, attribute_slugs, price_ranges
+) -> dict:
+    """Count products for all facets with two grouped queries.
+
+    Return plain data, so the result can be stored in the cache.
+    """
+    aggregates = {
+        "total_count": Count("pk", distinct=True),
+        "out_of_stock_count": Count(
+            "pk",
+            distinct=True,
+            filter=Q(pk__in=Subquery(get_out_of_stock_product_ids())),
+        ),
+    }
+    for index, price_range in enumerate(price_ranges):
+        lookup = {"channel_listings__channel__slug": channel_slug}
+        gte, lte = price_range.get("gte"), price_range.get("lte")
+        if gte is not None:
+            lookup["channel_listings__discounted_price_amount__gte"] = gte
+        if lte is not None:
+            lookup["channel_listings__discounted_price_amount__lte"] = lte
+        aggregates[f"price_range_{index}"] = Count(
+            "pk", distinct=True, filter=Q(**lookup)
+        )
+    counts = models.Product.objects.filter(pk__in=product_ids).aggregate(**aggregates)
+
+    attributes = Attribute.objects.get_visible_to_user(requestor)
+    if attribute_slugs is not None:
+        attributes = attributes.filter(slug__in=attribute_slugs)
+    value_counts = (
+        ProductAttributeValueIndex.objects.filter(
+            product_id__in=product_ids, attribute_id__in=attributes.values("pk")
+        )
+        .values("value_id")
+        .annotate(count=Count("product_id", distinct=True))
+        .order_by()
+    )
+
+    return {
+        "total_count": counts["total_count"],
+        "out_of_stock_count": counts["out_of_stock_count"],
+        "price_ranges": [
+            (price_range.get("gte"), price_range.get("lte"), counts[f"price_range_{i}"])
+            for i, price_range in enumerate(price_ranges)
+        ],
+        "value_counts": {row["value_id"]: row["count"] for row in value_counts},
+    }
+
+
+def resolve_product_facets(
+    info,
+    requestor,
+    channel_slug=None,
+    filter=None,
+    attributes=None,
+    price_ranges=None,
+    **_kwargs,
+):
+    price_ranges = price_ranges or []
+    if price_ranges and not channel_slug:
+        raise GraphQLError(
+            "You must provide a `channel` to count products in price ranges."
+        )
+
+    timeout = settings.PRODUCT_FACETS_CACHE_TIMEOUT
+    cache_key = _get_product_facets_cache_key(
+        filter,
+        channel_slug,
+        attributes,
+        price_ranges,
+        models.Product.objects.user_has_access_to_all(requestor),
+    )
+    facets = cache.get(cache_key) if timeout else None
+    if facets is None:
+        qs = resolve_products(info, requestor, channel_slug=channel_slug).qs
+        qs = FilterInputConnectionField.filter_iterable(
+            qs, ProductFilter, "filter", info, filter=filter
+        )
+        facets = _count_product_facets(
+            qs.values("pk"), requestor, channel_slug, attributes, price_ranges
+        )
+        if timeout:
+            cache.set(cache_key, facets, timeout)
+
+    value_counts = facets["value_counts"]
+    attribute_facets: dict = {}
+    values = (
+        AttributeValue.objects.filter(pk__in=value_counts.keys())
+        .select_related("attribute")
+        .order_by(
+            "attribute__storefront_search_position",
+            "attribute__slug",
+            "sort_order",
+            "pk",
+        )
+    )
+    for value in values:
+        attribute_facet = attribute_facets.setdefault(
+            value.attribute_id, {"attribute": value.attribute, "values": []}
+        )
+        attribute_facet["values"].append(
+            {"value": value, "count": value_counts[value.pk]}
+        )
+
+    total_count = facets["total_count"]
+    out_of_stock_count = facets["out_of_stock_count"]
+    return {
+        "total_count": total_count,
+        "attributes": list(attribute_facets.values()),
+        "price_ranges": [
+            {"gte": gte, "lte": lte, "count": count}
+            for gte, lte, count in facets["price_ranges"]
+        ],
+        "stock_availability": [
+            {
+                "availability": StockAvailability.IN_STOCK,
+                "count": total_count - out_of_stock_count,
+            },
+            {
+                "availability": StockAvailability.OUT_OF_STOCK,
+                "count": out_of_stock_count,
+            },
+        ],
+    }
+
+
 def resolve_variant_by_id(info, id, channel_slug, requestor):
     visible_products = models.Product.objects.visible_to_user(
         requestor, channel_slug
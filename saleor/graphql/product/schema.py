@@ -10,6 +10,7 @@ from ..core.fields import (
     FilterInputConnectionField,
     PrefetchingConnectionField,
 )
+from ..core.types.common import PriceRangeInput
 from ..core.validators import validate_one_of_args_is_in_query
 from ..decorators import permission_required
 from ..translations.mutations import (
@@ -92,6 +93,7 @@ from .resolvers import (
     resolve_digital_contents,
     resolve_product_by_id,
     resolve_product_by_slug,
+    resolve_product_facets,
     resolve_product_types,
     resolve_product_variant_by_sku,
     resolve_product_variants,
@@ -110,6 +112,7 @@ from .types import (
     Collection,
     DigitalContent,
     Product,
+    ProductFacets,
     ProductType,
     ProductVariant,
 )
@@ -185,6 +188,28 @@ class ProductQueries(graphene.ObjectType):
         ),
         description="List of the shop's products.",
     )
+    product_facets = graphene.Field(
+        ProductFacets,
+        filter=ProductFilterInput(description="Filtering options for products."),
+        attributes=graphene.List(
+            graphene.NonNull(graphene.String),
+            description=(
+                "Slugs of attributes to count the products for. "
+                "By default all attributes are counted."
+            ),
+        ),
+        price_ranges=graphene.List(
+            graphene.NonNull(PriceRangeInput),
+            description="Price ranges to count the products for.",
+        ),
+        channel=graphene.String(
+            description="Slug of a channel for which the data should be returned."
+        ),
+        description=(
+            "Numbers of products matching the filter for attribute values, price "
+            "ranges and stock availability."
+        ),
+    )
     product_type = graphene.Field(
         ProductType,
         id=graphene.Argument(
@@ -314,6 +339,15 @@ class ProductQueries(graphene.ObjectType):
             channel = get_default_channel_slug_or_graphql_error()
         return resolve_products(info, requestor, channel_slug=channel, **kwargs)
 
+    def resolve_product_facets(self, info, channel=None, **kwargs):
+        requestor = get_user_or_app_from_context(info.context)
+        requestor_has_access_to_all = models.Product.objects.user_has_access_to_all(
+            requestor
+        )
+        if channel is None and not requestor_has_access_to_all:
+            channel = get_default_channel_slug_or_graphql_error()
+        return resolve_product_facets(info, requestor, channel_slug=channel, **kwargs)
+
     def resolve_product_type(self, info, id, **_kwargs):
         return graphene.Node.get_node_from_global_id(info, id, ProductType)
 
@@ -0,0 +1,130 @@
+from ....attribute.utils import associate_attribute_values_to_instance
+from ....warehouse.models import Stock
+from ...tests.utils import get_graphql_content
+
+QUERY_PRODUCT_FACETS = """
+    query ProductFacets(
+        $filter: ProductFilterInput, $priceRanges: [PriceRangeInput!], $channel: String
+    ) {
+        productFacets(filter: $filter, priceRanges: $priceRanges, channel: $channel) {
+            totalCount
+            attributes {
+                attribute {
+                    slug
+                }
+                values {
+                    value {
+                        slug
+                    }
+                    count
+                }
+            }
+            priceRanges {
+                gte
+                lte
+                count
+            }
+            stockAvailability {
+                availability
+                count
+            }
+        }
+    }
+"""
+
+
+def _prepare_products(product_list, color_attribute):
+    blue = color_attribute.values.get(slug="blue")
+    associate_attribute_values_to_instance(product_list[2], color_attribute, blue)
+    Stock.objects.filter(product_variant__product=product_list[1]).update(quantity=0)
+
+
+def test_product_facets(api_client, product_list, color_attribute, channel_USD):
+    # given
+    _prepare_products(product_list, color_attribute)
+    variables = {
+        "channel": channel_USD.slug,
+        "priceRanges": [{"lte": 15}, {"gte": 15}],
+    }
+
+    # when
+    response = api_client.post_graphql(QUERY_PRODUCT_FACETS, variables)
+
+    # then
+    content = get_graphql_content(response)
+    data = content["data"]["productFacets"]
+    assert data["totalCount"] == 3
+    assert data["attributes"] == [
+        {
+            "attribute": {"slug": "color"},
+            "values": [
+                {"value": {"slug": "red"}, "count": 2},
+                {"value": {"slug": "blue"}, "count": 1},
+            ],
+        }
+    ]
+    assert data["priceRanges"] == [
+        {"gte": None, "lte": 15, "count": 1},
+        {"gte": 15, "lte": None, "count": 2},
+    ]
+    assert data["stockAvailability"] == [
+        {"availability": "IN_STOCK", "count": 2},
+        {"availability": "OUT_OF_STOCK", "count": 1},
+    ]
+
+
+def test_product_facets_with_filter(
+    api_client, product_list, color_attribute, channel_USD
+):
+    # given
+    _prepare_products(product_list, color_attribute)
+    variables = {
+        "channel": channel_USD.slug,
+        "filter": {"attributes": [{"slug": "color", "values": ["red"]}]},
+    }
+
+    # when
+    response = api_client.post_graphql(QUERY_PRODUCT_FACETS, variables)
+
+    # then
+    content = get_graphql_content(response)
+    data = content["data"]["productFacets"]
+    assert data["totalCount"] == 2
+    assert data["attributes"][0]["values"] == [{"value": {"slug": "red"}, "count": 2}]
+    assert data["stockAvailability"] == [
+        {"availability": "IN_STOCK", "count": 1},
+        {"availability": "OUT_OF_STOCK", "count": 1},
+    ]
+
+
+def test_product_facets_cached(
+    api_client, product_list, color_attribute, channel_USD, settings
+):
+    # given
+    settings.PRODUCT_FACETS_CACHE_TIMEOUT = 60
+    variables = {"channel": channel_USD.slug}
+    api_client.post_graphql(QUERY_PRODUCT_FACETS, variables)
+    product_list[0].delete()
+
+    # when
+    response = api_client.post_graphql(QUERY_PRODUCT_FACETS, variables)
+
+    # then
+    content = get_graphql_content(response)
+    assert content["data"]["productFacets"]["totalCount"] == 3
+
+
+def test_product_facets_not_cached_by_default(
+    api_client, product_list, color_attribute, channel_USD
+):
+    # given
+    variables = {"channel": channel_USD.slug}
+    api_client.post_graphql(QUERY_PRODUCT_FACETS, variables)
+    product_list[0].delete()
+
+    # when
+    response = api_client.post_graphql(QUERY_PRODUCT_FACETS, variables)
+
+    # then
+    content = get_graphql_content(response)
+    assert content["data"]["productFacets"]["totalCount"] == 2
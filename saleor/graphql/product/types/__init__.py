@@ -1,5 +1,6 @@
 # flake8: noqa
 from .digital_contents import DigitalContent, DigitalContentUrl
+from .facets import ProductFacets
 from .products import (
     Category,
     Collection,
@@ -0,0 +1,73 @@
+import graphene
+
+from ...attribute.types import Attribute, AttributeValue
+from ..enums import StockAvailability
+
+
+class AttributeValueFacet(graphene.ObjectType):
+    value = graphene.Field(
+        AttributeValue, required=True, description="Value of the attribute."
+    )
+    count = graphene.Int(
+        required=True, description="Number of products with the attribute value."
+    )
+
+    class Meta:
+        description = "Number of products with the attribute value."
+
+
+class AttributeFacet(graphene.ObjectType):
+    attribute = graphene.Field(Attribute, required=True, description="The attribute.")
+    values = graphene.List(
+        graphene.NonNull(AttributeValueFacet),
+        required=True,
+        description="Numbers of products for values of the attribute.",
+    )
+
+    class Meta:
+        description = "Numbers of products for values of the attribute."
+
+
+class PriceRangeFacet(graphene.ObjectType):
+    gte = graphene.Float(description="Price greater than or equal to.")
+    lte = graphene.Float(description="Price less than or equal to.")
+    count = graphene.Int(
+        required=True, description="Number of products in the price range."
+    )
+
+    class Meta:
+        description = "Number of products with the minimal price in the price range."
+
+
+class StockAvailabilityFacet(graphene.ObjectType):
+    availability = StockAvailability(required=True, description="Stock availability.")
+    count = graphene.Int(
+        required=True, description="Number of products with the stock availability."
+    )
+
+    class Meta:
+        description = "Number of products with the stock availability."
+
+
+class ProductFacets(graphene.ObjectType):
+    total_count = graphene.Int(
+        required=True, description="Number of products matching the filter."
+    )
+    attributes = graphene.List(
+        graphene.NonNull(AttributeFacet),
+        required=True,
+        description="Numbers of products for values of attributes.",
+    )
+    price_ranges = graphene.List(
+        graphene.NonNull(PriceRangeFacet),
+        required=True,
+        description="Numbers of products in the requested price ranges.",
+    )
+    stock_availability = graphene.List(
+        graphene.NonNull(StockAvailabilityFacet),
+        required=True,
+        description="Numbers of products in and out of stock.",
+    )
+
+    class Meta:
+        description = "Counts of products matching the filter grouped by facets."
@@ -19,6 +19,7 @@ from ....product.utils.availability import (
     get_product_availability,
     get_variant_availability,
 )
+from ....product.utils.categories import get_descendant_category_ids
 from ....warehouse.availability import (
     get_available_quantity,
     get_quantity_allocated,
@@ -985,7 +986,7 @@ class Category(CountableDjangoObjectType):
         requestor_has_access_to_all = models.Product.objects.user_has_access_to_all(
             requestor
         )
-        tree = root.get_descendants(include_self=True)
+        tree = get_descendant_category_ids([root.pk])
         if channel is None and not requestor_has_access_to_all:
             channel = get_default_channel_slug_or_graphql_error()
         qs = models.Product.objects.all()
@@ -2,6 +2,7 @@ import graphene
 
 from ...core.permissions import ShippingPermissions
 from ...shipping import models
+from ...shipping.utils import invalidate_country_shipping_zones
 from ..core.mutations import ModelBulkDeleteMutation
 from ..core.types.common import ShippingError
 
@@ -21,6 +22,11 @@ class ShippingZoneBulkDelete(ModelBulkDeleteMutation):
         error_type_class = ShippingError
         error_type_field = "shipping_errors"
 
+    @classmethod
+    def bulk_action(cls, queryset):
+        queryset.delete()
+        invalidate_country_shipping_zones()
+
 
 class ShippingPriceBulkDelete(ModelBulkDeleteMutation):
     class Arguments:
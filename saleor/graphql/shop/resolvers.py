@@ -1,5 +1,6 @@
 from ...account.models import Address
 from ...shipping.models import ShippingMethod, ShippingMethodChannelListing
+from ...shipping.utils import get_shipping_zone_ids_for_country
 from ..channel import ChannelContext
 
 
@@ -9,7 +10,7 @@ def resolve_available_shipping_methods(info, channel_slug: str, address):
     )
     if address and address.country:
         available = available.filter(
-            shipping_zone__countries__contains=address.country,
+            shipping_zone_id__in=get_shipping_zone_ids_for_country(address.country),
         )
         # Address instance needed for apply_taxes_to_shipping method
         address = Address(country=address.country)
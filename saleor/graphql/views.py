@@ -1,13 +1,16 @@
+import copy
 import fnmatch
 import json
 import logging
+import threading
 import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 import opentracing
 import opentracing.tags
 from django.conf import settings
-from django.db import connection
+from django.db import close_old_connections, connection
 from django.db.backends.postgresql.base import DatabaseWrapper
 from django.http import HttpRequest, HttpResponseNotAllowed, JsonResponse
 from django.shortcuts import render
@@ -16,7 +19,7 @@ from django.utils.functional import SimpleLazyObject
 from django.views.generic import View
 from graphene_django.settings import graphene_settings
 from graphene_django.views import instantiate_middleware
-from graphql import GraphQLDocument, get_default_backend
+from graphql import GraphQLDocument
 from graphql.error import (
     GraphQLError,
     GraphQLSyntaxError,
@@ -27,12 +30,32 @@ from jwt.exceptions import PyJWTError
 
 from ..core.exceptions import PermissionDenied, ReadOnlyException
 from ..core.utils import is_valid_ipv4, is_valid_ipv6
+from ..discount.utils import fetch_discounts
+from ..plugins.manager import get_plugins_manager
+from .backend import CachedGraphQLBackend
+from .persisted_queries import PersistedQueryError, resolve_persisted_query
 
 API_PATH = SimpleLazyObject(lambda: reverse("api"))
 
 unhandled_errors_logger = logging.getLogger("saleor.graphql.errors.unhandled")
 handled_errors_logger = logging.getLogger("saleor.graphql.errors.handled")
 
+_batch_executor: Optional[ThreadPoolExecutor] = None
+_batch_executor_lock = threading.Lock()
+
+
+def get_batch_executor() -> ThreadPoolExecutor:
+    """Return the thread pool used to run batched read-only operations."""
+    global _batch_executor
+    if _batch_executor is None:
+        with _batch_executor_lock:
+            if _batch_executor is None:
+                _batch_executor = ThreadPoolExecutor(
+                    max_workers=settings.GRAPHQL_BATCH_MAX_WORKERS,
+                    thread_name_prefix="graphql-batch",
+                )
+    return _batch_executor
+
 
 def tracing_wrapper(execute, sql, params, many, context):
     conn: DatabaseWrapper = context["connection"]
@@ -64,7 +87,13 @@ class GraphQLView(View):
     middleware = None
     root_value = None
 
-    HANDLED_EXCEPTIONS = (GraphQLError, PyJWTError, ReadOnlyException, PermissionDenied)
+    HANDLED_EXCEPTIONS = (
+        GraphQLError,
+        PyJWTError,
+        ReadOnlyException,
+        PermissionDenied,
+        PersistedQueryError,
+    )
 
     def __init__(
         self, schema=None, executor=None, middleware=None, root_value=None, backend=None
@@ -73,7 +102,7 @@ class GraphQLView(View):
         if schema is None:
             schema = graphene_settings.SCHEMA
         if backend is None:
-            backend = get_default_backend()
+            backend = CachedGraphQLBackend()
         if middleware is None:
             middleware = graphene_settings.MIDDLEWARE
         self.schema = self.schema or schema
@@ -123,7 +152,10 @@ class GraphQLView(View):
             )
 
         if isinstance(data, list):
-            responses = [self.get_response(request, entry) for entry in data]
+            if settings.GRAPHQL_BATCH_MAX_WORKERS > 0 and len(data) > 1:
+                responses = self.get_batch_responses(request, data)
+            else:
+                responses = [self.get_response(request, entry) for entry in data]
             result: Union[list, Optional[dict]] = [
                 response for response, code in responses
             ]
@@ -186,6 +218,68 @@ class GraphQLView(View):
 
         return result, status_code
 
+    def get_batch_responses(
+        self, request: HttpRequest, data: list
+    ) -> List[Tuple[Optional[Dict[str, List[Any]]], int]]:
+        """Execute a batch running read-only operations concurrently.
+
+        Queries are submitted to a thread pool, each of them with its own copy of
+        the request, its own plugins manager and its own database connection. Any
+        other operation waits for the previously submitted queries and is executed
+        in the request's thread, so mutations keep their order relative to the rest
+        of the batch.
+        """
+        executor = get_batch_executor()
+        responses: List[Any] = [None] * len(data)
+        pending: List[Tuple[int, Future]] = []
+
+        def wait_for_pending():
+            for index, future in pending:
+                responses[index] = future.result()
+            pending.clear()
+
+        for index, entry in enumerate(data):
+            if self.is_read_only_operation(request, entry):
+                future = executor.submit(self.get_isolated_response, request, entry)
+                pending.append((index, future))
+                continue
+            wait_for_pending()
+            responses[index] = self.get_response(request, entry)
+        wait_for_pending()
+        return responses
+
+    def get_isolated_response(
+        self, request: HttpRequest, data: dict
+    ) -> Tuple[Optional[Dict[str, List[Any]]], int]:
+        request = copy.copy(request)
+        # Data loaders and lazy attributes of the request cache their results and
+        # are not thread-safe, so each copy gets its own
+        request.dataloaders = {}
+        request.discounts = SimpleLazyObject(
+            lambda: fetch_discounts(request.request_time)
+        )
+        request.plugins = SimpleLazyObject(
+            lambda: get_plugins_manager(plugins=settings.PLUGINS)
+        )
+        # The app is looked up again for the copy by the app middleware
+        vars(request).pop("app", None)
+        try:
+            return self.get_response(request, data)
+        finally:
+            close_old_connections()
+
+    def is_read_only_operation(self, request: HttpRequest, data: dict) -> bool:
+        if not isinstance(data, dict):
+            return False
+        try:
+            query, _, operation_name = self.get_graphql_params(request, data)
+        except (PersistedQueryError, ValueError):
+            return False
+        document, error = self.parse_query(query)
+        if error or document is None:
+            return False
+        return document.get_operation_type(operation_name) == "query"
+
     def get_root_value(self):
         return self.root_value
 
@@ -222,7 +316,12 @@ class GraphQLView(View):
             span = scope.span
             span.set_tag(opentracing.tags.COMPONENT, "GraphQL")
 
-            query, variables, operation_name = self.get_graphql_params(request, data)
+            try:
+                query, variables, operation_name = self.get_graphql_params(
+                    request, data
+                )
+            except PersistedQueryError as e:
+                return ExecutionResult(errors=[e])
 
             document, error = self.parse_query(query)
             if error:
@@ -269,6 +368,7 @@ class GraphQLView(View):
         query = data.get("query")
         variables = data.get("variables")
         operation_name = data.get("operationName")
+        extensions = data.get("extensions")
         if operation_name == "null":
             operation_name = None
 
@@ -282,6 +382,8 @@ class GraphQLView(View):
                     obj_set(operations, file_instance, file_key, False)
             query = operations.get("query")
             variables = operations.get("variables")
+            extensions = operations.get("extensions")
+        query = resolve_persisted_query(query, extensions)
         return query, variables, operation_name
 
     @classmethod
@@ -3,6 +3,7 @@ from typing import DefaultDict, Iterable, List, Optional, Tuple
 
 from django.conf import settings
 
+from ...shipping.utils import get_shipping_zone_ids_for_country
 from ...warehouse.models import Stock
 from ..core.dataloaders import DataLoader
 
@@ -46,7 +47,11 @@ class AvailableQuantityByProductVariantIdAndCountryCodeLoader(
     ) -> Iterable[Tuple[int, int]]:
         results = Stock.objects.filter(product_variant_id__in=variant_ids)
         if country_code:
-            results.filter(warehouse__shipping_zones__countries__contains=country_code)
+            results = results.filter(
+                warehouse__shipping_zones__id__in=get_shipping_zone_ids_for_country(
+                    country_code
+                )
+            )
         results = results.annotate_available_quantity()
         results = results.values_list(
             "product_variant_id", "warehouse__shipping_zones", "available_quantity"
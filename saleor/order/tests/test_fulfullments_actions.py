@@ -242,6 +242,7 @@ def test_create_fulfillments_without_allocations(
     order = order_with_lines
     order_line1, order_line2 = order.lines.all()
     Allocation.objects.filter(order_line__order=order).delete()
+    Stock.objects.update(quantity_allocated=0)
     fulfillment_lines_for_warehouses = {
         str(warehouse.pk): [
             {"order_line": order_line1, "quantity": 3},
@@ -290,7 +291,8 @@ def test_create_fulfillments_warehouse_with_out_of_stock(
     order_line1.allocations.all().delete()
     stock = order_line1.variant.stocks.get(warehouse=warehouse)
     stock.quantity = 2
-    stock.save(update_fields=["quantity"])
+    stock.quantity_allocated = 0
+    stock.save(update_fields=["quantity", "quantity_allocated"])
     fulfillment_lines_for_warehouses = {
         str(warehouse.pk): [
             {"order_line": order_line1, "quantity": 3},
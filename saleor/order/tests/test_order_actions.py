@@ -53,6 +53,8 @@ def order_with_digital_line(order, digital_content, stock, site_settings):
     )
 
     Allocation.objects.create(order_line=line, stock=stock, quantity_allocated=quantity)
+    stock.quantity_allocated = quantity
+    stock.save(update_fields=["quantity_allocated"])
 
     return order
 
@@ -604,6 +606,8 @@ def test_create_refund_fulfillment_multiple_refunds(
     Allocation.objects.create(
         order_line=order_line, stock=stock, quantity_allocated=order_line.quantity
     )
+    stock.quantity_allocated = order_line.quantity
+    stock.save(update_fields=["quantity_allocated"])
     fulfillment = fulfilled_order.fulfillments.get()
     fulfillment.lines.create(order_line=order_line, quantity=2, stock=stock)
 
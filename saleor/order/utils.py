@@ -266,9 +266,7 @@ def delete_order_line(line):
 def restock_order_lines(order):
     """Return ordered products to corresponding stocks."""
     country = get_order_country(order)
-    default_warehouse = Warehouse.objects.filter(
-        shipping_zones__countries__contains=country
-    ).first()
+    default_warehouse = Warehouse.objects.for_country(country).first()
 
     for line in order:
         if line.variant and line.variant.track_inventory:
@@ -1,4 +1,6 @@
+from copy import deepcopy
 from decimal import Decimal
+from functools import lru_cache
 from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Union
 
 import opentracing
@@ -9,17 +11,20 @@ from django.utils.module_loading import import_string
 from django_countries.fields import Country
 from prices import Money, MoneyRange, TaxedMoney, TaxedMoneyRange
 
-from ..checkout import base_calculations
+from ..checkout import CheckoutPrices, base_calculations
+from ..checkout.fetch import fetch_checkout_info, fetch_checkout_lines
 from ..core.payments import PaymentInterface
 from ..core.prices import quantize_price
 from ..core.taxes import TaxType, zero_taxed_money
 from ..discount import DiscountInfo
 from .models import PluginConfiguration
+from .utils import get_plugin_configurations
 
 if TYPE_CHECKING:
     # flake8: noqa
     from ..account.models import Address, User
     from ..channel.models import Channel
+    from ..checkout.fetch import CheckoutInfo, CheckoutLineInfo
     from ..checkout.models import Checkout, CheckoutLine
     from ..invoice.models import Invoice
     from ..order.models import Fulfillment, Order, OrderLine
@@ -42,27 +47,52 @@ class PluginsManager(PaymentInterface):
 
     def __init__(self, plugins: List[str]):
         self.plugins = []
+        self._plugins_by_method: Dict[str, List["BasePlugin"]] = {}
         all_configs = self._get_all_plugin_configs()
         for plugin_path in plugins:
-            PluginClass = import_string(plugin_path)
+            PluginClass = get_plugin_class(plugin_path)
             if PluginClass.PLUGIN_ID in all_configs:
                 existing_config = all_configs[PluginClass.PLUGIN_ID]
-                plugin_config = existing_config.configuration
+                # Configurations are shared between requests and plugins are
+                # allowed to modify their configuration in place.
+                plugin_config = deepcopy(existing_config.configuration)
                 active = existing_config.active
             else:
                 plugin_config = PluginClass.DEFAULT_CONFIGURATION
                 active = PluginClass.get_default_active()
             self.plugins.append(PluginClass(configuration=plugin_config, active=active))
+        for method_name in get_plugin_method_names():
+            self._plugins_by_method[method_name] = self._get_plugins_implementing(
+                method_name
+            )
+
+    def _get_plugins_implementing(self, method_name: str) -> List["BasePlugin"]:
+        """Return plugins which override the base implementation of the method."""
+        from .base_plugin import BasePlugin
+
+        base_method = getattr(BasePlugin, method_name, None)
+        return [
+            plugin
+            for plugin in self.plugins
+            if getattr(type(plugin), method_name, None) not in (None, base_method)
+        ]
 
     def __run_method_on_plugins(
         self, method_name: str, default_value: Any, *args, **kwargs
     ):
         """Try to run a method with the given name on each declared plugin."""
+        plugins = self._plugins_by_method.get(method_name)
+        if plugins is None:
+            plugins = self._get_plugins_implementing(method_name)
+            self._plugins_by_method[method_name] = plugins
+        if not plugins:
+            return default_value
+
         with opentracing.global_tracer().start_active_span(
             f"ExtensionsManager.{method_name}"
         ):
             value = default_value
-            for plugin in self.plugins:
+            for plugin in plugins:
                 value = self.__run_method_on_single_plugin(
                     plugin, method_name, value, *args, **kwargs
                 )
@@ -99,56 +129,157 @@ class PluginsManager(PaymentInterface):
             "change_user_address", default_value, address, address_type, user
         )
 
+    def calculate_checkout_prices(
+        self, checkout_info: "CheckoutInfo", discounts: Iterable[DiscountInfo],
+    ) -> CheckoutPrices:
+        """Calculate line totals, subtotal, shipping price and total of a checkout.
+
+        Each price is calculated once and the default values are summed as decimal
+        amounts, so the subtotal and total don't calculate the line totals again.
+        """
+        checkout = checkout_info.checkout
+        lines = checkout_info.checkout_lines
+        line_totals = self.calculate_checkout_line_totals(
+            checkout_info.lines, discounts, checkout_info.channel
+        )
+        subtotal = self._calculate_checkout_subtotal(
+            checkout, lines, discounts, line_totals.values()
+        )
+        shipping_price = self._calculate_checkout_shipping(checkout_info, discounts)
+
+        currency = checkout.currency
+        discount_amount = checkout.discount.amount
+        total_net = subtotal.net.amount + shipping_price.net.amount - discount_amount
+        total_gross = (
+            subtotal.gross.amount + shipping_price.gross.amount - discount_amount
+        )
+        if total_gross < 0:
+            total_net = total_gross = Decimal(0)
+        default_value = TaxedMoney(
+            net=Money(total_net, currency), gross=Money(total_gross, currency)
+        )
+        total = quantize_price(
+            self.__run_method_on_plugins(
+                "calculate_checkout_total", default_value, checkout, lines, discounts
+            ),
+            currency,
+        )
+        return CheckoutPrices(
+            line_totals=line_totals,
+            subtotal=subtotal,
+            shipping_price=shipping_price,
+            total=total,
+        )
+
     def calculate_checkout_total(
         self,
         checkout: "Checkout",
         lines: Iterable["CheckoutLine"],
         discounts: Iterable[DiscountInfo],
     ) -> TaxedMoney:
+        checkout_info = fetch_checkout_info(checkout, lines)
+        return self.calculate_checkout_prices(checkout_info, discounts).total
 
-        default_value = base_calculations.base_checkout_total(
-            subtotal=self.calculate_checkout_subtotal(checkout, lines, discounts),
-            shipping_price=self.calculate_checkout_shipping(checkout, lines, discounts),
-            discount=checkout.discount,
-            currency=checkout.currency,
+    def calculate_checkout_subtotal(
+        self,
+        checkout: "Checkout",
+        lines: Iterable["CheckoutLine"],
+        discounts: Iterable[DiscountInfo],
+    ) -> TaxedMoney:
+        lines_info = fetch_checkout_lines(lines, checkout.channel_id)
+        line_totals = self.calculate_checkout_line_totals(
+            lines_info, discounts, checkout.channel
         )
-        return quantize_price(
-            self.__run_method_on_plugins(
-                "calculate_checkout_total", default_value, checkout, lines, discounts
-            ),
-            checkout.currency,
+        return self._calculate_checkout_subtotal(
+            checkout,
+            [line_info.line for line_info in lines_info],
+            discounts,
+            line_totals.values(),
         )
 
-    def calculate_checkout_subtotal(
+    def _calculate_checkout_subtotal(
         self,
         checkout: "Checkout",
-        lines: Iterable["CheckoutLine"],
+        lines: List["CheckoutLine"],
         discounts: Iterable[DiscountInfo],
+        line_totals: Iterable[TaxedMoney],
     ) -> TaxedMoney:
-        line_totals = [
-            self.calculate_checkout_line_total(line, discounts, checkout.channel)
-            for line in lines
-        ]
-        default_value = base_calculations.base_checkout_subtotal(
-            line_totals, checkout.currency
+        currency = checkout.currency
+        subtotal_net = subtotal_gross = Decimal(0)
+        for line_total in line_totals:
+            subtotal_net += line_total.net.amount
+            subtotal_gross += line_total.gross.amount
+        default_value = TaxedMoney(
+            net=Money(subtotal_net, currency), gross=Money(subtotal_gross, currency)
         )
         return quantize_price(
             self.__run_method_on_plugins(
                 "calculate_checkout_subtotal", default_value, checkout, lines, discounts
             ),
-            checkout.currency,
+            currency,
         )
 
+    def calculate_checkout_line_totals(
+        self,
+        lines: Iterable["CheckoutLineInfo"],
+        discounts: Iterable[DiscountInfo],
+        channel: "Channel",
+    ) -> Dict[int, TaxedMoney]:
+        """Calculate totals of the checkout lines keyed by the line pk.
+
+        Line totals are quantized as decimals and the plugins are run only if any
+        of them implements the calculation of a line total.
+        """
+        currency = channel.currency_code
+        exponent = base_calculations.get_currency_exponent(currency)
+        unit_prices = base_calculations.base_checkout_lines_unit_prices(
+            lines, channel, discounts
+        )
+        run_plugins = bool(self._plugins_by_method.get("calculate_checkout_line_total"))
+        line_totals = {}
+        for line_info in lines:
+            line = line_info.line
+            unit_price = unit_prices[line.variant_id]
+            amount = base_calculations.quantize_amount(
+                unit_price.amount * line.quantity, exponent
+            )
+            price = Money(amount, unit_price.currency)
+            line_total = TaxedMoney(net=price, gross=price)
+            if run_plugins:
+                line_total = quantize_price(
+                    self.__run_method_on_plugins(
+                        "calculate_checkout_line_total",
+                        line_total,
+                        line,
+                        discounts,
+                        channel,
+                    ),
+                    currency,
+                )
+            line_totals[line.pk] = line_total
+        return line_totals
+
     def calculate_checkout_shipping(
         self,
         checkout: "Checkout",
         lines: Iterable["CheckoutLine"],
         discounts: Iterable[DiscountInfo],
     ) -> TaxedMoney:
-        default_value = base_calculations.base_checkout_shipping_price(checkout, lines)
+        checkout_info = fetch_checkout_info(checkout, lines)
+        return self._calculate_checkout_shipping(checkout_info, discounts)
+
+    def _calculate_checkout_shipping(
+        self, checkout_info: "CheckoutInfo", discounts: Iterable[DiscountInfo]
+    ) -> TaxedMoney:
+        checkout = checkout_info.checkout
+        default_value = base_calculations.base_checkout_shipping_price(checkout_info)
         return quantize_price(
             self.__run_method_on_plugins(
-                "calculate_checkout_shipping", default_value, checkout, lines, discounts
+                "calculate_checkout_shipping",
+                default_value,
+                checkout,
+                checkout_info.checkout_lines,
+                discounts,
             ),
             checkout.currency,
         )
@@ -476,9 +607,7 @@ class PluginsManager(PaymentInterface):
 
     def _get_all_plugin_configs(self):
         if not hasattr(self, "_plugin_configs"):
-            self._plugin_configs = {
-                pc.identifier: pc for pc in PluginConfiguration.objects.all()
-            }
+            self._plugin_configs = get_plugin_configurations()
         return self._plugin_configs
 
     # FIXME these methods should be more generic
@@ -546,6 +675,23 @@ class PluginsManager(PaymentInterface):
         )
 
 
+@lru_cache(maxsize=None)
+def get_plugin_class(plugin_path: str):
+    return import_string(plugin_path)
+
+
+@lru_cache(maxsize=None)
+def get_plugin_method_names() -> List[str]:
+    """Return names of all hooks which can be implemented by plugins."""
+    from .base_plugin import BasePlugin
+
+    return [
+        name
+        for name, value in vars(BasePlugin).items()
+        if not name.startswith("_") and callable(value)
+    ]
+
+
 def get_plugins_manager(
     manager_path: str = None, plugins: List[str] = None
 ) -> PluginsManager:
@@ -3,6 +3,7 @@ from django.db.models import JSONField  # type: ignore
 
 from ..core.permissions import PluginsPermissions
 from ..core.utils.json_serializer import CustomJsonEncoder
+from .utils import invalidate_plugin_configurations
 
 
 class PluginConfiguration(models.Model):
@@ -19,3 +20,12 @@ class PluginConfiguration(models.Model):
 
     def __str__(self):
         return f"Configuration of {self.name}, active: {self.active}"
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        invalidate_plugin_configurations()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        invalidate_plugin_configurations()
+        return result
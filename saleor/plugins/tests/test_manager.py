@@ -1,11 +1,13 @@
 import json
 from decimal import Decimal
+from unittest.mock import patch
 
 import pytest
 from django.http import HttpResponseNotFound, JsonResponse
 from django_countries.fields import Country
 from prices import Money, TaxedMoney
 
+from ...checkout.fetch import fetch_checkout_info
 from ...core.taxes import TaxType
 from ...payment.interface import PaymentGateway
 from ..manager import PluginsManager, get_plugins_manager
@@ -43,6 +45,27 @@ def test_manager_calculates_checkout_total(
     assert TaxedMoney(expected_total, expected_total) == taxed_total
 
 
+@pytest.mark.parametrize(
+    "plugins, amount",
+    [(["saleor.plugins.tests.sample_plugins.PluginSample"], "1.0"), ([], "15.0")],
+)
+def test_manager_calculates_checkout_prices(
+    checkout_with_item, discount_info, plugins, amount
+):
+    line = checkout_with_item.lines.get()
+    currency = checkout_with_item.currency
+    expected_price = TaxedMoney(Money(amount, currency), Money(amount, currency))
+    checkout_info = fetch_checkout_info(checkout_with_item, [line])
+
+    prices = PluginsManager(plugins=plugins).calculate_checkout_prices(
+        checkout_info, [discount_info]
+    )
+
+    assert prices.line_totals == {line.pk: expected_price}
+    assert prices.subtotal == expected_price
+    assert prices.total == expected_price
+
+
 @pytest.mark.parametrize(
     "plugins, subtotal_amount",
     [(["saleor.plugins.tests.sample_plugins.PluginSample"], "1.0"), ([], "15.0")],
@@ -387,3 +410,64 @@ def test_manager_inncorrect_plugin(rf):
     response = manager.webhook(request, "incorrect.plugin.id")
     assert isinstance(response, HttpResponseNotFound)
     assert response.status_code == 404
+
+
+def test_manager_reuses_cached_plugin_configurations(
+    plugin_configuration, assert_num_queries
+):
+    plugins = ["saleor.plugins.tests.sample_plugins.PluginSample"]
+    PluginsManager(plugins=plugins)
+
+    with assert_num_queries(0):
+        manager = PluginsManager(plugins=plugins)
+
+    plugin = manager.get_plugin(PluginSample.PLUGIN_ID)
+    assert plugin.active == plugin_configuration.active
+
+
+def test_manager_reloads_plugin_configurations_after_save(plugin_configuration):
+    plugins = ["saleor.plugins.tests.sample_plugins.PluginSample"]
+    manager = PluginsManager(plugins=plugins)
+    assert manager.get_plugin(PluginSample.PLUGIN_ID).active
+
+    plugin_configuration.active = False
+    plugin_configuration.save()
+
+    manager = PluginsManager(plugins=plugins)
+    assert not manager.get_plugin(PluginSample.PLUGIN_ID).active
+
+
+def test_manager_plugin_configuration_not_shared_between_managers(
+    plugin_configuration,
+):
+    plugins = ["saleor.plugins.tests.sample_plugins.PluginSample"]
+    first_manager = PluginsManager(plugins=plugins)
+    first_manager.get_plugin(PluginSample.PLUGIN_ID).configuration[0]["value"] = "new"
+
+    second_manager = PluginsManager(plugins=plugins)
+
+    plugin = second_manager.get_plugin(PluginSample.PLUGIN_ID)
+    assert plugin.configuration[0]["value"] != "new"
+
+
+def test_manager_dispatches_only_to_plugins_overriding_method():
+    plugins = [
+        "saleor.plugins.tests.sample_plugins.PluginSample",
+        "saleor.plugins.tests.sample_plugins.PluginInactive",
+    ]
+    manager = PluginsManager(plugins=plugins)
+    sample_plugin = manager.get_plugin(PluginSample.PLUGIN_ID)
+
+    assert manager._plugins_by_method["calculate_checkout_total"] == [sample_plugin]
+    assert manager._plugins_by_method["order_created"] == []
+
+
+def test_manager_skips_tracing_for_method_without_implementations(order):
+    plugins = ["saleor.plugins.tests.sample_plugins.PluginInactive"]
+    manager = PluginsManager(plugins=plugins)
+
+    with patch("saleor.plugins.manager.opentracing.global_tracer") as global_tracer:
+        result = manager.order_created(order)
+
+    assert result is None
+    global_tracer.assert_not_called()
@@ -0,0 +1,28 @@
+from typing import TYPE_CHECKING, Dict
+
+from ..core.cache import ProcessCache
+
+if TYPE_CHECKING:
+    # flake8: noqa
+    from .models import PluginConfiguration
+
+plugin_configurations_cache = ProcessCache("plugin_configurations_version")
+
+
+def invalidate_plugin_configurations():
+    """Make all worker processes reload plugin configurations from the database."""
+    plugin_configurations_cache.invalidate()
+
+
+def get_plugin_configurations() -> Dict[str, "PluginConfiguration"]:
+    """Return plugin configurations cached in the worker process.
+
+    The configurations are fetched from the database again only when the version
+    stored in the shared cache changes, which happens on every configuration save.
+    """
+    from .models import PluginConfiguration
+
+    configurations = plugin_configurations_cache.get_or_set(
+        lambda: {pc.identifier: pc for pc in PluginConfiguration.objects.all()}
+    )
+    return dict(configurations)
@@ -0,0 +1,109 @@
+"""Buffers of webhook events waiting to be delivered in batches.
+
+Events of a webhook are numbered with a counter incremented atomically in the
+shared Django cache and stored under keys derived from their numbers, so any
+worker process can add events to the buffer. A single flush at a time takes the
+events that follow the last flushed one.
+"""
+import hashlib
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+from django.core.cache import cache
+
+# Buffered events are dropped if not flushed for this many seconds
+BUFFER_TIMEOUT = 60 * 60
+
+WebhookEvent = Tuple[str, str]
+
+
+def _key(webhook_id: int, name) -> str:
+    return f"webhook_batch:{webhook_id}:{name}"
+
+
+def buffer_webhook_event(webhook_id: int, event_type: str, data: str) -> int:
+    """Add the event to the webhook's buffer and return the number of its events."""
+    last_key = _key(webhook_id, "last")
+    cache.add(last_key, 0, None)
+    index = cache.incr(last_key)
+    cache.set(_key(webhook_id, index), (event_type, data), BUFFER_TIMEOUT)
+    flushed = cache.get(_key(webhook_id, "flushed"), 0)
+    return index - flushed if flushed <= index else index
+
+
+def schedule_flush(webhook_id: int) -> bool:
+    """Mark the flush of the webhook's buffer as scheduled.
+
+    Return False if it had already been scheduled and not started yet.
+    """
+    return cache.add(_key(webhook_id, "scheduled"), True, BUFFER_TIMEOUT)
+
+
+def pop_buffered_webhook_events(webhook_id: int) -> Tuple[List[WebhookEvent], bool]:
+    """Remove the events from the webhook's buffer and return them.
+
+    Return also whether events remain in the buffer. They do when another flush
+    is in progress or when an event is still being added. Such a missing event is
+    skipped by the next flush that doesn't find it either.
+    """
+    cache.delete(_key(webhook_id, "scheduled"))
+    flush_lock_key = _key(webhook_id, "flushing")
+    if not cache.add(flush_lock_key, True, BUFFER_TIMEOUT):
+        return [], True
+    try:
+        last = cache.get(_key(webhook_id, "last"), 0)
+        flushed = cache.get(_key(webhook_id, "flushed"), 0)
+        gap: Optional[int] = cache.get(_key(webhook_id, "gap"))
+        if last < flushed:
+            # The counter was evicted from the cache and numbers events from 1 again
+            flushed, gap = 0, None
+        first = flushed + 1
+        keys = [_key(webhook_id, index) for index in range(first, last + 1)]
+        buffered_events = cache.get_many(keys)
+        events = []
+        for index, key in enumerate(keys, start=first):
+            event = buffered_events.get(key)
+            if event is None and index != gap:
+                cache.set(_key(webhook_id, "gap"), index, BUFFER_TIMEOUT)
+                break
+            if event is not None:
+                events.append(tuple(event))
+            flushed = index
+        cache.set(_key(webhook_id, "flushed"), flushed, None)
+        cache.delete_many(keys[: flushed - first + 1])
+        return events, flushed < last
+    finally:
+        cache.delete(flush_lock_key)
+
+
+def _slot_key(target_url: str, slot: int) -> str:
+    target_hash = hashlib.md5(target_url.encode("utf-8")).hexdigest()
+    return f"webhook_delivery_slot:{target_hash}:{slot}"
+
+
+@contextmanager
+def delivery_slot(
+    target_url: str, max_concurrent_deliveries: int, timeout: int
+) -> Iterator[bool]:
+    """Take one of the limited concurrent delivery slots of the target.
+
+    Yield whether a slot was taken, it's always taken when the number of slots is
+    not limited. Slots of deliveries interrupted without releasing them expire
+    after the timeout.
+    """
+    if not max_concurrent_deliveries:
+        yield True
+        return
+    key = next(
+        (
+            _slot_key(target_url, slot)
+            for slot in range(max_concurrent_deliveries)
+            if cache.add(_slot_key(target_url, slot), True, timeout)
+        ),
+        None,
+    )
+    try:
+        yield key is not None
+    finally:
+        if key is not None:
+            cache.delete(key)
@@ -0,0 +1,79 @@
+"""Clients delivering webhooks, reused by all deliveries of a worker process.
+
+Reusing the clients keeps the connections to the webhook targets alive between
+deliveries instead of resolving the host and doing the TCP and TLS handshakes
+for every message.
+"""
+import http.cookiejar
+import os
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import boto3
+import requests
+from botocore.config import Config
+from django.conf import settings
+from google.cloud import pubsub_v1
+from requests.adapters import HTTPAdapter
+
+_clients: Dict[Hashable, Any] = {}
+_clients_pid: Optional[int] = None
+_lock = threading.Lock()
+
+
+def _get_or_create_client(key: Hashable, create: Callable[[], Any]) -> Any:
+    global _clients_pid
+
+    with _lock:
+        # Connections can't be shared with processes forked from this one
+        if _clients_pid != os.getpid():
+            _clients.clear()
+            _clients_pid = os.getpid()
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = create()
+        return client
+
+
+def _create_http_session() -> requests.Session:
+    session = requests.Session()
+    # Cookies set by one webhook target must not be sent with later deliveries
+    session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+    # Connections are pooled per target host
+    adapter = HTTPAdapter(
+        pool_connections=settings.WEBHOOK_HTTP_POOL_CONNECTIONS,
+        pool_maxsize=settings.WEBHOOK_HTTP_POOL_MAXSIZE,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_http_session() -> requests.Session:
+    return _get_or_create_client("http", _create_http_session)
+
+
+def get_sqs_client(
+    region: str, access_key_id: Optional[str], secret_access_key: Optional[str]
+):
+    return _get_or_create_client(
+        ("sqs", region, access_key_id, secret_access_key),
+        lambda: boto3.client(
+            "sqs",
+            region_name=region,
+            aws_access_key_id=access_key_id,
+            aws_secret_access_key=secret_access_key,
+            config=Config(
+                max_pool_connections=settings.WEBHOOK_AWS_MAX_POOL_CONNECTIONS
+            ),
+        ),
+    )
+
+
+def get_pubsub_publisher() -> pubsub_v1.PublisherClient:
+    return _get_or_create_client("pubsub", pubsub_v1.PublisherClient)
+
+
+def clear_clients():
+    with _lock:
+        _clients.clear()
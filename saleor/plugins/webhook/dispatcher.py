@@ -0,0 +1,239 @@
+"""Dispatcher delivering webhooks concurrently within a single process.
+
+Webhook delivery tasks are routed to the `WEBHOOK_DELIVERY_QUEUE` queue when it's
+set. The dispatcher consumes the task messages from that queue in place of a
+Celery worker, so slow webhook targets don't hold whole worker processes.
+
+The messages are consumed in the main thread while an asyncio event loop running
+in another thread schedules the deliveries, including the delayed ones. The
+delivering functions block, so they're run in a pool of threads whose size
+limits the number of concurrent deliveries. Failed deliveries are queued again
+with the same backoff and limits as retries of the Celery tasks.
+
+Like in Celery workers, a message is acked only once its delivery is finished or
+queued again, so the broker delivers the messages of unfinished deliveries again
+when the dispatcher stops or crashes. Unacked messages are limited by the
+prefetch count, which covers the running deliveries and up to
+`WEBHOOK_DISPATCHER_MAX_DELAYED` delayed ones.
+"""
+import asyncio
+import functools
+import logging
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from queue import Empty, SimpleQueue
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from celery.utils.time import get_exponential_backoff_interval
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from kombu import Consumer, Exchange, Queue
+from kombu.message import Message
+from requests.exceptions import RequestException
+
+from ...celeryconf import app
+from .tasks import (
+    DeliverySlotUnavailable,
+    deliver_webhook_batch_request,
+    deliver_webhook_request,
+    postpone_delivery,
+    send_webhook_batch_request,
+    send_webhook_request,
+)
+
+logger = logging.getLogger(__name__)
+
+Delivery = Tuple[str, List[Any], Dict[str, Any], int]
+
+# Max number of seconds between acks of the messages of finished deliveries
+DRAIN_EVENTS_TIMEOUT = 0.1
+
+
+def get_delay(eta: str) -> float:
+    """Return the number of seconds left to the ETA of a task message."""
+    if not eta:
+        return 0
+    eta_datetime = parse_datetime(eta)
+    if timezone.is_naive(eta_datetime):
+        eta_datetime = timezone.make_aware(eta_datetime, timezone.utc)
+    return max((eta_datetime - timezone.now()).total_seconds(), 0)
+
+
+class WebhookDispatcher:
+    def __init__(
+        self, queue_name: str, concurrency: int, max_delayed: Optional[int] = None
+    ):
+        self.queue_name = queue_name
+        self.concurrency = concurrency
+        if max_delayed is None:
+            max_delayed = settings.WEBHOOK_DISPATCHER_MAX_DELAYED
+        self.max_delayed = max_delayed
+        self.deliveries = {
+            send_webhook_request.name: (send_webhook_request, deliver_webhook_request),
+            send_webhook_batch_request.name: (
+                send_webhook_batch_request,
+                deliver_webhook_batch_request,
+            ),
+        }
+        self.loop = asyncio.new_event_loop()
+        self.executor = ThreadPoolExecutor(max_workers=concurrency)
+        self.delayed: Set[asyncio.TimerHandle] = set()
+        # Messages of finished deliveries with whether to requeue them, acked by
+        # the consuming thread as the connection can't be shared between threads
+        self.finished: "SimpleQueue[Tuple[Message, bool]]" = SimpleQueue()
+        # Tags of the messages of delayed deliveries added to the prefetch count
+        self.delayed_tags: Set[int] = set()
+        self.consumer: Optional[Consumer] = None
+        self.stopped = threading.Event()
+
+    def run(self):
+        thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        thread.start()
+        queue = Queue(
+            self.queue_name, Exchange(self.queue_name), routing_key=self.queue_name
+        )
+        try:
+            with app.connection_for_read() as connection:
+                with Consumer(
+                    connection,
+                    queues=[queue],
+                    callbacks=[self.handle_message],
+                    accept=["json"],
+                    prefetch_count=self.concurrency,
+                ) as consumer:
+                    self.consumer = consumer
+                    try:
+                        self.consume(connection)
+                    finally:
+                        asyncio.run_coroutine_threadsafe(
+                            self.shutdown(), self.loop
+                        ).result()
+                        self.ack_finished_messages()
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            thread.join()
+            self.executor.shutdown()
+
+    def consume(self, connection):
+        while not self.stopped.is_set():
+            self.ack_finished_messages()
+            try:
+                connection.drain_events(timeout=DRAIN_EVENTS_TIMEOUT)
+            except socket.timeout:
+                pass
+            connection.heartbeat_check()
+
+    def stop(self):
+        self.stopped.set()
+
+    def handle_message(self, body, message: Message):
+        task_name = message.headers.get("task")
+        if task_name not in self.deliveries:
+            logger.error("Rejected message of unknown task %r", task_name)
+            message.reject()
+            return
+        args, kwargs, _embed = body
+        delivery = (task_name, args, kwargs, message.headers.get("retries") or 0)
+        delay = get_delay(message.headers.get("eta"))
+        if not delay:
+            asyncio.run_coroutine_threadsafe(self.deliver(delivery, message), self.loop)
+            return
+        # Over the limit, delayed deliveries take up the slots of running ones
+        if len(self.delayed_tags) < self.max_delayed:
+            self.delayed_tags.add(message.delivery_tag)
+            self.update_prefetch_count()
+        self.loop.call_soon_threadsafe(self.schedule_delivery, delay, delivery, message)
+
+    def update_prefetch_count(self):
+        if self.consumer is not None:
+            self.consumer.qos(prefetch_count=self.concurrency + len(self.delayed_tags))
+
+    def ack_finished_messages(self):
+        delayed_count = len(self.delayed_tags)
+        while True:
+            try:
+                message, requeue = self.finished.get_nowait()
+            except Empty:
+                break
+            if requeue:
+                message.requeue()
+            else:
+                message.ack()
+            self.delayed_tags.discard(message.delivery_tag)
+        if len(self.delayed_tags) != delayed_count:
+            self.update_prefetch_count()
+
+    def schedule_delivery(self, delay: float, delivery: Delivery, message: Message):
+        def start_delivery():
+            self.delayed.discard(handle)
+            self.loop.create_task(self.deliver(delivery, message))
+
+        handle = self.loop.call_later(delay, start_delivery)
+        self.delayed.add(handle)
+
+    async def deliver(self, delivery: Delivery, message: Message):
+        task_name, args, kwargs, retries = delivery
+        task, deliver = self.deliveries[task_name]
+        queue_again = None
+        try:
+            await self.loop.run_in_executor(
+                self.executor, functools.partial(deliver, *args, **kwargs)
+            )
+        except DeliverySlotUnavailable:
+            queue_again = functools.partial(
+                postpone_delivery, task, args, retries, kwargs=kwargs
+            )
+        except RequestException as e:
+            queue_again = functools.partial(self.retry, task, args, kwargs, retries, e)
+        except Exception:
+            logger.exception("Delivery of %r failed", task_name)
+        try:
+            if queue_again is not None:
+                queue_again()
+        except Exception:
+            logger.exception("Delivery of %r couldn't be queued again", task_name)
+            self.finished.put((message, True))
+        else:
+            self.finished.put((message, False))
+
+    def retry(self, task, args, kwargs, retries, exc):
+        """Queue the failed delivery again the same way as the task's autoretry."""
+        max_retries = task.retry_kwargs.get("max_retries", task.max_retries)
+        if max_retries is not None and retries >= max_retries:
+            logger.error(
+                "Delivery of %r failed after %d retries: %s", task.name, retries, exc
+            )
+            return
+        countdown = get_exponential_backoff_interval(
+            factor=int(task.retry_backoff),
+            retries=retries,
+            maximum=getattr(task, "retry_backoff_max", 600),
+            full_jitter=getattr(task, "retry_jitter", True),
+        )
+        task.apply_async(args, kwargs, countdown=countdown, retries=retries + 1)
+
+    async def shutdown(self):
+        """Cancel the delayed deliveries and wait for the running ones.
+
+        Messages of the delayed deliveries stay unacked, so the broker delivers them
+        to the next dispatcher once the connection is closed.
+        """
+        for handle in self.delayed:
+            handle.cancel()
+        self.delayed.clear()
+        running = [
+            task
+            for task in asyncio.all_tasks(self.loop)
+            if task is not asyncio.current_task(self.loop)
+        ]
+        await asyncio.gather(*running, return_exceptions=True)
+
+
+def check_http_pool_size(concurrency: int):
+    if settings.WEBHOOK_HTTP_POOL_MAXSIZE < concurrency:
+        logger.warning(
+            "WEBHOOK_HTTP_POOL_MAXSIZE is lower than the concurrency, connections "
+            "over the limit won't be kept alive"
+        )
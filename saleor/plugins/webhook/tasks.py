@@ -1,21 +1,49 @@
+import json
 import logging
+from contextlib import contextmanager
 from enum import Enum
 from urllib.parse import urlparse, urlunparse
 
-import boto3
-import requests
-from google.cloud import pubsub_v1
+import opentracing
+from django.conf import settings
 from requests.exceptions import RequestException
 
+from ...account.models import User
 from ...celeryconf import app
+from ...checkout.models import Checkout
+from ...invoice.models import Invoice
+from ...order.models import Fulfillment, Order
+from ...product.models import Product
 from ...site.models import Site
 from ...webhook.event_types import WebhookEventType
 from ...webhook.models import Webhook
+from ...webhook.payloads import (
+    generate_checkout_payload,
+    generate_customer_payload,
+    generate_fulfillment_payload,
+    generate_invoice_payload,
+    generate_order_payload,
+    generate_product_payload,
+)
 from . import signature_for_payload
+from .batching import (
+    buffer_webhook_event,
+    delivery_slot,
+    pop_buffered_webhook_events,
+    schedule_flush,
+)
+from .clients import get_http_session, get_pubsub_publisher, get_sqs_client
 
 logger = logging.getLogger(__name__)
 
 WEBHOOK_TIMEOUT = 10
+WEBHOOK_BATCH_EVENT_TYPE = "batch"
+
+AWS_SQS_MAX_BATCH_SIZE = 10
+
+# Deliveries waiting for a slot of their target are retried after this delay
+DELIVERY_SLOT_RETRY_DELAY = 1
+DELIVERY_SLOT_TIMEOUT = WEBHOOK_TIMEOUT * 3
 
 
 class WebhookSchemes(str, Enum):
@@ -25,8 +53,37 @@ class WebhookSchemes(str, Enum):
     GOOGLE_CLOUD_PUBSUB = "gcpubsub"
 
 
-@app.task
-def trigger_webhooks_for_event(event_type, data):
+OBJECT_PAYLOAD_GENERATORS = {
+    Checkout: generate_checkout_payload,
+    Fulfillment: generate_fulfillment_payload,
+    Invoice: generate_invoice_payload,
+    Order: generate_order_payload,
+    Product: generate_product_payload,
+    User: generate_customer_payload,
+}
+
+EVENT_OBJECT_MODELS = {
+    WebhookEventType.ORDER_CREATED: Order,
+    WebhookEventType.ORDER_CONFIRMED: Order,
+    WebhookEventType.ORDER_FULLY_PAID: Order,
+    WebhookEventType.ORDER_UPDATED: Order,
+    WebhookEventType.ORDER_CANCELLED: Order,
+    WebhookEventType.ORDER_FULFILLED: Order,
+    WebhookEventType.INVOICE_REQUESTED: Invoice,
+    WebhookEventType.INVOICE_DELETED: Invoice,
+    WebhookEventType.INVOICE_SENT: Invoice,
+    WebhookEventType.FULFILLMENT_CREATED: Fulfillment,
+    WebhookEventType.CUSTOMER_CREATED: User,
+    WebhookEventType.PRODUCT_CREATED: Product,
+    WebhookEventType.PRODUCT_UPDATED: Product,
+    WebhookEventType.CHECKOUT_QUANTITY_CHANGED: Checkout,
+    WebhookEventType.CHECKOUT_CREATED: Checkout,
+    WebhookEventType.CHECKOUT_UPADTED: Checkout,
+}
+
+
+def get_webhooks_for_event(event_type):
+    """Return active webhooks of apps allowed to receive the event."""
     permissions = {}
     required_permission = WebhookEventType.PERMISSIONS[event_type].value
     if required_permission:
@@ -40,14 +97,95 @@ def trigger_webhooks_for_event(event_type, data):
         events__event_type__in=[event_type, WebhookEventType.ANY],
         **permissions,
     )
-    webhooks = webhooks.select_related("app").prefetch_related(
+    return webhooks.select_related("app").prefetch_related(
         "app__permissions__content_type"
     )
 
+
+def send_to_webhooks(webhooks, event_type, data):
     for webhook in webhooks:
-        send_webhook_request.delay(
-            webhook.pk, webhook.target_url, webhook.secret_key, event_type, data
+        if settings.WEBHOOK_BATCH_SIZE > 1:
+            buffer_webhook_request(webhook.pk, event_type, data)
+        else:
+            send_webhook_request.delay(
+                webhook.pk, webhook.target_url, webhook.secret_key, event_type, data
+            )
+
+
+def buffer_webhook_request(webhook_id, event_type, data):
+    """Buffer the event to be sent in a batch with the next events of the webhook.
+
+    The batch is flushed once it's full or after the batch window passes.
+    """
+    buffered_count = buffer_webhook_event(webhook_id, event_type, data)
+    if buffered_count % settings.WEBHOOK_BATCH_SIZE == 0:
+        flush_webhook_requests.delay(webhook_id)
+    elif schedule_flush(webhook_id):
+        flush_webhook_requests.apply_async(
+            (webhook_id,), countdown=settings.WEBHOOK_BATCH_WINDOW
+        )
+
+
+@app.task
+def trigger_webhooks_for_event(event_type, data):
+    send_to_webhooks(get_webhooks_for_event(event_type), event_type, data)
+
+
+@app.task
+def trigger_webhooks_for_object(event_type, object_id):
+    """Generate the payload of the event's object and send it to the webhooks.
+
+    The object is fetched when the task runs, so its payload is not generated
+    within the request that triggered the event nor when no webhook receives it.
+    """
+    webhooks = list(get_webhooks_for_event(event_type))
+    if not webhooks:
+        return
+    model = EVENT_OBJECT_MODELS[event_type]
+    instance = model.objects.filter(pk=object_id).first()
+    if instance is None:
+        logger.warning(
+            "%s %r of event %r no longer exists", model.__name__, object_id, event_type
+        )
+        return
+    data = OBJECT_PAYLOAD_GENERATORS[model](instance)
+    send_to_webhooks(webhooks, event_type, data)
+
+
+@app.task
+def flush_webhook_requests(webhook_id):
+    events, events_remaining = pop_buffered_webhook_events(webhook_id)
+    if events_remaining and schedule_flush(webhook_id):
+        flush_webhook_requests.apply_async(
+            (webhook_id,), countdown=settings.WEBHOOK_BATCH_WINDOW
+        )
+    if not events:
+        return
+    webhook = Webhook.objects.filter(
+        pk=webhook_id, is_active=True, app__is_active=True
+    ).first()
+    if webhook is None:
+        logger.warning(
+            "[Webhook ID:%r] Dropped %d events of inactive webhook",
+            webhook_id,
+            len(events),
         )
+        return
+    batch_size = settings.WEBHOOK_BATCH_SIZE
+    for start in range(0, len(events), batch_size):
+        send_webhook_batch_request.delay(
+            webhook.pk,
+            webhook.target_url,
+            webhook.secret_key,
+            events[start : start + batch_size],  # noqa: E203
+        )
+
+
+def generate_batch_payload(events) -> str:
+    return "[%s]" % ",".join(
+        '{"event_type": %s, "payload": %s}' % (json.dumps(event_type), data)
+        for event_type, data in events
+    )
 
 
 def send_webhook_using_http(target_url, message, domain, signature, event_type):
@@ -62,48 +200,76 @@ def send_webhook_using_http(target_url, message, domain, signature, event_type):
         # This header is depreceated and will be removed in Saleor3.0
         headers["X-Saleor-HMAC-SHA256"] = f"sha1={signature}"
 
-    response = requests.post(
+    response = get_http_session().post(
         target_url, data=message, headers=headers, timeout=WEBHOOK_TIMEOUT
     )
     response.raise_for_status()
 
 
-def send_webhook_using_aws_sqs(target_url, message, domain, signature, event_type):
+def get_aws_sqs_client_and_queue_url(target_url):
     parts = urlparse(target_url)
     region = "us-east-1"
     hostname_parts = parts.hostname.split(".")
     if len(hostname_parts) == 4 and hostname_parts[0] == "sqs":
         region = hostname_parts[1]
-    client = boto3.client(
-        "sqs",
-        region_name=region,
-        aws_access_key_id=parts.username,
-        aws_secret_access_key=parts.password,
-    )
+    client = get_sqs_client(region, parts.username, parts.password)
     queue_url = urlunparse(
         ("https", parts.hostname, parts.path, parts.params, parts.query, parts.fragment)
     )
+    return client, queue_url
 
+
+def get_aws_sqs_message_attributes(domain, signature, event_type):
     msg_attributes = {
         "SaleorDomain": {"DataType": "String", "StringValue": domain},
         "EventType": {"DataType": "String", "StringValue": event_type},
     }
     if signature:
         msg_attributes["Signature"] = {"DataType": "String", "StringValue": signature}
+    return msg_attributes
+
+
+def send_webhook_using_aws_sqs(target_url, message, domain, signature, event_type):
+    client, queue_url = get_aws_sqs_client_and_queue_url(target_url)
     client.send_message(
         QueueUrl=queue_url,
-        MessageAttributes=msg_attributes,
+        MessageAttributes=get_aws_sqs_message_attributes(domain, signature, event_type),
         MessageBody=message.decode("utf-8"),
     )
 
 
+def send_webhook_batch_using_aws_sqs(target_url, events, domain, secret):
+    """Send the events as separate messages and return the ones that failed."""
+    client, queue_url = get_aws_sqs_client_and_queue_url(target_url)
+    failed_events = []
+    for start in range(0, len(events), AWS_SQS_MAX_BATCH_SIZE):
+        batch = events[start : start + AWS_SQS_MAX_BATCH_SIZE]  # noqa: E203
+        entries = []
+        for index, (event_type, data) in enumerate(batch):
+            signature = signature_for_payload(data.encode("utf-8"), secret)
+            entries.append(
+                {
+                    "Id": str(index),
+                    "MessageAttributes": get_aws_sqs_message_attributes(
+                        domain, signature, event_type
+                    ),
+                    "MessageBody": data,
+                }
+            )
+        response = client.send_message_batch(QueueUrl=queue_url, Entries=entries)
+        failed_events.extend(
+            batch[int(entry["Id"])] for entry in response.get("Failed", [])
+        )
+    return failed_events
+
+
 def send_webhook_using_google_cloud_pubsub(
     target_url, message, domain, signature, event_type
 ):
     parts = urlparse(target_url)
-    client = pubsub_v1.PublisherClient()
+    client = get_pubsub_publisher()
     topic_name = parts.path[1:]  # drop the leading slash
-    client.publish(
+    return client.publish(
         topic_name,
         message,
         saleorDomain=domain,
@@ -112,12 +278,53 @@ def send_webhook_using_google_cloud_pubsub(
     )
 
 
-@app.task(
-    autoretry_for=(RequestException,),
-    retry_backoff=60,
-    retry_kwargs={"max_retries": 15},
-)
-def send_webhook_request(webhook_id, target_url, secret, event_type, data):
+def send_webhook_batch_using_google_cloud_pubsub(target_url, events, domain, secret):
+    # The publisher client batches messages published at once by itself
+    futures = []
+    for event_type, data in events:
+        message = data.encode("utf-8")
+        signature = signature_for_payload(message, secret)
+        futures.append(
+            send_webhook_using_google_cloud_pubsub(
+                target_url, message, domain, signature, event_type
+            )
+        )
+    for future in futures:
+        future.result(timeout=WEBHOOK_TIMEOUT)
+
+
+@contextmanager
+def trace_webhook_delivery(webhook_id, target_url, events_count):
+    with opentracing.global_tracer().start_active_span("webhooks.deliver") as scope:
+        span = scope.span
+        span.set_tag("webhook.id", webhook_id)
+        span.set_tag("webhook.scheme", urlparse(target_url).scheme.lower())
+        span.set_tag("webhook.events_count", events_count)
+        yield span
+
+
+class DeliverySlotUnavailable(Exception):
+    """All concurrent delivery slots of the webhook target are taken."""
+
+
+def deliver_webhook_request(webhook_id, target_url, secret, event_type, data):
+    with delivery_slot(
+        target_url, settings.WEBHOOK_MAX_CONCURRENT_DELIVERIES, DELIVERY_SLOT_TIMEOUT
+    ) as slot_taken:
+        if not slot_taken:
+            raise DeliverySlotUnavailable()
+        with trace_webhook_delivery(webhook_id, target_url, 1) as span:
+            span.set_tag("webhook.event_type", event_type)
+            _send_webhook_request(target_url, secret, event_type, data)
+    logger.debug(
+        "[Webhook ID:%r] Payload sent to %r for event %r",
+        webhook_id,
+        target_url,
+        event_type,
+    )
+
+
+def _send_webhook_request(target_url, secret, event_type, data):
     parts = urlparse(target_url)
     domain = Site.objects.get_current().domain
     message = data.encode("utf-8")
@@ -132,9 +339,89 @@ def send_webhook_request(webhook_id, target_url, secret, event_type, data):
         )
     else:
         raise ValueError("Unknown webhook scheme: %r" % (parts.scheme,))
+
+
+def deliver_webhook_batch_request(webhook_id, target_url, secret, events):
+    """Send the events to the webhook at once.
+
+    HTTP webhooks receive a single message with an array of the events' types and
+    payloads, signed as a whole. AWS SQS and Google Cloud Pub/Sub webhooks receive
+    a message per event, sent using their batch APIs.
+    """
+    with delivery_slot(
+        target_url, settings.WEBHOOK_MAX_CONCURRENT_DELIVERIES, DELIVERY_SLOT_TIMEOUT
+    ) as slot_taken:
+        if not slot_taken:
+            raise DeliverySlotUnavailable()
+        with trace_webhook_delivery(webhook_id, target_url, len(events)):
+            _send_webhook_batch_request(webhook_id, target_url, secret, events)
     logger.debug(
-        "[Webhook ID:%r] Payload sent to %r for event %r",
+        "[Webhook ID:%r] Batch of %d events sent to %r",
         webhook_id,
+        len(events),
         target_url,
-        event_type,
     )
+
+
+def _send_webhook_batch_request(webhook_id, target_url, secret, events):
+    parts = urlparse(target_url)
+    domain = Site.objects.get_current().domain
+    if parts.scheme.lower() in [WebhookSchemes.HTTP, WebhookSchemes.HTTPS]:
+        message = generate_batch_payload(events).encode("utf-8")
+        signature = signature_for_payload(message, secret)
+        send_webhook_using_http(
+            target_url, message, domain, signature, WEBHOOK_BATCH_EVENT_TYPE
+        )
+    elif parts.scheme.lower() == WebhookSchemes.AWS_SQS:
+        failed_events = send_webhook_batch_using_aws_sqs(
+            target_url, events, domain, secret
+        )
+        # Events that failed are retried separately
+        for event_type, data in failed_events:
+            send_webhook_request.delay(webhook_id, target_url, secret, event_type, data)
+    elif parts.scheme.lower() == WebhookSchemes.GOOGLE_CLOUD_PUBSUB:
+        send_webhook_batch_using_google_cloud_pubsub(target_url, events, domain, secret)
+    else:
+        raise ValueError("Unknown webhook scheme: %r" % (parts.scheme,))
+
+
+def postpone_delivery(task, args, retries, kwargs=None):
+    """Queue the delivery again once a slot of its target may be free.
+
+    It's not a retry of a failed delivery, so the number of retries is kept.
+    """
+    task.apply_async(args, kwargs, countdown=DELIVERY_SLOT_RETRY_DELAY, retries=retries)
+
+
+@app.task(
+    bind=True,
+    autoretry_for=(RequestException,),
+    retry_backoff=60,
+    retry_kwargs={"max_retries": 15},
+)
+def send_webhook_request(self, webhook_id, target_url, secret, event_type, data):
+    try:
+        deliver_webhook_request(webhook_id, target_url, secret, event_type, data)
+    except DeliverySlotUnavailable:
+        postpone_delivery(
+            send_webhook_request,
+            (webhook_id, target_url, secret, event_type, data),
+            self.request.retries,
+        )
+
+
+@app.task(
+    bind=True,
+    autoretry_for=(RequestException,),
+    retry_backoff=60,
+    retry_kwargs={"max_retries": 15},
+)
+def send_webhook_batch_request(self, webhook_id, target_url, secret, events):
+    try:
+        deliver_webhook_batch_request(webhook_id, target_url, secret, events)
+    except DeliverySlotUnavailable:
+        postpone_delivery(
+            send_webhook_batch_request,
+            (webhook_id, target_url, secret, events),
+            self.request.retries,
+        )
@@ -3,21 +3,33 @@ from unittest import mock
 import pytest
 
 from ....app.models import App
+from ....order.models import Order
+from ....tests.utils import flush_post_commit_hooks
 from ....webhook.event_types import WebhookEventType
-from ....webhook.payloads import (
-    generate_checkout_payload,
-    generate_customer_payload,
-    generate_invoice_payload,
-    generate_order_payload,
-    generate_product_payload,
+from ....webhook.models import WebhookEvent
+from ....webhook.payloads import generate_order_payload
+from ....webhook.utils import (
+    SUBSCRIPTIONS_MAX_AGE_FOR_MISSING_EVENT,
+    has_webhook_subscribers,
 )
 from ...manager import get_plugins_manager
-from ...webhook.tasks import trigger_webhooks_for_event
+from ...webhook.tasks import (
+    OBJECT_PAYLOAD_GENERATORS,
+    trigger_webhooks_for_event,
+    trigger_webhooks_for_object,
+)
 
 first_url = "http://www.example.com/first/"
 third_url = "http://www.example.com/third/"
 
 
+@pytest.fixture
+def any_webhook(app):
+    webhook = app.webhooks.create(target_url=first_url)
+    webhook.events.create(event_type=WebhookEventType.ANY)
+    return webhook
+
+
 @pytest.mark.parametrize(
     "event_name, total_webhook_calls, expected_target_urls",
     [
@@ -75,171 +87,302 @@ def test_trigger_webhooks_for_event_calls_expected_events(
     assert target_url_calls == expected_target_urls
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_order_created(mocked_webhook_trigger, settings, order_with_lines):
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_object.delay")
+def test_order_created(mocked_webhook_trigger, settings, any_webhook, order_with_lines):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.order_created(order_with_lines)
 
-    expected_data = generate_order_payload(order_with_lines)
+    flush_post_commit_hooks()
+
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.ORDER_CREATED, expected_data
+        WebhookEventType.ORDER_CREATED, order_with_lines.pk
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_order_confirmed(mocked_webhook_trigger, settings, order_with_lines):
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_object.delay")
+def test_order_confirmed(
+    mocked_webhook_trigger, settings, any_webhook, order_with_lines
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.order_confirmed(order_with_lines)
 
-    expected_data = generate_order_payload(order_with_lines)
+    flush_post_commit_hooks()
+
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.ORDER_CONFIRMED, expected_data
+        WebhookEventType.ORDER_CONFIRMED, order_with_lines.pk
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_customer_created(mocked_webhook_trigger, settings, customer_user):
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_object.delay")
+def test_customer_created(mocked_webhook_trigger, settings, any_webhook, customer_user):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.customer_created(customer_user)
 
-    expected_data = generate_customer_payload(customer_user)
+    flush_post_commit_hooks()
+
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.CUSTOMER_CREATED, expected_data
+        WebhookEventType.CUSTOMER_CREATED, customer_user.pk
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_order_fully_paid(mocked_webhook_trigger, settings, order_with_lines):
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_object.delay")
+def test_order_fully_paid(
+    mocked_webhook_trigger, settings, any_webhook, order_with_lines
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.order_fully_paid(order_with_lines)
 
-    expected_data = generate_order_payload(order_with_lines)
+    flush_post_commit_hooks()
+
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.ORDER_FULLY_PAID, expected_data
+        WebhookEventType.ORDER_FULLY_PAID, order_with_lines.pk
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_product_created(mocked_webhook_trigger, settings, product):
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_object.delay")
+def test_product_created(mocked_webhook_trigger, settings, any_webhook, product):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.product_created(product)
 
-    expected_data = generate_product_payload(product)
+    flush_post_commit_hooks()
+
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.PRODUCT_CREATED, expected_data
+        WebhookEventType.PRODUCT_CREATED, product.pk
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_product_updated(mocked_webhook_trigger, settings, product):
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_object.delay")
+def test_product_updated(mocked_webhook_trigger, settings, any_webhook, product):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.product_updated(product)
 
-    expected_data = generate_product_payload(product)
+    flush_post_commit_hooks()
+
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.PRODUCT_UPDATED, expected_data
+        WebhookEventType.PRODUCT_UPDATED, product.pk
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_order_updated(mocked_webhook_trigger, settings, order_with_lines):
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_object.delay")
+def test_order_updated(mocked_webhook_trigger, settings, any_webhook, order_with_lines):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.order_updated(order_with_lines)
 
-    expected_data = generate_order_payload(order_with_lines)
+    flush_post_commit_hooks()
+
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.ORDER_UPDATED, expected_data
+        WebhookEventType.ORDER_UPDATED, order_with_lines.pk
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_order_cancelled(mocked_webhook_trigger, settings, order_with_lines):
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_object.delay")
+def test_order_cancelled(
+    mocked_webhook_trigger, settings, any_webhook, order_with_lines
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.order_cancelled(order_with_lines)
 
-    expected_data = generate_order_payload(order_with_lines)
+    flush_post_commit_hooks()
+
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.ORDER_CANCELLED, expected_data
+        WebhookEventType.ORDER_CANCELLED, order_with_lines.pk
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_object.delay")
 def test_checkout_quantity_changed(
-    mocked_webhook_trigger, settings, checkout_with_items
+    mocked_webhook_trigger, settings, any_webhook, checkout_with_items
 ):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.checkout_quantity_changed(checkout_with_items)
 
-    expected_data = generate_checkout_payload(checkout_with_items)
+    flush_post_commit_hooks()
+
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.CHECKOUT_QUANTITY_CHANGED, expected_data
+        WebhookEventType.CHECKOUT_QUANTITY_CHANGED, checkout_with_items.pk
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_checkout_created(mocked_webhook_trigger, settings, checkout_with_items):
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_object.delay")
+def test_checkout_created(
+    mocked_webhook_trigger, settings, any_webhook, checkout_with_items
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.checkout_created(checkout_with_items)
 
-    expected_data = generate_checkout_payload(checkout_with_items)
+    flush_post_commit_hooks()
+
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.CHECKOUT_CREATED, expected_data
+        WebhookEventType.CHECKOUT_CREATED, checkout_with_items.pk
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_checkout_updated(mocked_webhook_trigger, settings, checkout_with_items):
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_object.delay")
+def test_checkout_updated(
+    mocked_webhook_trigger, settings, any_webhook, checkout_with_items
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.checkout_updated(checkout_with_items)
 
-    expected_data = generate_checkout_payload(checkout_with_items)
+    flush_post_commit_hooks()
+
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.CHECKOUT_UPADTED, expected_data
+        WebhookEventType.CHECKOUT_UPADTED, checkout_with_items.pk
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_invoice_request(mocked_webhook_trigger, settings, fulfilled_order):
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_object.delay")
+def test_invoice_request(
+    mocked_webhook_trigger, settings, any_webhook, fulfilled_order
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     invoice = fulfilled_order.invoices.first()
     manager.invoice_request(fulfilled_order, invoice, invoice.number)
-    expected_data = generate_invoice_payload(invoice)
+
+    flush_post_commit_hooks()
+
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.INVOICE_REQUESTED, expected_data
+        WebhookEventType.INVOICE_REQUESTED, invoice.pk
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_invoice_delete(mocked_webhook_trigger, settings, fulfilled_order):
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_object.delay")
+def test_invoice_delete(mocked_webhook_trigger, settings, any_webhook, fulfilled_order):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     invoice = fulfilled_order.invoices.first()
     manager.invoice_delete(invoice)
-    expected_data = generate_invoice_payload(invoice)
+
+    flush_post_commit_hooks()
+
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.INVOICE_DELETED, expected_data
+        WebhookEventType.INVOICE_DELETED, invoice.pk
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_invoice_sent(mocked_webhook_trigger, settings, fulfilled_order):
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_object.delay")
+def test_invoice_sent(mocked_webhook_trigger, settings, any_webhook, fulfilled_order):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     invoice = fulfilled_order.invoices.first()
     manager.invoice_sent(invoice, fulfilled_order.user.email)
-    expected_data = generate_invoice_payload(invoice)
+
+    flush_post_commit_hooks()
+
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.INVOICE_SENT, expected_data
+        WebhookEventType.INVOICE_SENT, invoice.pk
+    )
+
+
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_object.delay")
+def test_event_without_subscribers_not_triggered(
+    mocked_webhook_trigger, settings, webhook, product
+):
+    # given
+    settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
+    manager = get_plugins_manager()
+
+    # when
+    manager.product_created(product)
+    flush_post_commit_hooks()
+
+    # then
+    mocked_webhook_trigger.assert_not_called()
+
+
+def test_has_webhook_subscribers(webhook):
+    assert has_webhook_subscribers(WebhookEventType.ORDER_CREATED)
+    assert not has_webhook_subscribers(WebhookEventType.ORDER_UPDATED)
+
+    webhook.events.create(event_type=WebhookEventType.ORDER_UPDATED)
+    assert has_webhook_subscribers(WebhookEventType.ORDER_UPDATED)
+
+    webhook.is_active = False
+    webhook.save(update_fields=["is_active"])
+    assert not has_webhook_subscribers(WebhookEventType.ORDER_CREATED)
+
+
+@mock.patch("saleor.webhook.utils.time")
+def test_has_webhook_subscribers_rechecks_missing_event(mocked_time, webhook):
+    # given
+    mocked_time.monotonic.return_value = 100
+    assert not has_webhook_subscribers(WebhookEventType.ORDER_UPDATED)
+    # creating the event directly doesn't invalidate the cached subscriptions
+    WebhookEvent.objects.bulk_create(
+        [WebhookEvent(webhook=webhook, event_type=WebhookEventType.ORDER_UPDATED)]
     )
+    assert not has_webhook_subscribers(WebhookEventType.ORDER_UPDATED)
+
+    # when
+    mocked_time.monotonic.return_value = 100 + SUBSCRIPTIONS_MAX_AGE_FOR_MISSING_EVENT
+    has_subscribers = has_webhook_subscribers(WebhookEventType.ORDER_UPDATED)
+
+    # then
+    assert has_subscribers
+
+
+def test_has_webhook_subscribers_inactive_app(webhook):
+    assert has_webhook_subscribers(WebhookEventType.ORDER_CREATED)
+
+    webhook.app.is_active = False
+    webhook.app.save(update_fields=["is_active"])
+
+    assert not has_webhook_subscribers(WebhookEventType.ORDER_CREATED)
+
+
+@mock.patch("saleor.plugins.webhook.tasks.send_webhook_request.delay")
+def test_trigger_webhooks_for_object(
+    mocked_request, webhook, order_with_lines, permission_manage_orders
+):
+    # given
+    webhook.app.permissions.add(permission_manage_orders)
+
+    # when
+    trigger_webhooks_for_object(WebhookEventType.ORDER_CREATED, order_with_lines.pk)
+
+    # then
+    mocked_request.assert_called_once_with(
+        webhook.pk,
+        webhook.target_url,
+        webhook.secret_key,
+        WebhookEventType.ORDER_CREATED,
+        generate_order_payload(order_with_lines),
+    )
+
+
+@mock.patch("saleor.plugins.webhook.tasks.send_webhook_request.delay")
+def test_trigger_webhooks_for_object_without_webhooks(mocked_request, order_with_lines):
+    mocked_generate_payload = mock.Mock()
+    with mock.patch.dict(OBJECT_PAYLOAD_GENERATORS, {Order: mocked_generate_payload}):
+        trigger_webhooks_for_object(WebhookEventType.ORDER_CREATED, order_with_lines.pk)
+
+    mocked_generate_payload.assert_not_called()
+    mocked_request.assert_not_called()
+
+
+@mock.patch("saleor.plugins.webhook.tasks.send_webhook_request.delay")
+def test_trigger_webhooks_for_deleted_object(
+    mocked_request, webhook, order_with_lines, permission_manage_orders
+):
+    # given
+    webhook.app.permissions.add(permission_manage_orders)
+    order_id = order_with_lines.pk
+    order_with_lines.delete()
+
+    # when
+    trigger_webhooks_for_object(WebhookEventType.ORDER_CREATED, order_id)
+
+    # then
+    mocked_request.assert_not_called()
@@ -0,0 +1,226 @@
+import asyncio
+from datetime import timedelta
+from unittest.mock import ANY, MagicMock, patch
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+from requests.exceptions import RequestException
+
+from ..dispatcher import WebhookDispatcher, get_delay
+from ..tasks import (
+    DELIVERY_SLOT_RETRY_DELAY,
+    DeliverySlotUnavailable,
+    send_webhook_request,
+)
+
+DELIVERY_ARGS = [1, "https://www.example.com/", None, "order_created", "[]"]
+
+
+@pytest.fixture
+def dispatcher():
+    dispatcher = WebhookDispatcher("webhooks", concurrency=2)
+    yield dispatcher
+    dispatcher.executor.shutdown()
+    dispatcher.loop.close()
+
+
+@pytest.fixture
+def mocked_deliver(dispatcher):
+    mocked_deliver = MagicMock()
+    dispatcher.deliveries[send_webhook_request.name] = (
+        send_webhook_request,
+        mocked_deliver,
+    )
+    return mocked_deliver
+
+
+@pytest.fixture
+def message():
+    return MagicMock(delivery_tag=1, headers={"task": send_webhook_request.name})
+
+
+def test_dispatcher_deliver(dispatcher, mocked_deliver, message):
+    dispatcher.loop.run_until_complete(
+        dispatcher.deliver((send_webhook_request.name, DELIVERY_ARGS, {}, 0), message)
+    )
+
+    mocked_deliver.assert_called_once_with(*DELIVERY_ARGS)
+    assert dispatcher.finished.get_nowait() == (message, False)
+
+
+@patch("saleor.plugins.webhook.tasks.send_webhook_request.apply_async")
+def test_dispatcher_deliver_retries_failed_delivery(
+    mocked_apply_async, dispatcher, mocked_deliver, message
+):
+    # given
+    mocked_deliver.side_effect = RequestException()
+
+    # when
+    dispatcher.loop.run_until_complete(
+        dispatcher.deliver((send_webhook_request.name, DELIVERY_ARGS, {}, 2), message)
+    )
+
+    # then
+    mocked_apply_async.assert_called_once_with(
+        DELIVERY_ARGS, {}, countdown=ANY, retries=3
+    )
+    assert dispatcher.finished.get_nowait() == (message, False)
+
+
+@patch("saleor.plugins.webhook.tasks.send_webhook_request.apply_async")
+def test_dispatcher_deliver_stops_retrying(
+    mocked_apply_async, dispatcher, mocked_deliver, message
+):
+    # given
+    mocked_deliver.side_effect = RequestException()
+
+    # when
+    dispatcher.loop.run_until_complete(
+        dispatcher.deliver((send_webhook_request.name, DELIVERY_ARGS, {}, 15), message)
+    )
+
+    # then
+    mocked_apply_async.assert_not_called()
+    assert dispatcher.finished.get_nowait() == (message, False)
+
+
+@patch("saleor.plugins.webhook.tasks.send_webhook_request.apply_async")
+def test_dispatcher_deliver_postpones_delivery_without_slot(
+    mocked_apply_async, dispatcher, mocked_deliver, message
+):
+    # given
+    mocked_deliver.side_effect = DeliverySlotUnavailable()
+
+    # when
+    dispatcher.loop.run_until_complete(
+        dispatcher.deliver((send_webhook_request.name, DELIVERY_ARGS, {}, 2), message)
+    )
+
+    # then
+    mocked_apply_async.assert_called_once_with(
+        DELIVERY_ARGS, {}, countdown=DELIVERY_SLOT_RETRY_DELAY, retries=2
+    )
+    assert dispatcher.finished.get_nowait() == (message, False)
+
+
+@patch("saleor.plugins.webhook.tasks.send_webhook_request.apply_async")
+def test_dispatcher_deliver_requeues_message_not_queued_again(
+    mocked_apply_async, dispatcher, mocked_deliver, message
+):
+    # given
+    mocked_deliver.side_effect = RequestException()
+    mocked_apply_async.side_effect = ConnectionError()
+
+    # when
+    dispatcher.loop.run_until_complete(
+        dispatcher.deliver((send_webhook_request.name, DELIVERY_ARGS, {}, 2), message)
+    )
+
+    # then
+    assert dispatcher.finished.get_nowait() == (message, True)
+
+
+def test_dispatcher_handle_message_of_unknown_task(dispatcher):
+    message = MagicMock(headers={"task": "saleor.order.tasks.unknown"})
+
+    dispatcher.handle_message([[], {}, {}], message)
+
+    message.reject.assert_called_once()
+    message.ack.assert_not_called()
+
+
+def test_dispatcher_handle_delayed_message(dispatcher, message):
+    # given
+    dispatcher.consumer = MagicMock()
+    message.headers["eta"] = (timezone.now() + timedelta(seconds=30)).isoformat()
+
+    # when
+    dispatcher.handle_message([DELIVERY_ARGS, {}, {}], message)
+    dispatcher.loop.run_until_complete(asyncio.sleep(0))
+
+    # then
+    assert len(dispatcher.delayed) == 1
+    assert dispatcher.delayed_tags == {message.delivery_tag}
+    dispatcher.consumer.qos.assert_called_once_with(prefetch_count=3)
+    message.ack.assert_not_called()
+
+
+def test_dispatcher_handle_delayed_message_over_limit(message):
+    # given
+    dispatcher = WebhookDispatcher("webhooks", concurrency=2, max_delayed=0)
+    dispatcher.consumer = MagicMock()
+    message.headers["eta"] = (timezone.now() + timedelta(seconds=30)).isoformat()
+
+    # when
+    dispatcher.handle_message([DELIVERY_ARGS, {}, {}], message)
+
+    # then
+    assert not dispatcher.delayed_tags
+    dispatcher.consumer.qos.assert_not_called()
+    dispatcher.executor.shutdown()
+    dispatcher.loop.close()
+
+
+def test_dispatcher_ack_finished_messages(dispatcher, message):
+    # given
+    dispatcher.consumer = MagicMock()
+    dispatcher.delayed_tags = {message.delivery_tag}
+    requeued_message = MagicMock(delivery_tag=2)
+    dispatcher.finished.put((message, False))
+    dispatcher.finished.put((requeued_message, True))
+
+    # when
+    dispatcher.ack_finished_messages()
+
+    # then
+    message.ack.assert_called_once_with()
+    requeued_message.requeue.assert_called_once_with()
+    requeued_message.ack.assert_not_called()
+    assert not dispatcher.delayed_tags
+    dispatcher.consumer.qos.assert_called_once_with(prefetch_count=2)
+
+
+@patch("saleor.plugins.webhook.tasks.send_webhook_request.apply_async")
+def test_dispatcher_shutdown_cancels_delayed_deliveries(
+    mocked_apply_async, dispatcher, mocked_deliver, message
+):
+    # given
+    delivery = (send_webhook_request.name, DELIVERY_ARGS, {}, 1)
+    dispatcher.schedule_delivery(60, delivery, message)
+
+    # when
+    dispatcher.loop.run_until_complete(dispatcher.shutdown())
+
+    # then
+    assert not dispatcher.delayed
+    mocked_deliver.assert_not_called()
+    mocked_apply_async.assert_not_called()
+    assert dispatcher.finished.empty()
+
+
+def test_dispatcher_consume_checks_heartbeat(dispatcher):
+    # given
+    connection = MagicMock()
+    connection.drain_events.side_effect = lambda timeout: dispatcher.stop()
+
+    # when
+    dispatcher.consume(connection)
+
+    # then
+    connection.heartbeat_check.assert_called_once_with()
+
+
+def test_get_delay():
+    eta = (timezone.now() + timedelta(seconds=30)).isoformat()
+
+    assert 0 < get_delay(eta) <= 30
+    assert get_delay(None) == 0
+    assert get_delay((timezone.now() - timedelta(seconds=30)).isoformat()) == 0
+
+
+def test_dispatch_webhooks_command_requires_queue(settings):
+    settings.WEBHOOK_DELIVERY_QUEUE = None
+
+    with pytest.raises(CommandError):
+        call_command("dispatch_webhooks")
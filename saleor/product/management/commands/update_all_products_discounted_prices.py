@@ -3,9 +3,9 @@ import logging
 from django.core.management.base import BaseCommand
 from tqdm import tqdm
 
-from ....discount.utils import fetch_active_discounts
+from ....discount.utils import fetch_active_discounts_from_database
 from ...models import Product
-from ...utils.variant_prices import update_product_discounted_price
+from ...utils.variant_prices import update_products_discounted_prices
 
 logger = logging.getLogger(__name__)
 
@@ -16,8 +16,10 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         self.stdout.write('Updating "discounted_price" field of all the products.')
         # Fetching the discounts just once and reusing them
-        discounts = fetch_active_discounts()
+        discounts = fetch_active_discounts_from_database()
         # Run the update on all the products with "progress bar" (tqdm)
         qs = Product.objects.all()
-        for product in tqdm(qs.iterator(), total=qs.count()):
-            update_product_discounted_price(product, discounts=discounts)
+        with tqdm(total=qs.count()) as progress_bar:
+            update_products_discounted_prices(
+                qs, discounts=discounts, progress_callback=progress_bar.update
+            )
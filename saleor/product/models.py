@@ -74,6 +74,19 @@ class Category(MPTTModel, ModelWithMetadata, SeoModel):
     def __str__(self) -> str:
         return self.name
 
+    def save(self, *args, **kwargs):
+        from .utils.categories import invalidate_category_tree_index
+
+        super().save(*args, **kwargs)
+        invalidate_category_tree_index()
+
+    def delete(self, *args, **kwargs):
+        from .utils.categories import invalidate_category_tree_index
+
+        result = super().delete(*args, **kwargs)
+        invalidate_category_tree_index()
+        return result
+
 
 class CategoryTranslation(SeoModelTranslation):
     language_code = models.CharField(max_length=10)
@@ -406,9 +419,7 @@ class ProductVariantQueryset(models.QuerySet):
     def annotate_quantities(self):
         return self.annotate(
             quantity=Coalesce(Sum("stocks__quantity"), 0),
-            quantity_allocated=Coalesce(
-                Sum("stocks__allocations__quantity_allocated"), 0
-            ),
+            quantity_allocated=Coalesce(Sum("stocks__quantity_allocated"), 0),
         )
 
 
@@ -1,17 +1,26 @@
+import logging
 from typing import Iterable, List, Optional
 
+from celery import group
+from django.db import DatabaseError
+
 from ..attribute.models import Attribute
 from ..celeryconf import app
 from ..discount.models import Sale
+from ..discount.utils import fetch_active_discounts_from_database
 from .models import Product, ProductType, ProductVariant
 from .utils.variant_prices import (
+    DISCOUNTED_PRICES_CHUNK_SIZE,
+    get_product_id_ranges,
+    get_products_of_discount,
     update_product_discounted_price,
     update_products_discounted_prices,
     update_products_discounted_prices_of_catalogues,
-    update_products_discounted_prices_of_discount,
 )
 from .utils.variants import generate_name_for_variant
 
+logger = logging.getLogger(__name__)
+
 
 def _update_variants_names(instance: ProductType, saved_attributes: Iterable):
     """Product variant names are created from names of assigned attributes.
@@ -61,8 +70,56 @@ def update_products_discounted_prices_of_catalogues_task(
 
 @app.task
 def update_products_discounted_prices_of_discount_task(discount_pk: int):
+    """Recalculate discounted prices of the sale's products in parallel chunks."""
     discount = Sale.objects.get(pk=discount_pk)
-    update_products_discounted_prices_of_discount(discount)
+    products = get_products_of_discount(discount)
+    ranges = get_product_id_ranges(products, DISCOUNTED_PRICES_CHUNK_SIZE)
+    if not ranges:
+        return
+    logger.info(
+        "Updating discounted prices of products of sale %s in %s chunks.",
+        discount_pk,
+        len(ranges),
+    )
+    group(
+        update_products_discounted_prices_of_discount_chunk_task.si(
+            discount_pk, first_pk, last_pk
+        )
+        for first_pk, last_pk in ranges
+    ).apply_async()
+
+
+@app.task(
+    acks_late=True,
+    autoretry_for=(DatabaseError,),
+    retry_backoff=10,
+    retry_kwargs={"max_retries": 5},
+)
+def update_products_discounted_prices_of_discount_chunk_task(
+    discount_pk: int, first_pk: int, last_pk: int
+):
+    """Recalculate discounted prices of the sale's products within the id range.
+
+    Active sales are fetched from the database rather than from the process
+    cache, which may not be invalidated yet when the task runs. The prices are
+    therefore recalculated from the current state of the database each time the
+    task is retried or run again.
+    """
+    discount = Sale.objects.filter(pk=discount_pk).first()
+    if not discount:
+        logger.warning("Sale %s doesn't exist, skipping price update.", discount_pk)
+        return
+    products = get_products_of_discount(discount).filter(
+        pk__gte=first_pk, pk__lte=last_pk
+    )
+    discounts = fetch_active_discounts_from_database()
+    update_products_discounted_prices(products, discounts)
+    logger.info(
+        "Updated discounted prices of products %s-%s of sale %s.",
+        first_pk,
+        last_pk,
+        discount_pk,
+    )
 
 
 @app.task
@@ -2,6 +2,7 @@ from unittest.mock import patch
 
 from ..models import Category
 from ..utils import collect_categories_tree_products, delete_categories
+from ..utils.categories import CategoryTreeIndex, get_descendant_category_ids
 
 
 def test_collect_categories_tree_products(categories_tree):
@@ -43,3 +44,47 @@ def test_delete_categories(
         for product_channel_listing in product.channel_listings.all():
             assert not product_channel_listing.is_published
             assert not product_channel_listing.publication_date
+
+
+def test_category_tree_index_get_descendant_ids():
+    # given
+    nodes = [
+        # id, tree_id, lft, rght
+        (1, 1, 1, 8),
+        (2, 1, 2, 5),
+        (3, 1, 3, 4),
+        (4, 1, 6, 7),
+        (5, 2, 1, 2),
+    ]
+
+    # when
+    index = CategoryTreeIndex(nodes)
+
+    # then
+    assert index.get_descendant_ids([1]) == {1, 2, 3, 4}
+    assert index.get_descendant_ids([2, 5]) == {2, 3, 5}
+    assert index.get_descendant_ids([1], include_self=False) == {2, 3, 4}
+    assert index.get_descendant_ids([3], include_self=False) == set()
+    assert index.get_descendant_ids([100]) == set()
+
+
+def test_get_descendant_category_ids(categories_tree):
+    parent = categories_tree
+    child = parent.children.first()
+
+    assert get_descendant_category_ids([parent.pk]) == {parent.pk, child.pk}
+    assert get_descendant_category_ids([child.pk]) == {child.pk}
+
+
+def test_get_descendant_category_ids_invalidated_on_category_save(categories_tree):
+    parent = categories_tree
+    child = parent.children.first()
+    get_descendant_category_ids([parent.pk])
+
+    new_child = Category.objects.create(name="New", slug="new", parent=child)
+
+    assert get_descendant_category_ids([parent.pk]) == {
+        parent.pk,
+        child.pk,
+        new_child.pk,
+    }
@@ -1,13 +1,23 @@
 from unittest.mock import patch
 
 from django.core.management import call_command
+from django.utils import timezone
 from prices import Money
 
+from ...discount.models import Sale
+from ...discount.utils import fetch_active_discounts, fetch_discounts
+from ..models import Product
 from ..tasks import (
     update_products_discounted_prices_of_catalogues,
+    update_products_discounted_prices_of_discount_chunk_task,
+    update_products_discounted_prices_of_discount_task,
     update_products_discounted_prices_task,
 )
-from ..utils.variant_prices import update_product_discounted_price
+from ..utils.variant_prices import (
+    get_product_id_ranges,
+    update_product_discounted_price,
+    update_products_discounted_prices,
+)
 
 
 def test_update_product_discounted_price(product, channel_USD):
@@ -104,15 +114,148 @@ def test_update_products_discounted_prices_task(product_list):
         assert product_channel_listing.discounted_price == price
 
 
-@patch(
-    "saleor.product.management.commands"
-    ".update_all_products_discounted_prices"
-    ".update_product_discounted_price"
-)
 def test_management_commmand_update_all_products_discounted_price(
-    mock_update_product_discounted_price, product_list
+    product_list, channel_USD
 ):
+    price = Money("0.01", "USD")
+    for product in product_list:
+        variant_channel_listing = product.variants.first().channel_listings.get()
+        variant_channel_listing.price = price
+        variant_channel_listing.save()
+
     call_command("update_all_products_discounted_prices")
-    call_args_list = mock_update_product_discounted_price.call_args_list
-    for (args, kwargs), product in zip(call_args_list, product_list):
-        assert args[0] == product
+
+    for product in product_list:
+        product_channel_listing = product.channel_listings.get()
+        assert product_channel_listing.discounted_price == price
+
+
+def test_update_products_discounted_prices_in_chunks(product_list, sale):
+    # given
+    sale.products.add(*product_list)
+    products = Product.objects.filter(pk__in=[product.pk for product in product_list])
+    progress = []
+
+    # when
+    update_products_discounted_prices(
+        products, chunk_size=2, progress_callback=progress.append
+    )
+
+    # then
+    assert progress == [2, 1]
+    for product in product_list:
+        variant_channel_listing = product.variants.first().channel_listings.get()
+        product_channel_listing = product.channel_listings.get()
+        # the sale fixture gives a fixed discount of 5 USD
+        assert product_channel_listing.discounted_price_amount == max(
+            variant_channel_listing.price_amount - 5, 0
+        )
+
+
+def test_update_products_discounted_prices_number_of_queries_is_constant(
+    product_list, sale, capture_queries
+):
+    sale.products.add(*product_list)
+    discounts = fetch_active_discounts()
+
+    with capture_queries() as single_product_ctx:
+        update_products_discounted_prices(
+            Product.objects.filter(pk=product_list[0].pk), discounts=discounts
+        )
+    with capture_queries() as all_products_ctx:
+        update_products_discounted_prices(
+            Product.objects.filter(pk__in=[product.pk for product in product_list]),
+            discounts=discounts,
+        )
+
+    assert len(all_products_ctx.captured_queries) == len(
+        single_product_ctx.captured_queries
+    )
+
+
+def test_get_product_id_ranges(product_list):
+    product_ids = sorted(product.pk for product in product_list)
+
+    ranges = get_product_id_ranges(Product.objects.all(), chunk_size=2)
+
+    assert ranges == [
+        (product_ids[0], product_ids[1]),
+        (product_ids[2], product_ids[2]),
+    ]
+
+
+def test_get_product_id_ranges_no_products():
+    assert get_product_id_ranges(Product.objects.none(), chunk_size=2) == []
+
+
+@patch("saleor.product.tasks.DISCOUNTED_PRICES_CHUNK_SIZE", 2)
+def test_update_products_discounted_prices_of_discount_task_in_chunks(
+    product_list, sale
+):
+    # given
+    sale.categories.clear()
+    sale.collections.clear()
+    sale.products.set(product_list)
+    product_ids = sorted(product.pk for product in product_list)
+
+    # when
+    with patch(
+        "saleor.product.tasks.update_products_discounted_prices_of_discount_chunk_task"
+    ) as chunk_task_mock:
+        update_products_discounted_prices_of_discount_task(sale.pk)
+
+    # then
+    chunk_task_mock.si.assert_any_call(sale.pk, product_ids[0], product_ids[1])
+    chunk_task_mock.si.assert_any_call(sale.pk, product_ids[2], product_ids[2])
+    assert chunk_task_mock.si.call_count == 2
+
+
+def test_update_products_discounted_prices_of_discount_chunk_task(product_list, sale):
+    # given
+    sale.products.add(*product_list)
+    product_ids = sorted(product.pk for product in product_list)
+
+    # when
+    update_products_discounted_prices_of_discount_chunk_task(
+        sale.pk, product_ids[0], product_ids[1]
+    )
+
+    # then
+    for product in Product.objects.filter(pk__in=product_ids):
+        variant_channel_listing = product.variants.first().channel_listings.get()
+        product_channel_listing = product.channel_listings.get()
+        expected_price = variant_channel_listing.price_amount
+        if product.pk != product_ids[2]:
+            expected_price = max(expected_price - 5, 0)
+        assert product_channel_listing.discounted_price_amount == expected_price
+
+
+def test_update_products_discounted_prices_of_discount_chunk_task_stale_cache(
+    product_list, sale
+):
+    # given
+    fetch_discounts(timezone.now())
+    product = product_list[0]
+    # creating the through rows directly doesn't invalidate the discounts cache
+    Sale.products.through.objects.create(sale=sale, product=product)
+
+    # when
+    update_products_discounted_prices_of_discount_chunk_task(
+        sale.pk, product.pk, product.pk
+    )
+
+    # then
+    variant_channel_listing = product.variants.first().channel_listings.get()
+    product_channel_listing = product.channel_listings.get()
+    assert product_channel_listing.discounted_price_amount == max(
+        variant_channel_listing.price_amount - 5, 0
+    )
+
+
+def test_update_products_discounted_prices_of_discount_chunk_task_deleted_sale(
+    product_list,
+):
+    # should not fail when the sale was deleted before the task was run
+    update_products_discounted_prices_of_discount_chunk_task(
+        -1, product_list[0].pk, product_list[-1].pk
+    )
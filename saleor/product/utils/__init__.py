@@ -5,6 +5,7 @@ from django.db import transaction
 from ...core.taxes import TaxedMoney, zero_taxed_money
 from ..models import Product, ProductChannelListing
 from ..tasks import update_products_discounted_prices_task
+from .categories import get_descendant_category_ids, invalidate_category_tree_index
 
 if TYPE_CHECKING:
     # flake8: noqa
@@ -55,16 +56,15 @@ def delete_categories(categories_ids: List[str]):
     )
     product_ids = list(products.values_list("id", flat=True))
     categories.delete()
+    invalidate_category_tree_index()
     update_products_discounted_prices_task.delay(product_ids=product_ids)
 
 
 def collect_categories_tree_products(category: "Category") -> "QuerySet[Product]":
     """Collect products from all levels in category tree."""
-    products = category.products.all()
-    descendants = category.get_descendants()
-    for descendant in descendants:
-        products = products | descendant.products.all()
-    return products
+    return Product.objects.filter(
+        category_id__in=get_descendant_category_ids([category.pk])
+    )
 
 
 def get_products_ids_without_variants(products_list: "List[Product]") -> "List[str]":
@@ -0,0 +1,66 @@
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set, Tuple
+
+from ...core.cache import ProcessCache
+
+category_tree_cache = ProcessCache("category_tree_version")
+
+
+class CategoryTreeIndex:
+    """In-memory index of the MPTT category tree.
+
+    Descendants of a category are the nodes from the same tree whose `lft` value
+    lies between the category's `lft` and `rght` values, which allows finding
+    them by binary search over nodes sorted by `lft`.
+    """
+
+    def __init__(self, nodes: Iterable[Tuple[int, int, int, int]]):
+        self.nodes: Dict[int, Tuple[int, int, int]] = {}
+        trees: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+        for pk, tree_id, lft, rght in nodes:
+            self.nodes[pk] = (tree_id, lft, rght)
+            trees[tree_id].append((lft, pk))
+        self.trees: Dict[int, Tuple[List[int], List[int]]] = {}
+        for tree_id, tree_nodes in trees.items():
+            tree_nodes.sort()
+            self.trees[tree_id] = (
+                [lft for lft, _ in tree_nodes],
+                [pk for _, pk in tree_nodes],
+            )
+
+    def get_descendant_ids(
+        self, category_ids: Iterable[int], include_self: bool = True
+    ) -> Set[int]:
+        descendant_ids: Set[int] = set()
+        for category_id in category_ids:
+            node = self.nodes.get(category_id)
+            if node is None:
+                continue
+            tree_id, lft, rght = node
+            lfts, pks = self.trees[tree_id]
+            start = bisect_left(lfts, lft) if include_self else bisect_right(lfts, lft)
+            end = bisect_right(lfts, rght)
+            descendant_ids.update(pks[start:end])
+        return descendant_ids
+
+
+def get_category_tree_index() -> CategoryTreeIndex:
+    from ..models import Category
+
+    return category_tree_cache.get_or_set(
+        lambda: CategoryTreeIndex(
+            Category.objects.values_list("id", "tree_id", "lft", "rght").iterator()
+        )
+    )
+
+
+def get_descendant_category_ids(
+    category_ids: Iterable[int], include_self: bool = True
+) -> Set[int]:
+    """Return ids of all descendants of the given categories."""
+    return get_category_tree_index().get_descendant_ids(category_ids, include_self)
+
+
+def invalidate_category_tree_index():
+    category_tree_cache.invalidate()
@@ -1,13 +1,27 @@
 import operator
 from collections import defaultdict
 from functools import reduce
-from typing import Optional
+from typing import Callable, DefaultDict, Dict, List, Optional, Set, Tuple
 
 from django.db.models.query_utils import Q
 from prices import Money
 
-from ...discount.utils import calculate_discounted_price, fetch_active_discounts
-from ..models import Product, ProductChannelListing, ProductVariantChannelListing
+from ...channel.models import Channel
+from ...discount import DiscountInfo
+from ...discount.models import NotApplicable
+from ...discount.utils import (
+    calculate_discounted_price,
+    fetch_active_discounts_from_database,
+    get_product_discount_on_sale,
+)
+from ..models import (
+    CollectionProduct,
+    Product,
+    ProductChannelListing,
+    ProductVariantChannelListing,
+)
+
+DISCOUNTED_PRICES_CHUNK_SIZE = 1000
 
 
 def _get_variant_prices_in_channels_dict(product):
@@ -38,7 +52,7 @@ def _get_product_discounted_price(
 
 def update_product_discounted_price(product, discounts=None):
     if discounts is None:
-        discounts = fetch_active_discounts()
+        discounts = fetch_active_discounts_from_database()
     collections = list(product.collections.all())
     variant_prices_in_channels_dict = _get_variant_prices_in_channels_dict(product)
     changed_products_channels_to_update = []
@@ -62,15 +76,112 @@ def update_product_discounted_price(product, discounts=None):
     )
 
 
-def update_products_discounted_prices(products, discounts=None):
-    if discounts is None:
-        discounts = fetch_active_discounts()
+def _get_products_discounted_prices_to_update(
+    product_ids: List[int], discounts: List[DiscountInfo], channels: Dict[int, Channel]
+) -> List[ProductChannelListing]:
+    """Calculate discounted prices for a chunk of products in a few queries.
 
-    for product in products.prefetch_related("channel_listings"):
-        update_product_discounted_price(product, discounts)
+    Return product channel listings whose discounted price changed.
+    """
+    products = {
+        product.pk: product
+        for product in Product.objects.filter(pk__in=product_ids).only(
+            "id", "category_id"
+        )
+    }
+    variant_prices: DefaultDict[Tuple[int, int], List[Money]] = defaultdict(list)
+    for product_id, channel_id, amount, currency in (
+        ProductVariantChannelListing.objects.filter(variant__product_id__in=product_ids)
+        .order_by()
+        .values_list("variant__product_id", "channel_id", "price_amount", "currency")
+    ):
+        variant_prices[(product_id, channel_id)].append(Money(amount, currency))
+    collections: DefaultDict[int, Set[int]] = defaultdict(set)
+    for product_id, collection_id in (
+        CollectionProduct.objects.filter(product_id__in=product_ids)
+        .order_by()
+        .values_list("product_id", "collection_id")
+    ):
+        collections[product_id].add(collection_id)
 
+    changed_product_channel_listings = []
+    for product_channel_listing in ProductChannelListing.objects.filter(
+        product_id__in=product_ids
+    ):
+        product = products[product_channel_listing.product_id]
+        channel_id = product_channel_listing.channel_id
+        prices = variant_prices.get((product.pk, channel_id))
+        if not prices:
+            continue
+        channel = channels[channel_id]
+        product_discounts = []
+        for discount in discounts:
+            try:
+                product_discounts.append(
+                    get_product_discount_on_sale(
+                        product, collections[product.pk], discount, channel
+                    )
+                )
+            except NotApplicable:
+                pass
+        discounted_price = min(
+            min((discount(price) for discount in product_discounts), default=price)
+            for price in prices
+        )
+        if product_channel_listing.discounted_price != discounted_price:
+            product_channel_listing.discounted_price_amount = discounted_price.amount
+            changed_product_channel_listings.append(product_channel_listing)
+    return changed_product_channel_listings
 
-def update_products_discounted_prices_of_catalogues(
+
+def update_products_discounted_prices(
+    products,
+    discounts=None,
+    chunk_size: int = DISCOUNTED_PRICES_CHUNK_SIZE,
+    progress_callback: Optional[Callable[[int], None]] = None,
+):
+    """Recalculate discounted prices of products in chunks.
+
+    Every chunk of products is loaded, recalculated and saved in a constant number
+    of queries. `progress_callback` is called with the number of products processed
+    after each chunk.
+    """
+    if discounts is None:
+        discounts = fetch_active_discounts_from_database()
+    channels = Channel.objects.in_bulk()
+    product_ids = products.order_by().values_list("pk", flat=True).distinct()
+    last_pk = 0
+    while True:
+        chunk_ids = list(product_ids.filter(pk__gt=last_pk).order_by("pk")[:chunk_size])
+        if not chunk_ids:
+            break
+        last_pk = chunk_ids[-1]
+        changed_product_channel_listings = _get_products_discounted_prices_to_update(
+            chunk_ids, discounts, channels
+        )
+        ProductChannelListing.objects.bulk_update(
+            changed_product_channel_listings, ["discounted_price_amount"]
+        )
+        if progress_callback:
+            progress_callback(len(chunk_ids))
+
+
+def get_product_id_ranges(products, chunk_size: int) -> List[Tuple[int, int]]:
+    """Split products into chunks and return the first and last id of each chunk."""
+    ranges = []
+    chunk: List[int] = []
+    product_ids = products.order_by("pk").values_list("pk", flat=True).distinct()
+    for product_id in product_ids.iterator():
+        chunk.append(product_id)
+        if len(chunk) == chunk_size:
+            ranges.append((chunk[0], chunk[-1]))
+            chunk = []
+    if chunk:
+        ranges.append((chunk[0], chunk[-1]))
+    return ranges
+
+
+def get_products_of_catalogues(
     product_ids=None, category_ids=None, collection_ids=None
 ):
     # Building the matching products query
@@ -82,17 +193,22 @@ def update_products_discounted_prices_of_catalogues(
     if collection_ids:
         q_list.append(Q(collectionproduct__collection_id__in=collection_ids))
     # Asserting that the function was called with some ids
-    if q_list:
-        # Querying the products
-        q_or = reduce(operator.or_, q_list)
-        products = Product.objects.filter(q_or).distinct()
-
-        update_products_discounted_prices(products)
+    if not q_list:
+        return Product.objects.none()
+    q_or = reduce(operator.or_, q_list)
+    return Product.objects.filter(q_or).distinct()
 
 
-def update_products_discounted_prices_of_discount(discount):
-    update_products_discounted_prices_of_catalogues(
+def get_products_of_discount(discount):
+    return get_products_of_catalogues(
         product_ids=discount.products.all().values_list("id", flat=True),
         category_ids=discount.categories.all().values_list("id", flat=True),
         collection_ids=discount.collections.all().values_list("id", flat=True),
     )
+
+
+def update_products_discounted_prices_of_catalogues(
+    product_ids=None, category_ids=None, collection_ids=None
+):
+    products = get_products_of_catalogues(product_ids, category_ids, collection_ids)
+    update_products_discounted_prices(products)
@@ -515,6 +515,66 @@ GRAPHENE = {
     ],
 }
 
+# Max number of parsed and validated GraphQL documents kept in memory per worker
+GRAPHQL_QUERY_CACHE_SIZE = int(os.environ.get("GRAPHQL_QUERY_CACHE_SIZE", 1000))
+
+# Automatic persisted queries, stored in the default cache
+GRAPHQL_PERSISTED_QUERIES_ENABLED = get_bool_from_env(
+    "GRAPHQL_PERSISTED_QUERIES_ENABLED", True
+)
+GRAPHQL_PERSISTED_QUERIES_TIMEOUT = int(
+    os.environ.get("GRAPHQL_PERSISTED_QUERIES_TIMEOUT", 60 * 60 * 24)
+)
+
+# Number of threads executing read-only operations of a batched request
+# concurrently; 0 executes all operations of a batch sequentially
+GRAPHQL_BATCH_MAX_WORKERS = int(os.environ.get("GRAPHQL_BATCH_MAX_WORKERS", 0))
+
+# Number of seconds the results of the `productFacets` query are cached for;
+# 0 disables the cache
+PRODUCT_FACETS_CACHE_TIMEOUT = int(os.environ.get("PRODUCT_FACETS_CACHE_TIMEOUT", 0))
+
+# Pools of connections to webhook targets kept alive by each worker process:
+# the number of HTTP hosts and the number of connections per HTTP host or per
+# AWS SQS client
+WEBHOOK_HTTP_POOL_CONNECTIONS = int(os.environ.get("WEBHOOK_HTTP_POOL_CONNECTIONS", 10))
+WEBHOOK_HTTP_POOL_MAXSIZE = int(os.environ.get("WEBHOOK_HTTP_POOL_MAXSIZE", 10))
+WEBHOOK_AWS_MAX_POOL_CONNECTIONS = int(
+    os.environ.get("WEBHOOK_AWS_MAX_POOL_CONNECTIONS", 10)
+)
+
+# Webhook events are delivered in batches when the batch size is greater than 1;
+# events of a webhook are buffered until the batch is full or for the number of
+# seconds of the batch window
+WEBHOOK_BATCH_SIZE = int(os.environ.get("WEBHOOK_BATCH_SIZE", 0))
+WEBHOOK_BATCH_WINDOW = float(os.environ.get("WEBHOOK_BATCH_WINDOW", 5))
+
+# Max number of concurrent deliveries to a single webhook target; 0 is unlimited
+WEBHOOK_MAX_CONCURRENT_DELIVERIES = int(
+    os.environ.get("WEBHOOK_MAX_CONCURRENT_DELIVERIES", 0)
+)
+
+# Queue of webhook deliveries consumed by the `dispatch_webhooks` command instead
+# of Celery workers, running as many concurrent deliveries as its concurrency
+WEBHOOK_DELIVERY_QUEUE = os.environ.get("WEBHOOK_DELIVERY_QUEUE")
+WEBHOOK_DISPATCHER_CONCURRENCY = int(
+    os.environ.get("WEBHOOK_DISPATCHER_CONCURRENCY", 100)
+)
+# Max number of delayed deliveries (retries) the dispatcher holds on top of its
+# concurrency; further delayed deliveries take up the slots of running deliveries
+WEBHOOK_DISPATCHER_MAX_DELAYED = int(
+    os.environ.get("WEBHOOK_DISPATCHER_MAX_DELAYED", 1000)
+)
+if WEBHOOK_DELIVERY_QUEUE:
+    CELERY_TASK_ROUTES = {
+        "saleor.plugins.webhook.tasks.send_webhook_request": {
+            "queue": WEBHOOK_DELIVERY_QUEUE
+        },
+        "saleor.plugins.webhook.tasks.send_webhook_batch_request": {
+            "queue": WEBHOOK_DELIVERY_QUEUE
+        },
+    }
+
 PLUGINS_MANAGER = "saleor.plugins.manager.PluginsManager"
 
 PLUGINS = [
@@ -582,6 +642,23 @@ if REDIS_URL:
     CACHE_URL = os.environ.setdefault("CACHE_URL", REDIS_URL)
 CACHES = {"default": django_cache_url.config()}
 
+# Buffers of batched webhook events and slots of concurrent deliveries are kept
+# in the cache, so it must be shared by all worker processes
+if CACHES["default"]["BACKEND"] in {
+    "django.core.cache.backends.dummy.DummyCache",
+    "django.core.cache.backends.locmem.LocMemCache",
+} and (WEBHOOK_BATCH_SIZE > 1 or WEBHOOK_MAX_CONCURRENT_DELIVERIES):
+    raise ImproperlyConfigured(
+        "WEBHOOK_BATCH_SIZE and WEBHOOK_MAX_CONCURRENT_DELIVERIES require a cache "
+        "shared by worker processes, set CACHE_URL (e.g. to a Redis URL)."
+    )
+
+# Number of seconds values cached in worker processes are kept for before being
+# fetched again. Changes reach other processes at once only when the cache is
+# shared by them (e.g. Redis); with the default local memory cache they're picked
+# up after this timeout.
+PROCESS_CACHE_VERSION_TIMEOUT = int(os.environ.get("PROCESS_CACHE_VERSION_TIMEOUT", 60))
+
 # Default False because storefront and dashboard don't support expiration of token
 JWT_EXPIRE = get_bool_from_env("JWT_EXPIRE", False)
 JWT_TTL_ACCESS = timedelta(seconds=parse(os.environ.get("JWT_TTL_ACCESS", "5 minutes")))
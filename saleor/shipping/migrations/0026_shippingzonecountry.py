@@ -0,0 +1,57 @@
+# Generated by Django 3.1.3 on 2020-12-02 10:41
+
+import django.db.models.deletion
+import django_countries.fields
+from django.db import migrations, models
+
+
+def populate_shipping_zone_countries(apps, schema_editor):
+    ShippingZone = apps.get_model("shipping", "ShippingZone")
+    ShippingZoneCountry = apps.get_model("shipping", "ShippingZoneCountry")
+    ShippingZoneCountry.objects.bulk_create(
+        [
+            ShippingZoneCountry(shipping_zone_id=shipping_zone.pk, country=country.code)
+            for shipping_zone in ShippingZone.objects.iterator()
+            for country in shipping_zone.countries
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("shipping", "0025_auto_20201130_1122"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ShippingZoneCountry",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "country",
+                    django_countries.fields.CountryField(db_index=True, max_length=2),
+                ),
+                (
+                    "shipping_zone",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="country_entries",
+                        to="shipping.shippingzone",
+                    ),
+                ),
+            ],
+            options={"unique_together": {("shipping_zone", "country")}},
+        ),
+        migrations.RunPython(
+            populate_shipping_zone_countries, migrations.RunPython.noop
+        ),
+    ]
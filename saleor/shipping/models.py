@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, List, Union
+from typing import TYPE_CHECKING, List, Optional, Union
 
 from django.conf import settings
 from django.db import models
@@ -20,7 +20,11 @@ from ..core.weight import (
     zero_weight,
 )
 from . import ShippingMethodType
-from .zip_codes import check_shipping_method_for_zip_code
+from .utils import get_shipping_zone_ids_for_country
+from .zip_codes import (
+    get_shipping_methods_excluded_by_zip_code,
+    invalidate_zip_code_rules,
+)
 
 if TYPE_CHECKING:
     # flake8: noqa
@@ -52,6 +56,24 @@ def _applicable_price_based_methods(price: Money, qs):
     return qs_shipping_method.filter(id__in=applicable_price_based_methods)
 
 
+def _is_applicable_for_price(listing: "ShippingMethodChannelListing", price: Money):
+    """Check if the listing's price limits include the given total."""
+    min_price = listing.minimum_order_price_amount
+    max_price = listing.maximum_order_price_amount
+    if min_price is None or min_price > price.amount:
+        return False
+    return max_price is None or max_price >= price.amount
+
+
+def _is_applicable_for_weight(method: "ShippingMethod", weight):
+    """Check if the method's weight limits include the given total weight."""
+    min_weight = method.minimum_order_weight
+    max_weight = method.maximum_order_weight
+    if min_weight is None or min_weight > weight:
+        return False
+    return max_weight is None or max_weight >= weight
+
+
 def _get_weight_type_display(min_weight, max_weight):
     default_unit = get_default_weight_unit()
 
@@ -81,6 +103,37 @@ class ShippingZone(ModelWithMetadata):
             (ShippingPermissions.MANAGE_SHIPPING.codename, "Manage shipping."),
         )
 
+    def save(self, *args, **kwargs):
+        from .utils import update_shipping_zone_countries
+
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "countries" in update_fields:
+            update_shipping_zone_countries(self)
+
+    def delete(self, *args, **kwargs):
+        from .utils import invalidate_country_shipping_zones
+
+        result = super().delete(*args, **kwargs)
+        invalidate_country_shipping_zones()
+        return result
+
+
+class ShippingZoneCountry(models.Model):
+    """Country of a shipping zone, kept in sync with `ShippingZone.countries`.
+
+    Allows finding shipping zones of a country by an indexed lookup, which isn't
+    possible for the comma-separated values stored in `ShippingZone.countries`.
+    """
+
+    shipping_zone = models.ForeignKey(
+        ShippingZone, on_delete=models.CASCADE, related_name="country_entries"
+    )
+    country = CountryField(db_index=True)
+
+    class Meta:
+        unique_together = [["shipping_zone", "country"]]
+
 
 class ShippingMethodQueryset(models.QuerySet):
     def price_based(self):
@@ -113,7 +166,7 @@ class ShippingMethodQueryset(models.QuerySet):
         applicable to the given price, weight and products.
         """
         qs = self.filter(
-            shipping_zone__countries__contains=country_code,
+            shipping_zone_id__in=get_shipping_zone_ids_for_country(country_code),
             channel_listings__currency=price.currency,
             channel_listings__channel_id=channel_id,
         )
@@ -138,29 +191,60 @@ class ShippingMethodQueryset(models.QuerySet):
         channel_id,
         price: Money,
         country_code=None,
-    ):
+    ) -> Optional[List["ShippingMethod"]]:
+        """Return the shipping methods applicable for the checkout or order.
+
+        Candidate methods are fetched with their channel listings in a single query
+        and filtered by price, weight and zip code rules in memory. Methods are
+        sorted by price and have their listing set as `channel_listing`.
+        """
         if not instance.is_shipping_required():
             return None
         if not instance.shipping_address:
             return None
-        lines = instance.lines.prefetch_related("variant__product").all()
-        instance_product_ids = set(lines.values_list("variant__product", flat=True))
-
-        applicable_methods = self.applicable_shipping_methods(
-            price=price,
-            channel_id=channel_id,
-            weight=instance.get_total_weight(),
-            country_code=country_code or instance.shipping_address.country.code,
-            product_ids=instance_product_ids,
-        ).prefetch_related("zip_code_rules")
-
-        excluded_methods_by_zip_code = []
-        for method in applicable_methods:
-            if check_shipping_method_for_zip_code(instance.shipping_address, method):
-                excluded_methods_by_zip_code.append(method.pk)
-        if excluded_methods_by_zip_code:
-            return applicable_methods.exclude(pk__in=excluded_methods_by_zip_code)
-        return applicable_methods
+        instance_product_ids = set(
+            instance.lines.values_list("variant__product", flat=True)
+        )
+        country_code = country_code or instance.shipping_address.country.code
+        methods = self.filter(
+            shipping_zone_id__in=get_shipping_zone_ids_for_country(country_code)
+        )
+        if instance_product_ids:
+            methods = self.exclude_shipping_methods_for_excluded_products(
+                methods, instance_product_ids
+            )
+        listings = (
+            ShippingMethodChannelListing.objects.filter(
+                channel_id=channel_id,
+                currency=price.currency,
+                shipping_method__in=methods,
+            )
+            .select_related("shipping_method")
+            .order_by("price_amount", "shipping_method_id")
+        )
+
+        weight = None
+        applicable_methods = []
+        for listing in listings:
+            method = listing.shipping_method
+            if method.type == ShippingMethodType.PRICE_BASED:
+                is_applicable = _is_applicable_for_price(listing, price)
+            else:
+                if weight is None:
+                    weight = instance.get_total_weight()
+                is_applicable = _is_applicable_for_weight(method, weight)
+            if is_applicable:
+                method.channel_listing = listing
+                applicable_methods.append(method)
+
+        excluded_methods_by_zip_code = get_shipping_methods_excluded_by_zip_code(
+            [method.pk for method in applicable_methods], instance.shipping_address
+        )
+        return [
+            method
+            for method in applicable_methods
+            if method.pk not in excluded_methods_by_zip_code
+        ]
 
 
 class ShippingMethod(ModelWithMetadata):
@@ -215,6 +299,15 @@ class ShippingMethodZipCodeRule(models.Model):
     class Meta:
         unique_together = ("shipping_method", "start", "end")
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        invalidate_zip_code_rules()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        invalidate_zip_code_rules()
+        return result
+
 
 class ShippingMethodChannelListing(models.Model):
     shipping_method = models.ForeignKey(
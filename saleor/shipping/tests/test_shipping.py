@@ -8,8 +8,13 @@ from ..models import (
     ShippingMethodChannelListing,
     ShippingMethodType,
     ShippingZone,
+    ShippingZoneCountry,
+)
+from ..utils import (
+    default_shipping_zone_exists,
+    get_countries_without_shipping_zone,
+    get_shipping_zone_ids_for_country,
 )
-from ..utils import default_shipping_zone_exists, get_countries_without_shipping_zone
 
 
 @pytest.mark.parametrize(
@@ -290,3 +295,49 @@ def test_default_shipping_zone_exists(shipping_zone):
 def test_get_countries_without_shipping_zone(shipping_zone_without_countries):
     countries_no_shipping_zone = set(get_countries_without_shipping_zone())
     assert {c.code for c in countries} == countries_no_shipping_zone
+
+
+def test_shipping_zone_countries_are_synchronized(shipping_zone):
+    # given
+    shipping_zone.countries = ["PL", "DE"]
+
+    # when
+    shipping_zone.save(update_fields=["countries"])
+
+    # then
+    assert set(
+        ShippingZoneCountry.objects.filter(shipping_zone=shipping_zone).values_list(
+            "country", flat=True
+        )
+    ) == {"PL", "DE"}
+
+
+def test_get_shipping_zone_ids_for_country(shipping_zone, assert_num_queries):
+    # given
+    shipping_zone.countries = ["PL"]
+    shipping_zone.save()
+    other_zone = ShippingZone.objects.create(name="Europe", countries=["PL", "DE"])
+    get_shipping_zone_ids_for_country("PL")
+
+    # when
+    with assert_num_queries(0):
+        zone_ids = get_shipping_zone_ids_for_country("PL")
+
+    # then
+    assert zone_ids == [shipping_zone.pk, other_zone.pk]
+    assert get_shipping_zone_ids_for_country("US") == []
+
+
+def test_get_shipping_zone_ids_for_country_after_zone_change(shipping_zone):
+    # given
+    shipping_zone.countries = ["PL"]
+    shipping_zone.save()
+    assert get_shipping_zone_ids_for_country("PL") == [shipping_zone.pk]
+
+    # when
+    shipping_zone.countries = ["DE"]
+    shipping_zone.save()
+
+    # then
+    assert get_shipping_zone_ids_for_country("PL") == []
+    assert get_shipping_zone_ids_for_country("DE") == [shipping_zone.pk]
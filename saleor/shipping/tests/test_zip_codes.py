@@ -2,7 +2,13 @@ from unittest.mock import patch
 
 import pytest
 
-from ..zip_codes import check_zip_code_in_excluded_range
+from ..models import ShippingMethodZipCodeRule
+from ..zip_codes import (
+    ZipCodeRangeIndex,
+    check_zip_code_in_excluded_range,
+    get_shipping_methods_excluded_by_zip_code,
+    get_zip_code_key_function,
+)
 
 
 @pytest.mark.parametrize(
@@ -77,3 +83,109 @@ def test_check_uk_islands_follow_uk_check(check_uk_mock, country, code, start, e
     """Check if Isle of Man, Guernsey and Jersey triggers check_uk_zip_code method."""
     assert check_zip_code_in_excluded_range(country, code, start, end)
     check_uk_mock.assert_called_once_with(code, start, end)
+
+
+@pytest.mark.parametrize(
+    "country, code, start, end",
+    [
+        ["GB", "BH3 2BC", "BH2 1AA", "BH4 9ZZ"],
+        ["GB", "BH20 2BC", "BH2 1AA", "BH4 9ZZ"],
+        ["GB", "BH16 7HA", "BH16 7HA", None],
+        ["GB", "BH16 7HB", "BH16 7HC", None],
+        ["GB", "BH16 7HB", "invalid", "BH16 7HD"],
+        ["GB", "BH16 7HF", "BH16 7HA", "invalid"],
+        ["GB", "invalid", "BH16 7HA", "BH16 7HG"],
+        ["IR", "A65 2F0B", "A65 2F0A", "A65 2F0C"],
+        ["IR", "A65 2F0B", "A65 2F0C", "A65 2F0D"],
+        ["PL", "64-620", "64-200", "64-650"],
+        ["PL", "64-620", "63-200", "63-650"],
+        ["PL", "", "63-200", None],
+    ],
+)
+def test_zip_code_range_index_matches_range_check(country, code, start, end):
+    index = ZipCodeRangeIndex([(start, end)], get_zip_code_key_function(country))
+    assert (code in index) is check_zip_code_in_excluded_range(
+        country, code, start, end
+    )
+
+
+@pytest.mark.parametrize(
+    "code, excluded",
+    [
+        ["BH1 1AA", False],
+        ["BH2 5AA", True],
+        ["BH5 1AA", True],
+        ["BH9 9ZZ", True],
+        ["BH10 1AA", False],
+        ["BH19 9ZZ", False],
+        ["BH20 1AA", True],
+        ["SW1 1AA", True],
+    ],
+)
+def test_zip_code_range_index_many_ranges(code, excluded):
+    rules = [
+        ("BH2 1AA", "BH9 9ZZ"),
+        ("BH3 1AA", "BH4 9ZZ"),
+        ("BH20 1AA", None),
+        ("AB1 1AA", "AB2 1AA"),
+    ]
+    index = ZipCodeRangeIndex(rules, get_zip_code_key_function("GB"))
+    assert (code in index) is excluded
+
+
+def test_get_shipping_methods_excluded_by_zip_code(
+    shipping_method, address, assert_num_queries
+):
+    # given
+    address.country = "PL"
+    address.postal_code = "64-620"
+    ShippingMethodZipCodeRule.objects.create(
+        shipping_method=shipping_method, start="64-000", end="65-000"
+    )
+    get_shipping_methods_excluded_by_zip_code([shipping_method.pk], address)
+
+    # when
+    with assert_num_queries(0):
+        excluded_ids = get_shipping_methods_excluded_by_zip_code(
+            [shipping_method.pk], address
+        )
+
+    # then
+    assert excluded_ids == {shipping_method.pk}
+
+
+def test_get_shipping_methods_excluded_by_zip_code_after_rule_deleted(
+    shipping_method, address
+):
+    # given
+    address.country = "PL"
+    address.postal_code = "64-620"
+    rule = ShippingMethodZipCodeRule.objects.create(
+        shipping_method=shipping_method, start="64-000", end="65-000"
+    )
+    assert get_shipping_methods_excluded_by_zip_code([shipping_method.pk], address)
+
+    # when
+    rule.delete()
+
+    # then
+    assert not get_shipping_methods_excluded_by_zip_code([shipping_method.pk], address)
+
+
+def test_get_shipping_methods_excluded_by_zip_code_after_rule_created(
+    shipping_method, address
+):
+    # given
+    address.country = "PL"
+    address.postal_code = "64-620"
+    assert not get_shipping_methods_excluded_by_zip_code([shipping_method.pk], address)
+
+    # when
+    ShippingMethodZipCodeRule.objects.create(
+        shipping_method=shipping_method, start="64-000", end="65-000"
+    )
+
+    # then
+    assert get_shipping_methods_excluded_by_zip_code([shipping_method.pk], address) == {
+        shipping_method.pk
+    }
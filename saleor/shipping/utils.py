@@ -1,5 +1,12 @@
+from collections import defaultdict
+from typing import Dict, List
+
 from django_countries import countries
 
+from ..core.cache import ProcessCache
+
+country_shipping_zones_cache = ProcessCache("country_shipping_zones_version")
+
 
 def default_shipping_zone_exists(zone_pk=None):
     from .models import ShippingZone
@@ -15,3 +22,47 @@ def get_countries_without_shipping_zone():
     for zone in ShippingZone.objects.all():
         covered_countries.update({c.code for c in zone.countries})
     return (country[0] for country in countries if country[0] not in covered_countries)
+
+
+def _fetch_country_shipping_zones() -> Dict[str, List[int]]:
+    from .models import ShippingZoneCountry
+
+    shipping_zones: Dict[str, List[int]] = defaultdict(list)
+    entries = ShippingZoneCountry.objects.order_by("shipping_zone_id").values_list(
+        "country", "shipping_zone_id"
+    )
+    for country, shipping_zone_id in entries.iterator():
+        shipping_zones[country].append(shipping_zone_id)
+    return dict(shipping_zones)
+
+
+def get_shipping_zone_ids_for_country(country_code) -> List[int]:
+    """Return ids of shipping zones that include the given country."""
+    country_shipping_zones = country_shipping_zones_cache.get_or_set(
+        _fetch_country_shipping_zones
+    )
+    return country_shipping_zones.get(str(country_code), [])
+
+
+def update_shipping_zone_countries(shipping_zone):
+    """Synchronize the country entries of a zone with its `countries` field."""
+    from .models import ShippingZoneCountry
+
+    country_codes = {country.code for country in shipping_zone.countries}
+    existing_codes = set(
+        shipping_zone.country_entries.values_list("country", flat=True)
+    )
+    if country_codes == existing_codes:
+        return
+    shipping_zone.country_entries.exclude(country__in=country_codes).delete()
+    ShippingZoneCountry.objects.bulk_create(
+        [
+            ShippingZoneCountry(shipping_zone=shipping_zone, country=code)
+            for code in country_codes - existing_codes
+        ]
+    )
+    invalidate_country_shipping_zones()
+
+
+def invalidate_country_shipping_zones():
+    country_shipping_zones_cache.invalidate()
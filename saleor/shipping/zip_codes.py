@@ -1,4 +1,18 @@
 import re
+from bisect import bisect_right
+from collections import defaultdict
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..core.cache import ProcessCache
+
+if TYPE_CHECKING:
+    # flake8: noqa
+    from ..account.models import Address
+
+UK_ZIP_CODE_PATTERN = re.compile(r"^([A-Z]{1,2})([0-9]+)([A-Z]?) ?([0-9][A-Z]{2})$")
+IRISH_ZIP_CODE_PATTERN = re.compile(r"([\dA-Z]{3}) ?([\dA-Z]{4})")
+
+zip_code_rules_cache = ProcessCache("shipping_zip_code_rules_version")
 
 
 def group_values(pattern, *values):
@@ -44,8 +58,7 @@ def check_uk_zip_code(code, start, end):
 
     Example zip codes: BH20 2BC  (UK), IM16 7HF  (Isle of Man).
     """
-    pattern = r"^([A-Z]{1,2})([0-9]+)([A-Z]?) ?([0-9][A-Z]{2})$"
-    code, start, end = group_values(pattern, code, start, end)
+    code, start, end = group_values(UK_ZIP_CODE_PATTERN, code, start, end)
     # replace second item of each tuple with it's value casted to int
     code, start, end = cast_tuple_index_to_type(1, int, code, start, end)
     return compare_values(code, start, end)
@@ -56,8 +69,7 @@ def check_irish_zip_code(code, start, end):
 
     Example zip codes: A65 2F0A, A61 2F0G.
     """
-    pattern = r"([\dA-Z]{3}) ?([\dA-Z]{4})"
-    code, start, end = group_values(pattern, code, start, end)
+    code, start, end = group_values(IRISH_ZIP_CODE_PATTERN, code, start, end)
     return compare_values(code, start, end)
 
 
@@ -80,12 +92,133 @@ def check_zip_code_in_excluded_range(country, code, start, end):
     return country_func_map.get(country, check_any_zip_code)(code, start, end)
 
 
-def check_shipping_method_for_zip_code(customer_shipping_address, method):
+def get_uk_zip_code_key(code):
+    (groups,) = group_values(UK_ZIP_CODE_PATTERN, code)
+    (key,) = cast_tuple_index_to_type(1, int, groups)
+    return key or None
+
+
+def get_irish_zip_code_key(code):
+    (groups,) = group_values(IRISH_ZIP_CODE_PATTERN, code)
+    return groups
+
+
+def get_any_zip_code_key(code):
+    return code or None
+
+
+def get_zip_code_key_function(country):
+    """Return a function converting zip codes of the country to comparable keys.
+
+    Keys are compared the same way as by the `check_*_zip_code` functions, None is
+    returned for codes that don't match the country's format.
+    """
+    country_func_map = {
+        "GB": get_uk_zip_code_key,  # United Kingdom
+        "IM": get_uk_zip_code_key,  # Isle of Man
+        "GG": get_uk_zip_code_key,  # Guernsey
+        "JE": get_uk_zip_code_key,  # Jersey
+        "IR": get_irish_zip_code_key,  # Ireland
+    }
+    return country_func_map.get(country, get_any_zip_code_key)
+
+
+class ZipCodeRangeIndex:
+    """Excluded zip code ranges of a shipping method normalized for a country format.
+
+    Closed ranges are sorted by start, with the highest end of all ranges up to the
+    given position stored next to them. A code is in a closed range if the highest
+    end of the ranges starting at or before the code, found by binary search,
+    isn't lower than the code. Ranges without an end cover all codes from the
+    lowest start among them.
+    """
+
+    def __init__(self, rules: Iterable[Tuple[str, Optional[str]]], key: Callable):
+        self.key = key
+        self.open_start = None
+        ranges = []
+        for start, end in rules:
+            start_key = key(start)
+            if start_key is None:
+                continue
+            end_key = key(end) if end else None
+            if end_key is None:
+                if self.open_start is None or start_key < self.open_start:
+                    self.open_start = start_key
+            else:
+                ranges.append((start_key, end_key))
+        ranges.sort()
+        self.starts = [start for start, _ in ranges]
+        self.max_ends: List = []
+        for _, end in ranges:
+            if self.max_ends and self.max_ends[-1] > end:
+                end = self.max_ends[-1]
+            self.max_ends.append(end)
+
+    def __contains__(self, code) -> bool:
+        code_key = self.key(code)
+        if code_key is None:
+            return False
+        if self.open_start is not None and self.open_start <= code_key:
+            return True
+        position = bisect_right(self.starts, code_key)
+        return position > 0 and self.max_ends[position - 1] >= code_key
+
+
+class ShippingMethodZipCodeRules:
+    """Zip code rules of a shipping method with indexes built per country format."""
+
+    def __init__(self, rules: List[Tuple[str, Optional[str]]]):
+        self.rules = rules
+        self.indexes: Dict[Callable, ZipCodeRangeIndex] = {}
+
+    def is_excluded(self, country, code) -> bool:
+        if not self.rules:
+            return False
+        key = get_zip_code_key_function(country)
+        index = self.indexes.get(key)
+        if index is None:
+            index = self.indexes[key] = ZipCodeRangeIndex(self.rules, key)
+        return code in index
+
+
+def get_shipping_method_zip_code_rules(
+    shipping_method_ids: Iterable[int],
+) -> Dict[int, ShippingMethodZipCodeRules]:
+    """Return zip code rules of given shipping methods.
+
+    Rules are cached in the process and fetched only for methods missing in
+    the cache.
+    """
+    from .models import ShippingMethodZipCodeRule
+
+    cached_rules = zip_code_rules_cache.get_or_set(dict)
+    missing_ids = [pk for pk in shipping_method_ids if pk not in cached_rules]
+    if missing_ids:
+        rules: Dict[int, List[Tuple[str, Optional[str]]]] = defaultdict(list)
+        rules_qs = ShippingMethodZipCodeRule.objects.filter(
+            shipping_method_id__in=missing_ids
+        ).values_list("shipping_method_id", "start", "end")
+        for shipping_method_id, start, end in rules_qs.iterator():
+            rules[shipping_method_id].append((start, end))
+        for pk in missing_ids:
+            cached_rules[pk] = ShippingMethodZipCodeRules(rules[pk])
+    return {pk: cached_rules[pk] for pk in shipping_method_ids}
+
+
+def get_shipping_methods_excluded_by_zip_code(
+    shipping_method_ids: Iterable[int], customer_shipping_address: "Address"
+) -> Set[int]:
+    """Return ids of shipping methods excluding the postal code of the address."""
     country = customer_shipping_address.country.code
     postal_code = customer_shipping_address.postal_code
-    for zip_code in method.zip_code_rules.all():
-        if check_zip_code_in_excluded_range(
-            country, postal_code, zip_code.start, zip_code.end
-        ):
-            return True
-    return False
+    rules = get_shipping_method_zip_code_rules(shipping_method_ids)
+    return {
+        pk
+        for pk, method_rules in rules.items()
+        if method_rules.is_excluded(country, postal_code)
+    }
+
+
+def invalidate_zip_code_rules():
+    zip_code_rules_cache.invalidate()
@@ -37,6 +37,7 @@ from ..attribute.utils import associate_attribute_values_to_instance
 from ..checkout.models import Checkout
 from ..checkout.utils import add_variant_to_checkout
 from ..core import JobStatus
+from ..core.cache import clear_process_caches
 from ..core.payments import PaymentInterface
 from ..csv.events import ExportEvents
 from ..csv.models import ExportEvent, ExportFile
@@ -63,6 +64,7 @@ from ..payment.interface import GatewayConfig, PaymentData
 from ..payment.models import Payment
 from ..plugins.models import PluginConfiguration
 from ..plugins.vatlayer.plugin import VatlayerPlugin
+from ..plugins.webhook.clients import clear_clients
 from ..product.models import (
     Category,
     CategoryTranslation,
@@ -88,9 +90,11 @@ from ..shipping.models import (
     ShippingMethodTranslation,
     ShippingMethodType,
     ShippingZone,
+    ShippingZoneCountry,
 )
 from ..site import AuthenticationBackends
 from ..site.models import AuthorizationKey, SiteSettings
+from ..warehouse.management import recalculate_stocks_quantity_allocated
 from ..warehouse.models import Allocation, Stock, Warehouse
 from ..webhook.event_types import WebhookEventType
 from ..webhook.models import Webhook
@@ -193,6 +197,16 @@ def setup_vatlayer(settings):
     return settings
 
 
+@pytest.fixture(autouse=True)
+def clear_caches_between_tests():
+    # Values cached in the process would outlive the rolled back test database
+    clear_process_caches()
+    clear_clients()
+    yield
+    clear_process_caches()
+    clear_clients()
+
+
 @pytest.fixture(autouse=True)
 def setup_dummy_gateways(settings):
     settings.PLUGINS = [
@@ -628,6 +642,12 @@ def shipping_zones(db, channel_USD, channel_PLN):
             ShippingZone(name="USA", countries=["US"]),
         ]
     )
+    ShippingZoneCountry.objects.bulk_create(
+        [
+            ShippingZoneCountry(shipping_zone=shipping_zone_poland, country="PL"),
+            ShippingZoneCountry(shipping_zone=shipping_zone_usa, country="US"),
+        ]
+    )
     method = shipping_zone_poland.shipping_methods.create(
         name="DHL", type=ShippingMethodType.PRICE_BASED, shipping_zone=shipping_zone,
     )
@@ -1844,6 +1864,7 @@ def order_line_with_allocation_in_many_stocks(
             Allocation(order_line=order_line, stock=stocks[1], quantity_allocated=1),
         ]
     )
+    recalculate_stocks_quantity_allocated(stocks)
 
     return order_line
 
@@ -1879,6 +1900,7 @@ def order_line_with_one_allocation(
     Allocation.objects.create(
         order_line=order_line, stock=stocks[0], quantity_allocated=1
     )
+    recalculate_stocks_quantity_allocated(stocks)
 
     return order_line
 
@@ -1954,6 +1976,8 @@ def order_with_lines(
     Allocation.objects.create(
         order_line=line, stock=stock, quantity_allocated=line.quantity
     )
+    stock.quantity_allocated = line.quantity
+    stock.save(update_fields=["quantity_allocated"])
 
     product = Product.objects.create(
         name="Test product 2",
@@ -1995,6 +2019,8 @@ def order_with_lines(
     Allocation.objects.create(
         order_line=line, stock=stock, quantity_allocated=line.quantity
     )
+    stock.quantity_allocated = line.quantity
+    stock.save(update_fields=["quantity_allocated"])
 
     order.shipping_address = order.billing_address.get_copy()
     order.channel = channel_USD
@@ -2070,6 +2096,8 @@ def order_with_lines_channel_PLN(
     Allocation.objects.create(
         order_line=line, stock=stock, quantity_allocated=line.quantity
     )
+    stock.quantity_allocated = line.quantity
+    stock.save(update_fields=["quantity_allocated"])
 
     product = Product.objects.create(
         name="Test product 2 in PLN channel",
@@ -2111,6 +2139,8 @@ def order_with_lines_channel_PLN(
     Allocation.objects.create(
         order_line=line, stock=stock, quantity_allocated=line.quantity
     )
+    stock.quantity_allocated = line.quantity
+    stock.save(update_fields=["quantity_allocated"])
 
     order.shipping_address = order.billing_address.get_copy()
     order.channel = channel_PLN
@@ -2230,6 +2260,7 @@ def fulfillment(fulfilled_order):
 @pytest.fixture
 def draft_order(order_with_lines):
     Allocation.objects.filter(order_line__order=order_with_lines).delete()
+    recalculate_stocks_quantity_allocated(Stock.objects.all())
     order_with_lines.status = OrderStatus.DRAFT
     order_with_lines.save(update_fields=["status"])
     return order_with_lines
@@ -3192,9 +3223,12 @@ def stock(variant, warehouse):
 
 @pytest.fixture
 def allocation(order_line, stock):
-    return Allocation.objects.create(
+    allocation = Allocation.objects.create(
         order_line=order_line, stock=stock, quantity_allocated=order_line.quantity
     )
+    stock.quantity_allocated = order_line.quantity
+    stock.save(update_fields=["quantity_allocated"])
+    return allocation
 
 
 @pytest.fixture
@@ -3239,7 +3273,7 @@ def allocations(order_list, stock, channel_USD):
             ),
         ]
     )
-    return Allocation.objects.bulk_create(
+    allocations = Allocation.objects.bulk_create(
         [
             Allocation(
                 order_line=lines[0], stock=stock, quantity_allocated=lines[0].quantity
@@ -3252,6 +3286,9 @@ def allocations(order_list, stock, channel_USD):
             ),
         ]
     )
+    stock.quantity_allocated = sum(line.quantity for line in lines)
+    stock.save(update_fields=["quantity_allocated"])
+    return allocations
 
 
 @pytest.fixture
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterable
 
 from django.db.models import Sum
 from django.db.models.functions import Coalesce
@@ -11,15 +11,16 @@ if TYPE_CHECKING:
 
 
 def _get_quantity_allocated(stocks: StockQuerySet) -> int:
-    return stocks.aggregate(
-        quantity_allocated=Coalesce(Sum("allocations__quantity_allocated"), 0)
-    )["quantity_allocated"]
+    results = stocks.aggregate(
+        quantity_allocated=Coalesce(Sum("quantity_allocated"), 0),
+    )
+    return results["quantity_allocated"]
 
 
 def _get_available_quantity(stocks: StockQuerySet) -> int:
     results = stocks.aggregate(
-        total_quantity=Coalesce(Sum("quantity", distinct=True), 0),
-        quantity_allocated=Coalesce(Sum("allocations__quantity_allocated"), 0),
+        total_quantity=Coalesce(Sum("quantity"), 0),
+        quantity_allocated=Coalesce(Sum("quantity_allocated"), 0),
     )
     total_quantity = results["total_quantity"]
     quantity_allocated = results["quantity_allocated"]
@@ -42,6 +43,40 @@ def check_stock_quantity(variant: "ProductVariant", country_code: str, quantity:
             raise InsufficientStock(variant)
 
 
+def check_stock_quantity_bulk(
+    variants: Iterable["ProductVariant"], country_code: str, quantities: Iterable[int]
+):
+    """Validate if there is stock available for given variants in given country.
+
+    Stocks of all variants are fetched in a single query. Raise InsufficientStock
+    for the first variant with less stock than required.
+    """
+    variants = list(variants)
+    stocks = (
+        Stock.objects.for_country(country_code)
+        .filter(product_variant__in=variants)
+        .order_by()
+        .values("product_variant_id")
+        .annotate(
+            total_quantity=Coalesce(Sum("quantity"), 0),
+            quantity_allocated=Coalesce(Sum("quantity_allocated"), 0),
+        )
+    )
+    available_quantities = {
+        stock["product_variant_id"]: max(
+            stock["total_quantity"] - stock["quantity_allocated"], 0
+        )
+        for stock in stocks
+    }
+    for variant, quantity in zip(variants, quantities):
+        if not variant.track_inventory:
+            continue
+        if variant.pk not in available_quantities:
+            raise InsufficientStock(variant)
+        if quantity > available_quantities[variant.pk]:
+            raise InsufficientStock(variant)
+
+
 def get_available_quantity(variant: "ProductVariant", country_code: str) -> int:
     """Return available quantity for given product in given country."""
     stocks = Stock.objects.get_variant_stocks_for_country(country_code, variant)
@@ -1,8 +1,8 @@
 from collections import defaultdict
-from typing import TYPE_CHECKING, Dict
+from typing import TYPE_CHECKING, Dict, Iterable, List, Tuple
 
 from django.db import transaction
-from django.db.models import F, Sum
+from django.db.models import F, OuterRef, Subquery, Sum
 from django.db.models.functions import Coalesce
 
 from ..core.exceptions import AllocationError, InsufficientStock
@@ -18,56 +18,70 @@ def allocate_stock(
 ):
     """Allocate stocks for given `order_line` in given country.
 
-    Function lock for update all stocks and allocations for variant in
-    given country and order by pk. Next, generate the dictionary
-    ({"stock_pk": "quantity_allocated"}) with actual allocated quantity for stocks.
-    Iterate by stocks and allocate as many items as needed or available in stock
+    Function lock for update all stocks for variant in given country and order
+    by pk. Iterate by stocks and allocate as many items as needed or available in stock
     for order line, until allocated all required quantity for the order line.
     If there is less quantity in stocks then rise InsufficientStock exception.
     """
-    stocks = (
-        Stock.objects.select_for_update(of=("self",))
-        .get_variant_stocks_for_country(country_code, order_line.variant)
-        .order_by("pk")
-    )
+    _allocate_stocks([(order_line, quantity)], country_code)
 
-    quantity_allocation_list = list(
-        Allocation.objects.filter(stock__in=stocks, quantity_allocated__gt=0,)
-        .values("stock")
-        .annotate(Sum("quantity_allocated"))
-    )
-    quantity_allocation_for_stocks: Dict = defaultdict(int)
-    for allocation in quantity_allocation_list:
-        quantity_allocation_for_stocks[allocation["stock"]] += allocation[
-            "quantity_allocated__sum"
-        ]
 
-    quantity_allocated = 0
-    allocations = []
+@transaction.atomic
+def allocate_stocks(order_lines: Iterable["OrderLine"], country_code: str):
+    """Allocate stocks for the whole quantity of given `order_lines` in given country.
 
-    for stock in stocks:
-        quantity_allocated_in_stock = quantity_allocation_for_stocks.get(stock.pk, 0)
+    Works like `allocate_stock` but locks the stocks of all variants with a single
+    query and creates allocations for all lines at once. Stocks are locked in pk
+    order, so concurrent allocations can't deadlock.
+    """
+    _allocate_stocks([(line, line.quantity) for line in order_lines], country_code)
 
-        quantity_available_in_stock = stock.quantity - quantity_allocated_in_stock
 
-        quantity_to_allocate = min(
-            (quantity - quantity_allocated), quantity_available_in_stock
-        )
-        if quantity_to_allocate > 0:
-            allocations.append(
-                Allocation(
-                    order_line=order_line,
-                    stock=stock,
-                    quantity_allocated=quantity_to_allocate,
-                )
-            )
+def _allocate_stocks(
+    lines_with_quantity: List[Tuple["OrderLine", int]], country_code: str
+):
+    variant_ids = {line.variant_id for line, _ in lines_with_quantity}
+    stocks = list(
+        Stock.objects.select_for_update(of=("self",))
+        .for_country(country_code)
+        .filter(product_variant_id__in=variant_ids)
+        .order_by("pk")
+    )
+
+    stocks_for_variants: Dict[int, List[Stock]] = defaultdict(list)
+    for stock in stocks:
+        stocks_for_variants[stock.product_variant_id].append(stock)
 
-            quantity_allocated += quantity_to_allocate
+    allocations = []
+    for order_line, quantity in lines_with_quantity:
+        quantity_allocated = 0
+        for stock in stocks_for_variants[order_line.variant_id]:
             if quantity_allocated == quantity:
-                Allocation.objects.bulk_create(allocations)
                 break
-    if not quantity_allocated == quantity:
-        raise InsufficientStock(order_line.variant)
+            quantity_available_in_stock = stock.quantity - stock.quantity_allocated
+
+            quantity_to_allocate = min(
+                (quantity - quantity_allocated), quantity_available_in_stock
+            )
+            if quantity_to_allocate > 0:
+                allocations.append(
+                    Allocation(
+                        order_line=order_line,
+                        stock=stock,
+                        quantity_allocated=quantity_to_allocate,
+                    )
+                )
+                # lines of the same variant share the stock quantity
+                stock.quantity_allocated += quantity_to_allocate
+                quantity_allocated += quantity_to_allocate
+        if not quantity_allocated == quantity:
+            raise InsufficientStock(order_line.variant)
+
+    Allocation.objects.bulk_create(allocations)
+    # stocks are locked, so the allocated quantities can be saved as computed
+    Stock.objects.bulk_update(
+        {allocation.stock for allocation in allocations}, ["quantity_allocated"]
+    )
 
 
 @transaction.atomic
@@ -86,6 +100,7 @@ def deallocate_stock(order_line: "OrderLine", quantity: int):
         .order_by("stock__pk")
     )
     quantity_dealocated = 0
+    stocks_to_update = []
     for allocation in allocations:
         quantity_to_deallocate = min(
             (quantity - quantity_dealocated), allocation.quantity_allocated
@@ -94,9 +109,13 @@ def deallocate_stock(order_line: "OrderLine", quantity: int):
             allocation.quantity_allocated = (
                 F("quantity_allocated") - quantity_to_deallocate
             )
+            stock = allocation.stock
+            stock.quantity_allocated = F("quantity_allocated") - quantity_to_deallocate
+            stocks_to_update.append(stock)
             quantity_dealocated += quantity_to_deallocate
             if quantity_dealocated == quantity:
                 Allocation.objects.bulk_update(allocations, ["quantity_allocated"])
+                Stock.objects.bulk_update(stocks_to_update, ["quantity_allocated"])
                 break
     if not quantity_dealocated == quantity:
         raise AllocationError(order_line, quantity)
@@ -139,6 +158,8 @@ def increase_stock(
             Allocation.objects.create(
                 order_line=order_line, stock=stock, quantity_allocated=quantity
             )
+        stock.quantity_allocated = F("quantity_allocated") + quantity
+        stock.save(update_fields=["quantity_allocated"])
 
 
 @transaction.atomic
@@ -154,23 +175,17 @@ def decrease_stock(order_line: "OrderLine", quantity: int, warehouse_pk: str):
     try:
         deallocate_stock(order_line, quantity)
     except AllocationError:
-        order_line.allocations.update(quantity_allocated=0)
+        _deallocate_all(order_line.allocations.all())
 
     try:
-        stock = (
-            order_line.variant.stocks.select_for_update()  # type: ignore
-            .prefetch_related("allocations")
-            .get(warehouse__pk=warehouse_pk)
+        stock = order_line.variant.stocks.select_for_update().get(  # type: ignore
+            warehouse__pk=warehouse_pk
         )
     except Stock.DoesNotExist:
         error_context = {"order_line": order_line, "warehouse_pk": warehouse_pk}
         raise InsufficientStock(order_line.variant, error_context)
 
-    quantity_allocated = stock.allocations.aggregate(
-        quantity_allocated=Coalesce(Sum("quantity_allocated"), 0)
-    )["quantity_allocated"]
-
-    if stock.quantity - quantity_allocated < quantity:
+    if stock.quantity - stock.quantity_allocated < quantity:
         error_context = {"order_line": order_line, "warehouse_pk": warehouse_pk}
         raise InsufficientStock(order_line.variant, error_context)
 
@@ -181,7 +196,37 @@ def decrease_stock(order_line: "OrderLine", quantity: int, warehouse_pk: str):
 @transaction.atomic
 def deallocate_stock_for_order(order: "Order"):
     """Remove all allocations for given order."""
-    allocations = Allocation.objects.filter(
-        order_line__order=order, quantity_allocated__gt=0
-    ).select_for_update(of=("self",))
-    allocations.update(quantity_allocated=0)
+    _deallocate_all(Allocation.objects.filter(order_line__order=order))
+
+
+def _deallocate_all(allocations):
+    """Set quantity of given allocations to zero and release it in their stocks."""
+    allocations = list(
+        allocations.filter(quantity_allocated__gt=0)
+        .select_related("stock")
+        .select_for_update(of=("self", "stock"))
+        .order_by("stock__pk")
+    )
+    stocks: Dict[int, Stock] = {}
+    deallocated_for_stocks: Dict[int, int] = defaultdict(int)
+    for allocation in allocations:
+        stocks[allocation.stock_id] = allocation.stock
+        deallocated_for_stocks[allocation.stock_id] += allocation.quantity_allocated
+        allocation.quantity_allocated = 0
+    for stock_pk, stock in stocks.items():
+        stock.quantity_allocated = (
+            F("quantity_allocated") - deallocated_for_stocks[stock_pk]
+        )
+    Allocation.objects.bulk_update(allocations, ["quantity_allocated"])
+    Stock.objects.bulk_update(stocks.values(), ["quantity_allocated"])
+
+
+def recalculate_stocks_quantity_allocated(stocks):
+    """Recalculate the allocated quantity of given stocks from their allocations."""
+    quantity_allocated = (
+        Allocation.objects.filter(stock=OuterRef("pk"))
+        .values("stock")
+        .annotate(total=Sum("quantity_allocated"))
+        .values("total")
+    )
+    stocks.update(quantity_allocated=Coalesce(Subquery(quantity_allocated), 0))
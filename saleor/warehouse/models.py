@@ -3,13 +3,13 @@ import uuid
 from typing import Set
 
 from django.db import models
-from django.db.models import F, Sum
-from django.db.models.functions import Coalesce
+from django.db.models import F
 
 from ..account.models import Address
 from ..order.models import OrderLine
 from ..product.models import Product, ProductVariant
 from ..shipping.models import ShippingZone
+from ..shipping.utils import get_shipping_zone_ids_for_country
 
 
 class WarehouseQueryset(models.QuerySet):
@@ -19,7 +19,7 @@ class WarehouseQueryset(models.QuerySet):
     def for_country(self, country: str):
         return (
             self.prefetch_data()
-            .filter(shipping_zones__countries__contains=country)
+            .filter(shipping_zones__id__in=get_shipping_zone_ids_for_country(country))
             .order_by("pk")
         )
 
@@ -56,15 +56,12 @@ class Warehouse(models.Model):
 
 class StockQuerySet(models.QuerySet):
     def annotate_available_quantity(self):
-        return self.annotate(
-            available_quantity=F("quantity")
-            - Coalesce(Sum("allocations__quantity_allocated"), 0)
-        )
+        return self.annotate(available_quantity=F("quantity") - F("quantity_allocated"))
 
     def for_country(self, country_code: str):
         query_warehouse = models.Subquery(
             Warehouse.objects.filter(
-                shipping_zones__countries__contains=country_code
+                shipping_zones__id__in=get_shipping_zone_ids_for_country(country_code)
             ).values("pk")
         )
         return self.select_related("product_variant", "warehouse").filter(
@@ -92,6 +89,9 @@ class Stock(models.Model):
         ProductVariant, null=False, on_delete=models.CASCADE, related_name="stocks"
     )
     quantity = models.PositiveIntegerField(default=0)
+    # Sum of `quantity_allocated` of the stock's allocations, maintained by
+    # the functions in `warehouse.management`
+    quantity_allocated = models.PositiveIntegerField(default=0)
 
     objects = StockQuerySet.as_manager()
 
@@ -4,6 +4,7 @@ from ...core.exceptions import InsufficientStock
 from ..availability import (
     are_all_product_variants_in_stock,
     check_stock_quantity,
+    check_stock_quantity_bulk,
     get_available_quantity,
     get_quantity_allocated,
 )
@@ -47,6 +48,25 @@ def test_check_stock_quantity_without_one_stock(variant_with_many_stocks):
     assert check_stock_quantity(variant_with_many_stocks, COUNTRY_CODE, 4) is None
 
 
+def test_check_stock_quantity_bulk(variant_with_many_stocks):
+    assert (
+        check_stock_quantity_bulk([variant_with_many_stocks], COUNTRY_CODE, [7]) is None
+    )
+
+
+def test_check_stock_quantity_bulk_out_of_stock(
+    variant_with_many_stocks, order_line_with_allocation_in_many_stocks
+):
+    with pytest.raises(InsufficientStock):
+        check_stock_quantity_bulk([variant_with_many_stocks], COUNTRY_CODE, [5])
+
+
+def test_check_stock_quantity_bulk_without_stocks(variant_with_many_stocks):
+    variant_with_many_stocks.stocks.all().delete()
+    with pytest.raises(InsufficientStock):
+        check_stock_quantity_bulk([variant_with_many_stocks], COUNTRY_CODE, [1])
+
+
 def test_get_available_quantity_without_allocation(order_line, stock):
     assert not Allocation.objects.filter(order_line=order_line, stock=stock).exists()
     available_quantity = get_available_quantity(order_line.variant, COUNTRY_CODE)
@@ -100,6 +120,8 @@ def test_are_all_product_variants_in_stock_all_in_stock(stock):
 def test_are_all_product_variants_in_stock_stock_empty(allocation, variant):
     allocation.quantity_allocated = allocation.stock.quantity
     allocation.save(update_fields=["quantity_allocated"])
+    allocation.stock.quantity_allocated = allocation.stock.quantity
+    allocation.stock.save(update_fields=["quantity_allocated"])
 
     assert not are_all_product_variants_in_stock(variant.product, COUNTRY_CODE)
 
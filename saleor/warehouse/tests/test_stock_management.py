@@ -3,14 +3,16 @@ from django.db.models import Sum
 from django.db.models.functions import Coalesce
 
 from ...core.exceptions import InsufficientStock
+from ...order.models import OrderLine
 from ..management import (
     allocate_stock,
+    allocate_stocks,
     deallocate_stock,
     deallocate_stock_for_order,
     decrease_stock,
     increase_stock,
 )
-from ..models import Allocation
+from ..models import Allocation, Stock
 
 COUNTRY_CODE = "US"
 
@@ -81,10 +83,76 @@ def test_allocate_stock_insufficient_stocks(order_line, variant_with_many_stocks
     ).exists()
 
 
+def test_allocate_stocks_lines_share_stocks(order_line, variant_with_many_stocks):
+    # given
+    stocks = list(variant_with_many_stocks.stocks.order_by("pk"))
+    second_line = OrderLine.objects.get(pk=order_line.pk)
+    second_line.pk = None
+    second_line.save()
+
+    # when
+    allocate_stocks([order_line, second_line], COUNTRY_CODE)
+
+    # then
+    first_allocations = Allocation.objects.filter(order_line=order_line)
+    assert [(a.stock, a.quantity_allocated) for a in first_allocations] == [
+        (stocks[0], 3)
+    ]
+    second_allocations = Allocation.objects.filter(order_line=second_line).order_by(
+        "stock__pk"
+    )
+    assert [(a.stock, a.quantity_allocated) for a in second_allocations] == [
+        (stocks[0], 1),
+        (stocks[1], 2),
+    ]
+
+
+def test_allocate_stocks_insufficient_stocks_allocates_nothing(
+    order_line, variant_with_many_stocks
+):
+    # given
+    second_line = OrderLine.objects.get(pk=order_line.pk)
+    second_line.pk = None
+    second_line.quantity = 5
+    second_line.save()
+
+    # when
+    with pytest.raises(InsufficientStock):
+        allocate_stocks([order_line, second_line], COUNTRY_CODE)
+
+    # then
+    assert not Allocation.objects.exists()
+
+
+def test_allocate_stocks_number_of_queries_is_constant(
+    order_with_lines, capture_queries
+):
+    # given
+    lines = list(order_with_lines.lines.all())
+    Allocation.objects.all().delete()
+    Stock.objects.update(quantity_allocated=0)
+    for line in lines:
+        line.quantity = 1
+
+    # when
+    with capture_queries() as single_line_ctx:
+        allocate_stocks(lines[:1], COUNTRY_CODE)
+    Allocation.objects.all().delete()
+    Stock.objects.update(quantity_allocated=0)
+    with capture_queries() as all_lines_ctx:
+        allocate_stocks(lines, COUNTRY_CODE)
+
+    # then
+    assert len(lines) > 1
+    assert len(all_lines_ctx.captured_queries) == len(single_line_ctx.captured_queries)
+    assert Allocation.objects.count() == len(lines)
+
+
 def test_deallocate_stock(allocation):
     stock = allocation.stock
     stock.quantity = 100
-    stock.save(update_fields=["quantity"])
+    stock.quantity_allocated = 80
+    stock.save(update_fields=["quantity", "quantity_allocated"])
     allocation.quantity_allocated = 80
     allocation.save(update_fields=["quantity_allocated"])
 
@@ -99,7 +167,8 @@ def test_deallocate_stock(allocation):
 def test_deallocate_stock_partially(allocation):
     stock = allocation.stock
     stock.quantity = 100
-    stock.save(update_fields=["quantity"])
+    stock.quantity_allocated = 80
+    stock.save(update_fields=["quantity", "quantity_allocated"])
     allocation.quantity_allocated = 80
     allocation.save(update_fields=["quantity_allocated"])
 
@@ -136,7 +205,8 @@ def test_deallocate_stock_many_allocations_partially(
 def test_increase_stock_without_allocate(allocation):
     stock = allocation.stock
     stock.quantity = 100
-    stock.save(update_fields=["quantity"])
+    stock.quantity_allocated = 80
+    stock.save(update_fields=["quantity", "quantity_allocated"])
     allocation.quantity_allocated = 80
     allocation.save(update_fields=["quantity_allocated"])
 
@@ -151,7 +221,8 @@ def test_increase_stock_without_allocate(allocation):
 def test_increase_stock_with_allocate(allocation):
     stock = allocation.stock
     stock.quantity = 100
-    stock.save(update_fields=["quantity"])
+    stock.quantity_allocated = 80
+    stock.save(update_fields=["quantity", "quantity_allocated"])
     allocation.quantity_allocated = 80
     allocation.save(update_fields=["quantity_allocated"])
 
@@ -179,7 +250,8 @@ def test_increase_stock_with_new_allocation(order_line, stock):
 def test_decrease_stock(allocation):
     stock = allocation.stock
     stock.quantity = 100
-    stock.save(update_fields=["quantity"])
+    stock.quantity_allocated = 80
+    stock.save(update_fields=["quantity", "quantity_allocated"])
     allocation.quantity_allocated = 80
     allocation.save(update_fields=["quantity_allocated"])
     warehouse_pk = allocation.stock.warehouse.pk
@@ -195,7 +267,8 @@ def test_decrease_stock(allocation):
 def test_decrease_stock_partially(allocation):
     stock = allocation.stock
     stock.quantity = 100
-    stock.save(update_fields=["quantity"])
+    stock.quantity_allocated = 80
+    stock.save(update_fields=["quantity", "quantity_allocated"])
     allocation.quantity_allocated = 80
     allocation.save(update_fields=["quantity_allocated"])
     warehouse_pk = allocation.stock.warehouse.pk
@@ -0,0 +1,45 @@
+import signal
+from typing import Any
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+from django.core.management.base import CommandParser
+
+from ....plugins.webhook.dispatcher import WebhookDispatcher, check_http_pool_size
+
+
+class Command(BaseCommand):
+    help = (
+        "Deliver webhooks from the WEBHOOK_DELIVERY_QUEUE queue concurrently "
+        "within a single process."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=settings.WEBHOOK_DISPATCHER_CONCURRENCY,
+            help="Max number of concurrent deliveries.",
+        )
+
+    def handle(self, *args: Any, **options: Any):
+        queue_name = settings.WEBHOOK_DELIVERY_QUEUE
+        if not queue_name:
+            raise CommandError(
+                "Set WEBHOOK_DELIVERY_QUEUE to route webhook deliveries to the "
+                "dispatcher."
+            )
+        concurrency = options["concurrency"]
+        if concurrency < 1:
+            raise CommandError("Concurrency must be a positive number.")
+        check_http_pool_size(concurrency)
+
+        dispatcher = WebhookDispatcher(queue_name, concurrency)
+        signal.signal(signal.SIGTERM, lambda *_args: dispatcher.stop())
+        signal.signal(signal.SIGINT, lambda *_args: dispatcher.stop())
+        self.stdout.write(
+            f"Dispatching webhooks from queue {queue_name!r} with concurrency "
+            f"{concurrency}"
+        )
+        dispatcher.run()
+        self.stdout.write("Dispatcher stopped")
@@ -2,6 +2,7 @@ from django.core import validators
 from django.db import models
 
 from ..app.models import App
+from .utils import invalidate_webhook_subscriptions
 
 
 class WebhookURLField(models.URLField):
@@ -17,6 +18,15 @@ class Webhook(models.Model):
     is_active = models.BooleanField(default=True)
     secret_key = models.CharField(max_length=255, null=True, blank=True)
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        invalidate_webhook_subscriptions()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        invalidate_webhook_subscriptions()
+        return result
+
 
 class WebhookEvent(models.Model):
     webhook = models.ForeignKey(
@@ -26,3 +36,12 @@ class WebhookEvent(models.Model):
 
     def __repr__(self):
         return self.event_type
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        invalidate_webhook_subscriptions()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        invalidate_webhook_subscriptions()
+        return result
@@ -1,9 +1,14 @@
 from collections import OrderedDict
 from collections.abc import Iterable
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
 
 import graphene
 from django.core.serializers.json import Serializer as JSONSerializer
 from django.core.serializers.python import Serializer as PythonBaseSerializer
+from django.db.models import Field, Model, QuerySet
+from django.utils.encoding import is_protected_type
 from django.utils.functional import SimpleLazyObject
 
 
@@ -94,3 +99,70 @@ class PayloadSerializer(JSONSerializer):
         # Finally update the data with the super class' "self._current" content
         data.update(self._current)
         return data
+
+
+def _get_value_converter(field: Field) -> Callable[[Any], Any]:
+    """Return a function converting the field's value like `PythonSerializer`."""
+    if type(field).value_to_string is Field.value_to_string:
+        return lambda value: value if is_protected_type(value) else str(value)
+
+    def convert(value):
+        if is_protected_type(value):
+            return value
+        return field.value_to_string(SimpleNamespace(**{field.attname: value}))
+
+    return convert
+
+
+class ModelFieldsSerializer:
+    """Serializer of the selected fields of a model to basic Python objects.
+
+    Produces the same data as `PythonSerializer`, but the serialized fields and
+    their conversions are resolved once per model and fields, and objects can be
+    serialized from rows returned by `QuerySet.values()` without building model
+    instances. Use `get_model_fields_serializer` to get a cached instance.
+    """
+
+    def __init__(self, model, fields: Tuple[str, ...]):
+        self.object_name = model._meta.object_name
+        selected_fields = set(fields)
+        self.fields: List[Tuple[str, Field, Callable[[Any], Any]]] = []
+        for field in model._meta.concrete_model._meta.local_fields:
+            if not field.serialize:
+                continue
+            name = field.attname if field.remote_field is None else field.name
+            if name in selected_fields:
+                self.fields.append((field.name, field, _get_value_converter(field)))
+        self.value_names = ["id"] + [field.attname for _, field, _ in self.fields]
+
+    def get_global_id(self, pk) -> str:
+        return graphene.Node.to_global_id(self.object_name, pk)
+
+    def serialize_instance(
+        self, obj: Model, extra_data: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        data = {"type": self.object_name, "id": self.get_global_id(obj.id)}
+        data.update(extra_data or {})
+        for name, field, _convert in self.fields:
+            value = field.value_from_object(obj)
+            if not is_protected_type(value):
+                value = field.value_to_string(obj)
+            data[name] = value
+        return data
+
+    def serialize_row(
+        self, row: Mapping[str, Any], extra_data: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        data = {"type": self.object_name, "id": self.get_global_id(row["id"])}
+        data.update(extra_data or {})
+        for name, field, convert in self.fields:
+            data[name] = convert(row[field.attname])
+        return data
+
+    def serialize_queryset(self, queryset: QuerySet) -> List[Dict[str, Any]]:
+        return [self.serialize_row(row) for row in queryset.values(*self.value_names)]
+
+
+@lru_cache(maxsize=None)
+def get_model_fields_serializer(model, fields: Tuple[str, ...]):
+    return ModelFieldsSerializer(model, fields)
@@ -1,6 +1,7 @@
 import json
-from typing import Iterable, Optional
+from typing import Optional
 
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db.models import QuerySet
 
 from ..account.models import User
@@ -18,7 +19,7 @@ from ..payment import ChargeStatus
 from ..product.models import Product
 from ..warehouse.models import Warehouse
 from .event_types import WebhookEventType
-from .payload_serializers import PayloadSerializer
+from .payload_serializers import PayloadSerializer, get_model_fields_serializer
 from .serializers import serialize_checkout_lines
 
 ADDRESS_FIELDS = (
@@ -55,73 +56,112 @@ ORDER_FIELDS = (
 )
 
 
-def generate_order_lines_payload(lines: Iterable[OrderLine]):
-    line_fields = (
-        "product_name",
-        "variant_name",
-        "translated_product_name",
-        "translated_variant_name",
-        "product_sku",
-        "quantity",
-        "currency",
-        "unit_price_net_amount",
-        "unit_price_gross_amount",
-        "tax_rate",
-    )
-    serializer = PayloadSerializer()
-    return serializer.serialize(
-        lines,
-        fields=line_fields,
-        extra_dict_data={
-            "total_price_net_amount": (lambda l: l.get_total().net.amount),
-            "total_price_gross_amount": (lambda l: l.get_total().gross.amount),
+ORDER_LINE_FIELDS = (
+    "product_name",
+    "variant_name",
+    "translated_product_name",
+    "translated_variant_name",
+    "product_sku",
+    "quantity",
+    "currency",
+    "unit_price_net_amount",
+    "unit_price_gross_amount",
+    "tax_rate",
+)
+
+ORDER_FULFILLMENT_FIELDS = ("status", "tracking_number", "created")
+
+ORDER_PAYMENT_FIELDS = (
+    "gateway",
+    "payment_method_type",
+    "cc_brand",
+    "is_active",
+    "created",
+    "modified",
+    "charge_status",
+    "total",
+    "captured_amount",
+    "currency",
+    "billing_email",
+    "billing_first_name",
+    "billing_last_name",
+    "billing_company_name",
+    "billing_address_1",
+    "billing_address_2",
+    "billing_city",
+    "billing_city_area",
+    "billing_postal_code",
+    "billing_country_code",
+    "billing_country_area",
+)
+
+SHIPPING_METHOD_FIELDS = ("name", "type", "currency", "price_amount")
+
+
+def _serialize_related_object(obj, fields):
+    if obj is None:
+        return None
+    return get_model_fields_serializer(type(obj), fields).serialize_instance(obj)
+
+
+def _serialize_related_objects(queryset: QuerySet, fields):
+    serializer = get_model_fields_serializer(queryset.model, fields)
+    return serializer.serialize_queryset(queryset) or None
+
+
+def generate_order_lines_data(order: "Order"):
+    serializer = get_model_fields_serializer(OrderLine, ORDER_LINE_FIELDS)
+    return [
+        serializer.serialize_row(
+            row,
+            extra_data={
+                "total_price_net_amount": row["unit_price_net_amount"]
+                * row["quantity"],
+                "total_price_gross_amount": row["unit_price_gross_amount"]
+                * row["quantity"],
+            },
+        )
+        for row in order.lines.values(*serializer.value_names)
+    ]
+
+
+def generate_order_data(order: "Order"):
+    """Return the serialized order as a dict of basic Python objects.
+
+    Orders may have hundreds of lines, so the related lines, payments and
+    fulfillments are serialized from `values()` rows instead of model instances.
+    The order and its single related objects are serialized from the instances as
+    they may be anonymized in memory.
+    """
+    serializer = get_model_fields_serializer(Order, ORDER_FIELDS)
+    return serializer.serialize_instance(
+        order,
+        extra_data={
+            "shipping_method": _serialize_related_object(
+                order.shipping_method, SHIPPING_METHOD_FIELDS
+            ),
+            "payments": _serialize_related_objects(
+                order.payments.all(), ORDER_PAYMENT_FIELDS
+            ),
+            "shipping_address": _serialize_related_object(
+                order.shipping_address, ADDRESS_FIELDS
+            ),
+            "billing_address": _serialize_related_object(
+                order.billing_address, ADDRESS_FIELDS
+            ),
+            "fulfillments": _serialize_related_objects(
+                order.fulfillments.all(), ORDER_FULFILLMENT_FIELDS
+            ),
+            "lines": generate_order_lines_data(order),
         },
     )
 
 
 def generate_order_payload(order: "Order"):
-    serializer = PayloadSerializer()
-    fulfillment_fields = ("status", "tracking_number", "created")
-    payment_fields = (
-        "gateway",
-        "payment_method_type",
-        "cc_brand",
-        "is_active",
-        "created",
-        "modified",
-        "charge_status",
-        "total",
-        "captured_amount",
-        "currency",
-        "billing_email",
-        "billing_first_name",
-        "billing_last_name",
-        "billing_company_name",
-        "billing_address_1",
-        "billing_address_2",
-        "billing_city",
-        "billing_city_area",
-        "billing_postal_code",
-        "billing_country_code",
-        "billing_country_area",
+    return json.dumps(
+        [generate_order_data(order)], cls=DjangoJSONEncoder, ensure_ascii=False
     )
 
-    shipping_method_fields = ("name", "type", "currency", "price_amount")
-    lines = order.lines.all()
-    order_data = serializer.serialize(
-        [order],
-        fields=ORDER_FIELDS,
-        additional_fields={
-            "shipping_method": (lambda o: o.shipping_method, shipping_method_fields),
-            "payments": (lambda o: o.payments.all(), payment_fields),
-            "shipping_address": (lambda o: o.shipping_address, ADDRESS_FIELDS),
-            "billing_address": (lambda o: o.billing_address, ADDRESS_FIELDS),
-            "fulfillments": (lambda o: o.fulfillments.all(), fulfillment_fields),
-        },
-        extra_dict_data={"lines": json.loads(generate_order_lines_payload(lines))},
-    )
-    return order_data
-
 
 def generate_invoice_payload(invoice: "Invoice"):
     serializer = PayloadSerializer()
@@ -278,7 +318,7 @@ def generate_fulfillment_payload(fulfillment: Fulfillment):
             "warehouse_address": (lambda f: warehouse.address, ADDRESS_FIELDS),
         },
         extra_dict_data={
-            "order": json.loads(generate_order_payload(fulfillment.order))[0],
+            "order": generate_order_data(fulfillment.order),
             "lines": json.loads(generate_fulfillment_lines_payload(fulfillment)),
         },
     )
@@ -292,14 +332,7 @@ def _get_sample_object(qs: QuerySet):
 
 
 def _generate_sample_order_payload(event_name):
-    order_qs = Order.objects.prefetch_related(
-        "payments",
-        "lines",
-        "shipping_method",
-        "shipping_address",
-        "billing_address",
-        "fulfillments",
-    )
+    order_qs = Order.objects.select_related("shipping_method")
     order = None
     if event_name == WebhookEventType.ORDER_CREATED:
         order = _get_sample_object(order_qs.filter(status=OrderStatus.UNFULFILLED))
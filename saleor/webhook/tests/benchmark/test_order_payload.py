@@ -0,0 +1,32 @@
+import copy
+import json
+
+import pytest
+
+from ....order.models import OrderLine
+from ...payloads import generate_order_payload
+
+LINES_COUNT = 500
+
+
+@pytest.fixture
+def order_with_500_lines(order_with_lines):
+    line = order_with_lines.lines.first()
+    lines = []
+    for index in range(LINES_COUNT - order_with_lines.lines.count()):
+        new_line = copy.copy(line)
+        new_line.pk = None
+        new_line.product_sku = f"SKU-{index}"
+        lines.append(new_line)
+    OrderLine.objects.bulk_create(lines)
+    return order_with_lines
+
+
+@pytest.mark.django_db
+@pytest.mark.count_queries(autouse=False)
+def test_generate_order_payload_with_500_lines(
+    order_with_500_lines, fulfilled_order, payment_txn_captured, count_queries
+):
+    payload = json.loads(generate_order_payload(order_with_500_lines))[0]
+
+    assert len(payload["lines"]) == LINES_COUNT
@@ -1,4 +1,8 @@
-from saleor.webhook.payload_serializers import PythonSerializer
+from saleor.order.models import OrderLine
+from saleor.webhook.payload_serializers import (
+    PythonSerializer,
+    get_model_fields_serializer,
+)
 
 
 def test_python_serializer_extra_model_fields(product_with_single_variant):
@@ -32,3 +36,37 @@ def test_python_serializer_extra_model_fields_incorrect_fields(
     result = serializer.get_dump_object(annotated_variant)
     assert result["type"] == "ProductVariant"
     assert result["test_item"] == "test_value"
+
+
+def test_model_fields_serializer_matches_python_serializer(order_with_lines):
+    # given
+    fields = ("product_name", "variant", "quantity", "unit_price_net_amount")
+    lines = order_with_lines.lines.all()
+    serializer = get_model_fields_serializer(OrderLine, fields)
+
+    # when
+    rows_data = serializer.serialize_queryset(lines)
+    instances_data = [serializer.serialize_instance(line) for line in lines]
+
+    # then
+    expected_data = PythonSerializer(extra_model_fields={}).serialize(
+        lines, fields=fields
+    )
+    assert rows_data == expected_data
+    assert instances_data == expected_data
+    assert list(rows_data[0]) == [
+        "type",
+        "id",
+        "variant",
+        "product_name",
+        "quantity",
+        "unit_price_net_amount",
+    ]
+
+
+def test_model_fields_serializer_is_cached():
+    fields = ("product_name",)
+
+    serializer = get_model_fields_serializer(OrderLine, fields)
+
+    assert get_model_fields_serializer(OrderLine, fields) is serializer
@@ -3,7 +3,40 @@ from decimal import Decimal
 
 import graphene
 
-from ..payloads import ORDER_FIELDS, generate_order_payload
+from ...core.utils.anonymization import anonymize_order
+from ..payload_serializers import PayloadSerializer
+from ..payloads import (
+    ADDRESS_FIELDS,
+    ORDER_FIELDS,
+    ORDER_FULFILLMENT_FIELDS,
+    ORDER_LINE_FIELDS,
+    ORDER_PAYMENT_FIELDS,
+    SHIPPING_METHOD_FIELDS,
+    generate_order_payload,
+)
+
+
+def _generate_order_payload_with_payload_serializer(order):
+    lines_payload = PayloadSerializer().serialize(
+        order.lines.all(),
+        fields=ORDER_LINE_FIELDS,
+        extra_dict_data={
+            "total_price_net_amount": (lambda l: l.get_total().net.amount),
+            "total_price_gross_amount": (lambda l: l.get_total().gross.amount),
+        },
+    )
+    return PayloadSerializer().serialize(
+        [order],
+        fields=ORDER_FIELDS,
+        additional_fields={
+            "shipping_method": (lambda o: o.shipping_method, SHIPPING_METHOD_FIELDS),
+            "payments": (lambda o: o.payments.all(), ORDER_PAYMENT_FIELDS),
+            "shipping_address": (lambda o: o.shipping_address, ADDRESS_FIELDS),
+            "billing_address": (lambda o: o.billing_address, ADDRESS_FIELDS),
+            "fulfillments": (lambda o: o.fulfillments.all(), ORDER_FULFILLMENT_FIELDS),
+        },
+        extra_dict_data={"lines": json.loads(lines_payload)},
+    )
 
 
 def test_generate_order_payload(
@@ -57,3 +90,45 @@ def test_order_lines_have_all_required_fields(order, order_line_with_one_allocat
         ),
         "tax_rate": str(line.tax_rate.quantize(Decimal("0.01"))),
     }
+
+
+def test_generate_order_payload_matches_payload_serializer(
+    order_with_lines, fulfilled_order, payment_txn_captured
+):
+    # given
+    order = order_with_lines
+    order.discount_name = "Test discount"
+
+    # when
+    payload = generate_order_payload(order)
+
+    # then
+    assert payload == _generate_order_payload_with_payload_serializer(order)
+
+
+def test_generate_order_payload_without_related_objects_matches_payload_serializer(
+    order,
+):
+    # given
+    order.shipping_address = None
+    order.billing_address = None
+
+    # when
+    payload = generate_order_payload(order)
+
+    # then
+    assert payload == _generate_order_payload_with_payload_serializer(order)
+    assert json.loads(payload)[0]["lines"] == []
+
+
+def test_generate_anonymized_order_payload_matches_payload_serializer(
+    fulfilled_order, payment_txn_captured
+):
+    # given
+    order = anonymize_order(fulfilled_order)
+
+    # when
+    payload = generate_order_payload(order)
+
+    # then
+    assert payload == _generate_order_payload_with_payload_serializer(order)
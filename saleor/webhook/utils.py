@@ -0,0 +1,52 @@
+import time
+from typing import FrozenSet, Tuple
+
+from ..core.cache import ProcessCache
+from .event_types import WebhookEventType
+
+# Subscriptions cached for longer than this many seconds are fetched again before
+# an event is dropped, as a process may miss the invalidation when the cache isn't
+# shared (e.g. the default local memory cache)
+SUBSCRIPTIONS_MAX_AGE_FOR_MISSING_EVENT = 1
+
+webhook_subscriptions_cache = ProcessCache("webhook_subscriptions_version")
+
+
+def _fetch_subscribed_event_types() -> Tuple[float, FrozenSet[str]]:
+    from .models import WebhookEvent
+
+    event_types = frozenset(
+        WebhookEvent.objects.filter(
+            webhook__is_active=True, webhook__app__is_active=True
+        )
+        .values_list("event_type", flat=True)
+        .distinct()
+    )
+    return time.monotonic(), event_types
+
+
+def _is_subscribed(event_type: str, event_types: FrozenSet[str]) -> bool:
+    return event_type in event_types or WebhookEventType.ANY in event_types
+
+
+def has_webhook_subscribers(event_type: str) -> bool:
+    """Return whether any active webhook of an active app subscribes to the event.
+
+    App permissions are not taken into account, so the result may be a false
+    positive; the webhooks are filtered by permissions when the event is sent.
+    """
+    version = webhook_subscriptions_cache.get_version()
+    cached = webhook_subscriptions_cache.get(version)
+    if cached is not None:
+        fetched_at, event_types = cached
+        if _is_subscribed(event_type, event_types):
+            return True
+        if time.monotonic() - fetched_at < SUBSCRIPTIONS_MAX_AGE_FOR_MISSING_EVENT:
+            return False
+    fetched_at, event_types = _fetch_subscribed_event_types()
+    webhook_subscriptions_cache.set(version, (fetched_at, event_types))
+    return _is_subscribed(event_type, event_types)
+
+
+def invalidate_webhook_subscriptions():
+    webhook_subscriptions_cache.invalidate()